@@ -0,0 +1,202 @@
+import asyncio
+import math
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from typing import Callable, Dict
+
+try:
+    from backend.config import (
+        ADMISSION_ENABLED, ADMIT_TEXT_LIMIT, ADMIT_TEXT_MAX_LIMIT, ADMIT_TEXT_QUEUE, ADMIT_TEXT_QUEUE_TIMEOUT,
+        ADMIT_TEXT_TARGET, ADMIT_URL_LIMIT, ADMIT_URL_MAX_LIMIT, ADMIT_URL_QUEUE, ADMIT_URL_QUEUE_TIMEOUT,
+        ADMIT_URL_TARGET,
+    )
+    from backend.metrics import ADMISSION, increment
+except ImportError:
+    from config import (
+        ADMISSION_ENABLED, ADMIT_TEXT_LIMIT, ADMIT_TEXT_MAX_LIMIT, ADMIT_TEXT_QUEUE, ADMIT_TEXT_QUEUE_TIMEOUT,
+        ADMIT_TEXT_TARGET, ADMIT_URL_LIMIT, ADMIT_URL_MAX_LIMIT, ADMIT_URL_QUEUE, ADMIT_URL_QUEUE_TIMEOUT,
+        ADMIT_URL_TARGET,
+    )
+    from metrics import ADMISSION, increment
+
+TEXT = "text"
+URL = "url"
+
+class Overloaded(Exception):
+    """Raised when a request is shed; callers should answer 503 with Retry-After."""
+
+    def __init__(self, cls: str, reason: str, retry_after: int = 1):
+        super().__init__(f"Server is overloaded ({cls} requests, {reason}), retry after {retry_after}s")
+        self.cls = cls
+        self.reason = reason
+        self.retry_after = retry_after
+
+class AdmissionClass:
+    """
+    Concurrency limit plus a bounded wait queue for one class of requests.
+
+    The limit adapts AIMD-style to the smoothed in-service latency: above
+    target_latency it is cut by `decrease` (at most once per target
+    interval, since requests admitted before a cut still report the old
+    load), and while the class is saturated and under target it grows by
+    about one slot per `limit` completions. A request is shed when the
+    queue already holds max_queue waiters or it waited queue_timeout
+    seconds without getting a slot.
+
+    Waiters are futures of the waiting coroutine's running loop, created
+    per wait, so an instance can be built before any loop exists.
+    """
+
+    def __init__(self, name: str, limit: int, min_limit: int = 1, max_limit: int = 256, max_queue: int = 64,
+                 queue_timeout: float = 1.0, target_latency: float = 5.0, decrease: float = 0.9,
+                 smoothing: float = 0.2, clock: Callable[[], float] = time.monotonic):
+        self.name = name
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(limit, self.min_limit), self.max_limit))
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout = queue_timeout
+        self.target_latency = target_latency
+        self.decrease = decrease
+        self.smoothing = smoothing
+        self.clock = clock
+        self.inflight = 0
+        self.latency = None  # exponentially smoothed seconds in service
+        self._waiters = deque()
+        self._last_decrease = -math.inf
+        self.counts = {"admitted": 0, "queued": 0, "cached": 0, "shed": 0}
+
+    @property
+    def effective_limit(self) -> int:
+        return int(self.limit)
+
+    @property
+    def queue_depth(self) -> int:
+        return len(self._waiters)
+
+    def _count(self, outcome: str):
+        self.counts[outcome] += 1
+        increment(ADMISSION, cls=self.name, outcome=outcome)
+
+    def _shed(self, reason: str) -> Overloaded:
+        self._count("shed")
+        return Overloaded(self.name, reason, retry_after=max(1, math.ceil(self.queue_timeout)))
+
+    def record_cached(self):
+        """Counts a request answered from the cache without taking a slot."""
+        self._count("cached")
+
+    async def acquire(self):
+        if self.inflight < self.effective_limit and not self._waiters:
+            self.inflight += 1
+            self._count("admitted")
+            return
+        if len(self._waiters) >= self.max_queue:
+            raise self._shed("queue full")
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.queue_timeout)
+        except asyncio.TimeoutError:
+            self._abandon(waiter)
+            raise self._shed("queue timeout")
+        except asyncio.CancelledError:
+            self._abandon(waiter)
+            raise
+        self._count("queued")
+
+    def _abandon(self, waiter):
+        if waiter.done() and not waiter.cancelled():
+            self._release_slot()  # a slot was handed over just as the wait ended; pass it on
+        else:
+            try:
+                self._waiters.remove(waiter)
+            except ValueError:
+                pass
+
+    def release(self, latency: float):
+        saturated = bool(self._waiters) or self.inflight >= self.effective_limit
+        self._adapt(latency, saturated)
+        self._release_slot()
+
+    def _release_slot(self):
+        self.inflight -= 1
+        while self._waiters and self.inflight < self.effective_limit:
+            waiter = self._waiters.popleft()
+            if waiter.done():
+                continue  # timed out or cancelled; already accounted for
+            self.inflight += 1
+            waiter.set_result(None)
+
+    def _adapt(self, latency: float, saturated: bool):
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += self.smoothing * (latency - self.latency)
+        now = self.clock()
+        if self.latency > self.target_latency:
+            if now - self._last_decrease >= self.target_latency:
+                self.limit = max(float(self.min_limit), self.limit * self.decrease)
+                self._last_decrease = now
+        elif saturated:
+            self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+
+    @asynccontextmanager
+    async def slot(self):
+        """Holds one slot for the duration of the block; raises Overloaded if none is available in time."""
+        await self.acquire()
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.release(time.perf_counter() - start)
+
+    def stats(self) -> dict:
+        return {
+            "limit": self.effective_limit,
+            "inflight": self.inflight,
+            "queue_depth": self.queue_depth,
+            "max_queue": self.max_queue,
+            "latency": round(self.latency, 4) if self.latency is not None else None,
+            "target_latency": self.target_latency,
+            **self.counts,
+        }
+
+class AdmissionController:
+    """One AdmissionClass per cost class of request (e.g. cheap text, expensive URL)."""
+
+    def __init__(self, classes: Dict[str, AdmissionClass], enabled: bool = True):
+        self.classes = classes
+        self.enabled = enabled
+
+    @asynccontextmanager
+    async def admit(self, cls: str):
+        if not self.enabled:
+            yield
+            return
+        async with self.classes[cls].slot():
+            yield
+
+    def record_cached(self, cls: str):
+        if self.enabled:
+            self.classes[cls].record_cached()
+
+    def stats(self) -> dict:
+        if not self.enabled:
+            return {"enabled": False}
+        return {name: c.stats() for name, c in self.classes.items()}
+
+# Singleton instance
+admission_controller = None
+
+def get_admission_controller() -> AdmissionController:
+    global admission_controller
+    if admission_controller is None:
+        admission_controller = AdmissionController({
+            TEXT: AdmissionClass(TEXT, ADMIT_TEXT_LIMIT, max_limit=ADMIT_TEXT_MAX_LIMIT, max_queue=ADMIT_TEXT_QUEUE,
+                                 queue_timeout=ADMIT_TEXT_QUEUE_TIMEOUT, target_latency=ADMIT_TEXT_TARGET),
+            URL: AdmissionClass(URL, ADMIT_URL_LIMIT, max_limit=ADMIT_URL_MAX_LIMIT, max_queue=ADMIT_URL_QUEUE,
+                                queue_timeout=ADMIT_URL_QUEUE_TIMEOUT, target_latency=ADMIT_URL_TARGET),
+        }, enabled=ADMISSION_ENABLED)
+    return admission_controller
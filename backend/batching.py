@@ -0,0 +1,143 @@
+import asyncio
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, List, Optional
+
+try:
+    from backend.metrics import MODEL_BATCH_SIZE, MODEL_INFERENCE, observe
+except ImportError:
+    from metrics import MODEL_BATCH_SIZE, MODEL_INFERENCE, observe
+
+class BatchScheduler:
+    """
+    Collects concurrent scoring requests into micro-batches.
+
+    The first item of a batch waits at most `max_wait_ms` for more items to
+    arrive; a batch is flushed early as soon as it holds `max_batch_size`
+    items. Each batch runs as one call to `predict_batch` on a worker thread,
+    so the event loop is never blocked by the forward pass.
+    """
+
+    def __init__(
+        self,
+        predict_batch: Callable[[List[str]], List[float]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        executor: Optional[ThreadPoolExecutor] = None,
+    ):
+        self.predict_batch = predict_batch
+        self.max_batch_size = max(1, int(max_batch_size))
+        self.max_wait = max(0.0, max_wait_ms) / 1000.0
+        self.executor = executor or ThreadPoolExecutor(max_workers=1, thread_name_prefix="fnd-batch")
+
+        self._pending = []  # (text, future) waiting for the next flush
+        self._timer = None
+        self._in_flight = 0  # items handed to the executor but not answered yet
+
+        # Metrics
+        self.batches_total = 0
+        self.items_total = 0
+        self.batch_size_counts = Counter()
+        self.last_batch_size = 0
+        self.max_queue_depth = 0
+        self.busy_seconds = 0.0
+
+    @property
+    def queue_depth(self) -> int:
+        """Items submitted but not yet answered (waiting + running)."""
+        return len(self._pending) + self._in_flight
+
+    async def submit(self, text: str) -> float:
+        """Queues one text and waits for its score."""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((text, future))
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+        if len(self._pending) >= self.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            if self.max_wait == 0:
+                self._flush()
+            else:
+                self._timer = loop.call_later(self.max_wait, self._flush)
+
+        return await future
+
+    async def run_batch(self, texts: List[str]) -> List[float]:
+        """
+        Scores an already-assembled batch on the scheduler's executor,
+        bypassing the wait window. Used by bulk callers.
+        """
+        if not texts:
+            return []
+        self._in_flight += len(texts)
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+        try:
+            return await self._execute(list(texts))
+        finally:
+            self._in_flight -= len(texts)
+
+    def _flush(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        if not self._pending:
+            return
+
+        batch = self._pending[:self.max_batch_size]
+        self._pending = self._pending[self.max_batch_size:]
+        self._in_flight += len(batch)
+        asyncio.ensure_future(self._run(batch))
+
+        # Anything left over starts its own wait window
+        if self._pending:
+            loop = asyncio.get_running_loop()
+            self._timer = loop.call_later(self.max_wait, self._flush)
+
+    async def _run(self, batch):
+        texts = [text for text, _ in batch]
+        try:
+            scores = await self._execute(texts)
+            if len(scores) != len(batch):
+                raise RuntimeError(f"Model returned {len(scores)} scores for {len(batch)} inputs")
+            for (_, future), score in zip(batch, scores):
+                if not future.done():
+                    future.set_result(score)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+        finally:
+            self._in_flight -= len(batch)
+
+    async def _execute(self, texts: List[str]) -> List[float]:
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        try:
+            return await loop.run_in_executor(self.executor, self.predict_batch, texts)
+        finally:
+            elapsed = time.perf_counter() - start
+            observe(MODEL_INFERENCE, elapsed)
+            observe(MODEL_BATCH_SIZE, len(texts))
+            self.busy_seconds += elapsed
+            self.batches_total += 1
+            self.items_total += len(texts)
+            self.batch_size_counts[len(texts)] += 1
+            self.last_batch_size = len(texts)
+
+    def stats(self) -> dict:
+        avg = self.items_total / self.batches_total if self.batches_total else 0.0
+        return {
+            "queue_depth": self.queue_depth,
+            "max_queue_depth": self.max_queue_depth,
+            "batches_total": self.batches_total,
+            "items_total": self.items_total,
+            "avg_batch_size": round(avg, 3),
+            "last_batch_size": self.last_batch_size,
+            "batch_size_histogram": {str(k): v for k, v in sorted(self.batch_size_counts.items())},
+            "busy_seconds": round(self.busy_seconds, 6),
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+        }
@@ -0,0 +1,95 @@
+"""
+Compares inference backends on resident memory, load time and per-item
+latency. Each backend is measured in a fresh subprocess so RSS and import
+costs are not shared between runs.
+
+    python backend/benchmarks/bench_backends.py --backends keras numpy
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+SAMPLE = ("The government announced a new tax policy today that affects small businesses. "
+          "Officials said the change would take effect next year after a review by parliament. ") * 6
+
+def rss_mb() -> float:
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmRSS:"):
+                return int(line.split()[1]) / 1024.0
+    return float("nan")
+
+def measure(backend: str, model_path: str, numpy_dir: str, batch_sizes, repeats: int) -> dict:
+    rss_before = rss_mb()
+    start = time.perf_counter()
+    from inference import load_backend
+    model = load_backend(backend, model_path, numpy_dir)
+    model.predict_batch([SAMPLE])  # first call builds graphs / touches pages
+    load_seconds = time.perf_counter() - start
+
+    latency = {}
+    for size in batch_sizes:
+        texts = [SAMPLE] * size
+        timings = []
+        for _ in range(repeats):
+            t0 = time.perf_counter()
+            model.predict_batch(texts)
+            timings.append(time.perf_counter() - t0)
+        latency[str(size)] = round(statistics.median(timings) / size * 1000.0, 3)
+
+    return {
+        "backend": backend,
+        "load_seconds": round(load_seconds, 3),
+        "rss_mb": round(rss_mb(), 1),
+        "rss_delta_mb": round(rss_mb() - rss_before, 1),
+        "ms_per_item_by_batch_size": latency,
+    }
+
+def main():
+    from config import MODEL_PATH, NUMPY_MODEL_DIR
+
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backends", nargs="+", default=["keras", "numpy"])
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--numpy-dir", default=NUMPY_MODEL_DIR)
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1, 8, 32])
+    parser.add_argument("--repeats", type=int, default=10)
+    parser.add_argument("--json", help="Also write results to this file")
+    parser.add_argument("--worker", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = measure(args.worker, args.model, args.numpy_dir, args.batch_sizes, args.repeats)
+        print(json.dumps(result))
+        return
+
+    results = []
+    for backend in args.backends:
+        cmd = [sys.executable, __file__, "--worker", backend, "--model", args.model, "--numpy-dir", args.numpy_dir,
+               "--repeats", str(args.repeats), "--batch-sizes", *map(str, args.batch_sizes)]
+        env = dict(os.environ, TF_CPP_MIN_LOG_LEVEL="3")
+        out = subprocess.run(cmd, capture_output=True, text=True, env=env)
+        if out.returncode != 0:
+            print(f"{backend}: failed\n{out.stderr[-2000:]}")
+            continue
+        results.append(json.loads(out.stdout.strip().splitlines()[-1]))
+
+    header = f"{'backend':<8} {'load s':>8} {'RSS MB':>8} " + " ".join(f"{'ms/item@' + str(b):>12}" for b in args.batch_sizes)
+    print(header)
+    for r in results:
+        cols = " ".join(f"{r['ms_per_item_by_batch_size'][str(b)]:>12}" for b in args.batch_sizes)
+        print(f"{r['backend']:<8} {r['load_seconds']:>8} {r['rss_mb']:>8} {cols}")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Builds an offline evidence index over a synthetic corpus and reports
+build time, on-disk size and BM25 query latency (single segment and
+after incremental adds).
+
+    python backend/benchmarks/bench_evidence_index.py --docs 50000 --queries 500
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from evidence_index import EvidenceIndex
+
+def make_corpus(rng, docs, vocabulary, words):
+    # Zipf-like term frequencies, so common terms have long postings lists as in real news
+    weights = 1.0 / np.arange(1, len(vocabulary) + 1)
+    for i in range(docs):
+        body = rng.choices(vocabulary, weights=weights, k=words)
+        sentences = [" ".join(body[j:j + 20]) + "." for j in range(0, words, 20)]
+        yield {"link": f"https://www.reuters.com/article/{i}", "title": " ".join(body[:8]), "text": " ".join(sentences)}
+
+def query_latency(index, queries, limit):
+    timings = []
+    for query in queries:
+        start = time.perf_counter()
+        index.search(query, limit)
+        timings.append((time.perf_counter() - start) * 1000.0)
+    timings.sort()
+    return {
+        "p50_ms": round(timings[len(timings) // 2], 3),
+        "p95_ms": round(timings[int(len(timings) * 0.95)], 3),
+        "max_ms": round(timings[-1], 3),
+    }
+
+def disk_bytes(path):
+    return sum(os.path.getsize(os.path.join(root, f)) for root, _, files in os.walk(path) for f in files)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--docs", type=int, default=20000)
+    parser.add_argument("--words", type=int, default=300, help="Words per document")
+    parser.add_argument("--vocabulary", type=int, default=30000)
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--segments", type=int, default=4, help="Incremental adds before compaction")
+    parser.add_argument("--limit", type=int, default=10)
+    args = parser.parse_args()
+
+    rng = random.Random(7)
+    vocabulary = [f"term{i}" for i in range(args.vocabulary)]
+    docs = list(make_corpus(rng, args.docs, vocabulary, args.words))
+    queries = [" ".join(rng.sample(vocabulary[:5000], 6)) for _ in range(args.queries)]
+
+    results = {"docs": args.docs, "words_per_doc": args.words}
+    with tempfile.TemporaryDirectory() as path:
+        index = EvidenceIndex(path, reload_interval=3600)
+        per_segment = -(-len(docs) // args.segments)
+        start = time.perf_counter()
+        for i in range(0, len(docs), per_segment):
+            index.add_documents(docs[i:i + per_segment])
+        results["build_seconds"] = round(time.perf_counter() - start, 2)
+        results[f"query_{index.stats()['segments']}_segments"] = query_latency(index, queries, args.limit)
+
+        start = time.perf_counter()
+        index.compact()
+        results["compact_seconds"] = round(time.perf_counter() - start, 2)
+        results["index_mb"] = round(disk_bytes(path) / 1e6, 1)
+        results["query_1_segment"] = query_latency(index, queries, args.limit)
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
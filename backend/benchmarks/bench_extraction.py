@@ -0,0 +1,96 @@
+"""
+Compares the streaming article extractor used by /predict-url with the
+previous whole-document BeautifulSoup extraction (utils.html_to_text).
+
+Point --corpus at a directory of saved .html pages; without it a set of
+synthetic pages (from a short article up to a multi-megabyte page full of
+scripts and boilerplate) is generated.
+
+    python backend/benchmarks/bench_extraction.py --corpus ~/saved_pages
+"""
+import argparse
+import glob
+import json
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from config import EXTRACT_MAX_BYTES, EXTRACT_TARGET_CHARS, EXTRACT_MAX_CHARS
+from html_extract import ArticleTextParser
+from utils import html_to_text, FEED_SLICE_CHARS
+
+NETWORK_CHUNK = 64 * 1024
+
+def synthetic_page(paragraphs: int, junk_kb: int) -> bytes:
+    nav = "<nav>" + " | ".join(f"<a href='/s{i}'>Section {i}</a>" for i in range(60)) + "</nav>"
+    script = "<script>" + "var tracking = {id: 1, payload: 'x'};" * (junk_kb * 1024 // 36) + "</script>"
+    story = "".join(
+        f"<p>Paragraph {i}: the council met on Monday to discuss the bridge budget and the schedule.</p>"
+        for i in range(paragraphs)
+    )
+    comments = "<div class='comments'>" + "<div>Great article, thanks!</div>" * (junk_kb * 20) + "</div>"
+    return (f"<html><head><title>Bridge story</title>{script}</head><body>{nav}"
+            f"<article><h1>Bridge approved</h1>{story}</article>{comments}<footer>(c)</footer></body></html>").encode()
+
+def streaming_extract(content: bytes) -> str:
+    """Same loop as utils.extract_text_from_url, minus the network."""
+    parser = ArticleTextParser(EXTRACT_TARGET_CHARS, EXTRACT_MAX_CHARS)
+    content = content[:EXTRACT_MAX_BYTES]
+    for offset in range(0, len(content), NETWORK_CHUNK):
+        markup = content[offset:offset + NETWORK_CHUNK].decode("utf-8", errors="replace")
+        for start in range(0, len(markup), FEED_SLICE_CHARS):
+            parser.feed(markup[start:start + FEED_SLICE_CHARS])
+            if parser.done:
+                break
+        if parser.done:
+            break
+    parser.close()
+    return parser.text()
+
+def measure(fn, content: bytes, repeats: int) -> dict:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(content)
+        timings.append(time.perf_counter() - start)
+    tracemalloc.start()
+    text = fn(content)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {"ms": round(statistics.median(timings) * 1000.0, 2), "peak_mb": round(peak / 2**20, 2), "chars": len(text)}
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--corpus", help="directory of saved .html pages")
+    parser.add_argument("--repeats", type=int, default=5)
+    args = parser.parse_args()
+
+    if args.corpus:
+        pages = {os.path.basename(p): open(p, "rb").read()
+                 for p in sorted(glob.glob(os.path.join(args.corpus, "*.htm*")))}
+    else:
+        pages = {
+            "short_article": synthetic_page(8, 4),
+            "long_article": synthetic_page(400, 64),
+            "heavy_page": synthetic_page(300, 768),
+        }
+
+    results = {}
+    for name, content in pages.items():
+        before = measure(html_to_text, content, args.repeats)
+        after = measure(streaming_extract, content, args.repeats)
+        results[name] = {
+            "bytes": len(content),
+            "beautifulsoup": before,
+            "streaming": after,
+            "speedup": round(before["ms"] / after["ms"], 2) if after["ms"] else None,
+        }
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
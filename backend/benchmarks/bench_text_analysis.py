@@ -0,0 +1,86 @@
+"""
+Compares the precompiled text-analysis helpers against the previous
+per-call implementations (kept below as the reference).
+
+    python backend/benchmarks/bench_text_analysis.py --repeats 200
+"""
+import argparse
+import json
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(BACKEND_DIR)
+
+from text_analysis import extract_keywords, analyze_snippets
+
+ARTICLE = ("The government announced a new tax policy today that affects small businesses. "
+           "Officials said the change would take effect next year after a review by parliament. ") * 20
+
+REPORTS = [
+    ("NASA's Webb Telescope Captures Pillars of Creation", "NASA released new high-resolution images of the Eagle Nebula."),
+    ("Tax policy explained", "What the new tax policy means for small businesses and freelancers."),
+]
+DEBUNKS = [
+    ("Fact Check: Did the moon land on Earth?", "Posts claim the moon crashed into Earth. This is FALSE, a CGI hoax."),
+    ("Misleading video shared widely", "The clip was edited; fact-checkers found the claim unverified."),
+]
+
+# Ten search results per query: most are plain reports, some queries hit fact-checkers
+SNIPPET_MIXES = {
+    "snippets_typical_query": REPORTS * 5,
+    "snippets_debunk_heavy_query": (REPORTS + DEBUNKS) * 2 + REPORTS,
+}
+
+def legacy_extract_keywords(text, num_keywords=5):
+    text_clean = re.sub(r'[^a-zA-Z0-9\s]', '', text.lower())
+    words = text_clean.split()
+    stop_words = set([
+        "the", "a", "an", "in", "on", "at", "for", "to", "of", "and", "or", "is", "are", "was", "were",
+        "it", "this", "that", "with", "by", "from", "be", "not", "have", "has", "had", "say", "said", "will",
+        "would", "could", "should", "he", "she", "they", "we", "i", "you", "my", "his", "her", "their",
+        "about", "as", "into", "like", "through", "after", "over", "between", "out", "against", "during",
+        "without", "before", "under", "around", "among", "just", "very", "also", "been", "which"
+    ])
+    meaningful_words = [w for w in words if w not in stop_words and len(w) > 3]
+    return " ".join([word for word, count in Counter(meaningful_words).most_common(num_keywords)])
+
+def legacy_analyze_snippet(title, snippet):
+    content = (title + " " + snippet).lower()
+    keywords = ["fact check", "fact-check", "debunk", "hoax", "false",
+                "fake news", "misleading", "correcting", "untrue", "unverified"]
+    if any(kw in content for kw in keywords):
+        negative_indicators = ["false", "hoax", "debunk", "incorrect", "misleading", "fake"]
+        if any(neg in content for neg in negative_indicators):
+            return 0.1
+        return 0.5
+    return 1.2
+
+def timed(fn, repeats):
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn()
+    return (time.perf_counter() - start) / repeats * 1e6
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=500)
+    args = parser.parse_args()
+
+    results = {}
+    cases = [("extract_keywords", lambda: legacy_extract_keywords(ARTICLE), lambda: extract_keywords(ARTICLE))]
+    for name, snippets in SNIPPET_MIXES.items():
+        cases.append((name, lambda s=snippets: [legacy_analyze_snippet(t, x) for t, x in s],
+                      lambda s=snippets: analyze_snippets(s)))
+
+    for name, legacy, current in cases:
+        before, after = timed(legacy, args.repeats), timed(current, args.repeats)
+        results[name] = {"legacy_us": round(before, 2), "current_us": round(after, 2),
+                         "speedup": round(before / after, 2)}
+    print(json.dumps(results, indent=2))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+"""
+Load test for /predict-text and /predict-url against stubbed dependencies.
+
+A stub Custom Search endpoint and a stub article server (each with a
+configurable delay) run in background threads. The API either runs
+in-process (requests go straight to the ASGI app, no sockets) or as a
+local uvicorn subprocess. Concurrent clients then drive a text/URL mix
+and the run is summarised as latency percentiles, throughput, error
+rate and a per-stage breakdown taken from each response's `timings`.
+
+    python backend/benchmarks/load_test.py --concurrency 32 --requests 2000 --out results.json
+    python backend/benchmarks/load_test.py --mode uvicorn --url-ratio 0.5 --search-latency-ms 150
+
+The model is whatever FND_MODEL_* selects (FND_MODEL_BACKEND=numpy is the
+cheapest to run). Result caches are disabled so every request does the
+full amount of work.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+REPO_DIR = os.path.dirname(BACKEND_DIR)
+
+WORDS = ("council bridge budget river election minister vaccine market storm court police report "
+         "climate school energy tax health science border trade festival stadium museum").split()
+
+SEARCH_ITEMS = [
+    {"link": "https://www.reuters.com/world/story", "title": "Officials confirm the report", "snippet": "The council met on Monday."},
+    {"link": "https://www.bbc.com/news/story", "title": "What we know so far", "snippet": "Details of the plan were released."},
+    {"link": "https://www.snopes.com/fact-check/story", "title": "Fact Check: viral claim", "snippet": "The claim is false."},
+    {"link": "https://randomblog.example/post", "title": "My take", "snippet": "Unrelated opinion."},
+]
+
+def make_article(rng: random.Random, words: int) -> str:
+    sentences = []
+    while sum(len(s.split()) for s in sentences) < words:
+        sentences.append(" ".join(rng.choice(WORDS) for _ in range(12)).capitalize() + ".")
+    return " ".join(sentences)
+
+class StubHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        config = self.server.config
+        if self.path.startswith("/customsearch"):
+            time.sleep(config["search_latency"])
+            body, content_type = json.dumps({"items": SEARCH_ITEMS}).encode(), "application/json"
+        elif self.path.startswith("/article/"):
+            time.sleep(config["article_latency"])
+            body, content_type = config["article_html"], "text/html; charset=utf-8"
+        else:
+            self.send_error(404)
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+def start_stub_server(search_latency_ms: float, article_latency_ms: float, article_words: int):
+    paragraphs = "".join(f"<p>{make_article(random.Random(i), 60)}</p>" for i in range(max(1, article_words // 60)))
+    article_html = (f"<html><head><title>Stub article</title><script>var t = 1;</script></head><body>"
+                    f"<nav>Home | World</nav><article><h1>Stub article</h1>{paragraphs}</article></body></html>").encode()
+    server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+    server.daemon_threads = True
+    server.config = {
+        "search_latency": search_latency_ms / 1000.0,
+        "article_latency": article_latency_ms / 1000.0,
+        "article_html": article_html,
+    }
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+def stub_environment(stub_base: str, workdir: str) -> dict:
+    """
+    Settings that point the app at the stubs, turn off result caching and
+    near-duplicate reuse (repeated load-test texts would skip the search
+    stub) and keep every store file in `workdir`.
+    """
+    return {
+        "FND_SEARCH_URL": f"{stub_base}/customsearch",
+        "GOOGLE_API_KEY": "load-test",
+        "GOOGLE_CSE_ID": "load-test",
+        "FND_CACHE_BACKEND": "off",
+        "FND_NEAR_DUP": "0",
+        "FND_JOBS_PATH": os.path.join(workdir, "jobs.sqlite3"),
+        "FND_SEARCH_CACHE_PATH": os.path.join(workdir, "search_cache.sqlite3"),
+        "FND_SEARCH_CACHE_TTL": "0",
+        "FND_SEARCH_DAILY_BUDGET": "0",
+        "FND_SEARCH_RATE_PER_MINUTE": "1000000000",
+        "FND_SEARCH_BURST": "1000000000",
+    }
+
+def free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+def percentiles(values) -> dict:
+    if not values:
+        return {}
+    arr = np.asarray(values, dtype=np.float64)
+    p50, p90, p99 = np.percentile(arr, [50, 90, 99])
+    return {"p50": round(p50, 2), "p90": round(p90, 2), "p99": round(p99, 2),
+            "max": round(float(arr.max()), 2), "mean": round(float(arr.mean()), 2)}
+
+def summarize(samples, elapsed: float) -> dict:
+    summary = {}
+    groups = {"all": samples}
+    for endpoint in sorted({s["endpoint"] for s in samples}):
+        groups[endpoint] = [s for s in samples if s["endpoint"] == endpoint]
+    for name, group in groups.items():
+        errors = [s for s in group if not s["ok"]]
+        stages = {}
+        for s in group:
+            for key, value in (s.get("timings") or {}).items():
+                stages.setdefault(key, []).append(value)
+        summary[name] = {
+            "requests": len(group),
+            "errors": len(errors),
+            "error_rate": round(len(errors) / len(group), 4) if group else 0.0,
+            "status_codes": {str(code): sum(1 for s in group if s["status"] == code)
+                             for code in sorted({s["status"] for s in group})},
+            "requests_per_sec": round(len(group) / elapsed, 2) if elapsed > 0 else 0.0,
+            "latency_ms": percentiles([s["latency_ms"] for s in group]),
+            "stages_ms": {key: percentiles(values) for key, values in sorted(stages.items())},
+            "degraded": sum(1 for s in group if s.get("degraded")),
+        }
+    return summary
+
+async def drive(client, stub_base: str, args) -> tuple:
+    rng = random.Random(args.seed)
+    plan = []
+    for i in range(args.warmup + args.requests):
+        if rng.random() < args.url_ratio:
+            plan.append(("/predict-url", {"url": f"{stub_base}/article/{i}"}))
+        else:
+            # Unique text per request so no layer can serve it from memory
+            plan.append(("/predict-text", {"text": f"{make_article(rng, args.text_words)} ref{i}"}))
+
+    samples = []
+    queue = asyncio.Queue()
+    for i, item in enumerate(plan):
+        queue.put_nowait((i, item))
+
+    async def worker():
+        while True:
+            try:
+                i, (endpoint, payload) = queue.get_nowait()
+            except asyncio.QueueEmpty:
+                return
+            start = time.perf_counter()
+            status, body = 0, {}
+            try:
+                response = await client.post(endpoint, json=payload, timeout=args.timeout)
+                status = response.status_code
+                body = response.json() if status == 200 else {}
+            except Exception as e:
+                body = {"error": repr(e)}
+            latency = (time.perf_counter() - start) * 1000.0
+            if i >= args.warmup:
+                samples.append({
+                    "endpoint": endpoint, "status": status, "ok": status == 200, "latency_ms": latency,
+                    "timings": body.get("timings"), "degraded": body.get("degraded", False),
+                })
+
+    start = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(max(1, args.concurrency))))
+    return samples, time.perf_counter() - start
+
+async def run_inprocess(stub_base: str, args) -> tuple:
+    import httpx
+
+    sys.path.append(BACKEND_DIR)
+    from main import app
+
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://app") as client:
+            return await drive(client, stub_base, args)
+
+async def run_uvicorn(stub_base: str, args, env: dict) -> tuple:
+    import httpx
+
+    port = args.port or free_port()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "backend.main:app", "--port", str(port), "--log-level", "warning",
+         "--workers", str(args.workers)],
+        cwd=REPO_DIR, env={**os.environ, **env},
+    )
+    base = f"http://127.0.0.1:{port}"
+    try:
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+        async with httpx.AsyncClient(base_url=base, limits=limits) as client:
+            deadline = time.monotonic() + args.startup_timeout
+            while True:
+                try:
+                    if (await client.get("/readyz")).status_code == 200:
+                        break
+                except httpx.TransportError:
+                    pass
+                if process.poll() is not None or time.monotonic() > deadline:
+                    raise RuntimeError("API did not become ready")
+                await asyncio.sleep(0.25)
+            return await drive(client, stub_base, args)
+    finally:
+        process.terminate()
+        process.wait(10)
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_DIR,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return ""
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--mode", choices=["inprocess", "uvicorn"], default="inprocess")
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--warmup", type=int, default=20, help="requests sent first and left out of the results")
+    parser.add_argument("--url-ratio", type=float, default=0.3, help="share of requests that go to /predict-url")
+    parser.add_argument("--text-words", type=int, default=300)
+    parser.add_argument("--article-words", type=int, default=800)
+    parser.add_argument("--search-latency-ms", type=float, default=80.0)
+    parser.add_argument("--article-latency-ms", type=float, default=50.0)
+    parser.add_argument("--timeout", type=float, default=60.0)
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=1, help="uvicorn worker processes (uvicorn mode)")
+    parser.add_argument("--startup-timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--out", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    server, stub_base = start_stub_server(args.search_latency_ms, args.article_latency_ms, args.article_words)
+    with tempfile.TemporaryDirectory() as workdir:
+        env = stub_environment(stub_base, workdir)
+        if args.mode == "inprocess":
+            # Settings are read at import time, so set them before the app loads
+            os.environ.update(env)
+            samples, elapsed = asyncio.run(run_inprocess(stub_base, args))
+        else:
+            samples, elapsed = asyncio.run(run_uvicorn(stub_base, args, env))
+    server.shutdown()
+
+    results = {
+        "commit": git_commit(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime()),
+        "config": {k: v for k, v in vars(args).items() if k != "out"},
+        "model_backend": os.environ.get("FND_MODEL_BACKEND", "keras"),
+        "elapsed_seconds": round(elapsed, 3),
+        "results": summarize(samples, elapsed),
+    }
+    print(json.dumps(results["results"]["all"], indent=2))
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+        print(f"Wrote {args.out}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,298 @@
+import argparse
+import asyncio
+import csv
+import json
+import os
+import time
+from typing import Iterator, Optional, Tuple, Union
+
+import numpy as np
+
+try:
+    from backend.config import MODEL_PATH, MODEL_BACKEND, NUMPY_MODEL_DIR, BATCH_IO_CONCURRENCY
+    from backend.chunking import split_documents, combine_scores
+    from backend.verdict import calculate_verdicts
+except ImportError:
+    from config import MODEL_PATH, MODEL_BACKEND, NUMPY_MODEL_DIR, BATCH_IO_CONCURRENCY
+    from chunking import split_documents, combine_scores
+    from verdict import calculate_verdicts
+
+CHECKPOINT_VERSION = 1
+
+def detect_format(path: str) -> str:
+    return "csv" if path.lower().endswith(".csv") else "jsonl"
+
+class BadRecord:
+    """An input record that could not be read; it becomes an error result instead of stopping the run."""
+
+    def __init__(self, error: str, fields: Optional[dict] = None):
+        self.error = error
+        self.fields = fields or {}  # whatever could be read, e.g. the id of a CSV row with bad bytes
+
+def read_records(f, fmt: str, start: int = 0) -> Iterator[Tuple[Union[dict, BadRecord], int]]:
+    """
+    Yields (record, end_offset) from a binary file, where end_offset is the
+    byte position just after the record. Starting from a previous
+    end_offset resumes exactly at the next record. Unreadable records are
+    yielded as BadRecord with their end_offset like any other.
+    """
+    if fmt == "jsonl":
+        f.seek(start)
+        offset = start
+        for line in iter(f.readline, b""):
+            line_start = offset
+            offset += len(line)
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError as e:  # includes invalid UTF-8
+                yield BadRecord(f"Unreadable JSON at byte {line_start}: {e}"), offset
+                continue
+            if not isinstance(record, dict):
+                yield BadRecord(f"Not a JSON object at byte {line_start}"), offset
+                continue
+            yield record, offset
+        return
+
+    # CSV rows may span several lines (quoted newlines); csv.reader pulls
+    # exactly the lines of one row, so the byte count stays exact.
+    f.seek(0)
+    header_line = f.readline()
+    fields = next(csv.reader([header_line.decode("utf-8-sig")]))
+    offset = max(start, len(header_line))
+    f.seek(offset)
+
+    bad_byte = None  # first undecodable byte of the row being read
+
+    def lines():
+        nonlocal offset, bad_byte
+        for line in iter(f.readline, b""):
+            try:
+                text = line.decode("utf-8")
+            except UnicodeDecodeError as e:
+                if bad_byte is None:
+                    bad_byte = offset + e.start
+                text = line.decode("utf-8", errors="replace")
+            offset += len(line)
+            yield text
+
+    reader = csv.reader(lines())
+    while True:
+        try:
+            row = next(reader)
+        except StopIteration:
+            return
+        except csv.Error as e:
+            bad_byte = None
+            yield BadRecord(f"Malformed CSV row ending at byte {offset}: {e}"), offset
+            continue
+        row_bad_byte, bad_byte = bad_byte, None
+        if not row:
+            continue
+        record = dict(zip(fields, row))
+        if row_bad_byte is not None:
+            yield BadRecord(f"Invalid UTF-8 at byte {row_bad_byte}", record), offset
+        else:
+            yield record, offset
+
+class Checkpoint:
+    """Input/output byte positions after the last fully written batch."""
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def load(self) -> Optional[dict]:
+        if not os.path.exists(self.path):
+            return None
+        with open(self.path, "r") as f:
+            state = json.load(f)
+        if state.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint format in {self.path}")
+        return state
+
+    def save(self, state: dict):
+        tmp = self.path + ".tmp"
+        with open(tmp, "w") as f:
+            json.dump({"version": CHECKPOINT_VERSION, **state}, f)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, self.path)  # atomic: a crash leaves the old or the new state
+
+    def clear(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+class BulkScorer:
+    """
+    Scores a corpus file batch by batch with constant memory. Results are
+    appended to a JSONL file in input order and a checkpoint is written
+    after every batch, so a crashed run resumes where it stopped.
+    """
+
+    def __init__(self, model, batch_size: int = 64, verify: bool = False,
+                 verify_concurrency: int = BATCH_IO_CONCURRENCY, text_field: str = "text", id_field: str = "id"):
+        self.model = model
+        self.batch_size = max(1, batch_size)
+        self.verify = verify
+        self.verify_concurrency = max(1, verify_concurrency)
+        self.text_field = text_field
+        self.id_field = id_field
+
+    async def _verify_all(self, texts):
+        try:
+            from backend import verify
+        except ImportError:
+            import verify
+
+        semaphore = asyncio.Semaphore(self.verify_concurrency)
+
+        async def one(text):
+            # Archives carry many republished copies of one story; verify it once
+            fingerprint, reused = verify.find_near_duplicate(text)
+            if reused is not None:
+                return reused
+            async with semaphore:
+                try:
+                    verification = await verify.verify_news(text)
+                except verify.VerificationUnavailable:
+                    return None
+            verify.remember_verification(fingerprint, *verification)
+            return verification
+
+        return await asyncio.gather(*(one(t) for t in texts))
+
+    async def score_batch(self, records) -> list:
+        results = [{"id": (r.fields if isinstance(r, BadRecord) else r).get(self.id_field, None)} for r in records]
+        valid = [i for i, r in enumerate(records)
+                 if not isinstance(r, BadRecord) and str(r.get(self.text_field) or "").strip()]
+        for i in set(range(len(records))) - set(valid):
+            bad = records[i]
+            results[i]["error"] = bad.error if isinstance(bad, BadRecord) else f"Missing '{self.text_field}'"
+        if not valid:
+            return results
+        texts = [str(records[i][self.text_field]) for i in valid]
+
+        # Model (in a thread) and verification (network) overlap
+        flat_chunks, spans = split_documents(texts)
+        model_call = asyncio.to_thread(self.model.predict_batch, flat_chunks)
+        if self.verify:
+            scores, verifications = await asyncio.gather(model_call, self._verify_all(texts))
+        else:
+            scores, verifications = await model_call, [None] * len(texts)
+        lstm_scores = combine_scores(scores, spans)
+
+        verification_scores = [np.nan if v is None else v[0] for v in verifications]
+        final_scores, verdicts, is_real = calculate_verdicts(lstm_scores, verification_scores)
+        for k, i in enumerate(valid):
+            verification = verifications[k]
+            results[i].update({
+                "lstm_score": lstm_scores[k],
+                "verification_score": None if verification is None else verification[0],
+                "matched_sources": [] if verification is None else verification[1],
+                "final_score": float(final_scores[k]),
+                "verdict": str(verdicts[k]),
+                "is_real": bool(is_real[k]),
+                "degraded": self.verify and verification is None,
+            })
+        return results
+
+    async def run(self, input_path: str, output_path: str, fmt: Optional[str] = None,
+                  checkpoint_path: Optional[str] = None, progress_every: float = 10.0) -> dict:
+        fmt = fmt or detect_format(input_path)
+        checkpoint = Checkpoint(checkpoint_path or output_path + ".checkpoint")
+        state = checkpoint.load() or {"input_offset": 0, "output_offset": 0, "items": 0}
+        output_size = os.path.getsize(output_path) if os.path.exists(output_path) else 0
+        if output_size < state["output_offset"]:
+            # The results the checkpoint counts on are gone; resuming would pad the output with NUL bytes
+            print(f"{output_path} is missing or shorter than its checkpoint, starting over")
+            state = {"input_offset": 0, "output_offset": 0, "items": 0}
+        if state["items"]:
+            print(f"Resuming after {state['items']} items")
+
+        start = time.perf_counter()
+        scored = 0
+        last_report = start
+        mode = "r+b" if os.path.exists(output_path) and state["output_offset"] else "wb"
+        with open(input_path, "rb") as src, open(output_path, mode) as out:
+            # Drop anything written after the last checkpoint (a batch cut short by a crash)
+            out.seek(state["output_offset"])
+            out.truncate()
+
+            batch, offset = [], state["input_offset"]
+            records = read_records(src, fmt, state["input_offset"])
+            while True:
+                batch.clear()
+                for record, offset in records:
+                    batch.append(record)
+                    if len(batch) >= self.batch_size:
+                        break
+                if not batch:
+                    break
+
+                for result in await self.score_batch(batch):
+                    out.write((json.dumps(result) + "\n").encode("utf-8"))
+                out.flush()
+                os.fsync(out.fileno())
+
+                scored += len(batch)
+                state = {"input_offset": offset, "output_offset": out.tell(), "items": state["items"] + len(batch)}
+                checkpoint.save(state)
+
+                now = time.perf_counter()
+                if now - last_report >= progress_every:
+                    print(f"{state['items']} items, {scored / (now - start):.1f} items/sec")
+                    last_report = now
+
+        checkpoint.clear()
+        elapsed = time.perf_counter() - start
+        return {
+            "items": scored,
+            "total_items": state["items"],
+            "seconds": round(elapsed, 3),
+            "items_per_sec": round(scored / elapsed, 2) if elapsed > 0 else 0.0,
+        }
+
+async def _close_http_client():
+    try:
+        from backend.http_client import get_http_client
+    except ImportError:
+        from http_client import get_http_client
+    await get_http_client().aclose()
+
+def main():
+    parser = argparse.ArgumentParser(description="Score a JSONL or CSV corpus offline, resumably.")
+    parser.add_argument("input", help="JSONL or CSV file with one article per record")
+    parser.add_argument("output", help="JSONL file to write results to (input order)")
+    parser.add_argument("--format", choices=["jsonl", "csv"], help="Input format (default: from the extension)")
+    parser.add_argument("--text-field", default="text")
+    parser.add_argument("--id-field", default="id")
+    parser.add_argument("--batch-size", type=int, default=64)
+    parser.add_argument("--verify", action="store_true", help="Also run search verification (uses search quota)")
+    parser.add_argument("--verify-concurrency", type=int, default=BATCH_IO_CONCURRENCY)
+    parser.add_argument("--checkpoint", help="Checkpoint file (default: <output>.checkpoint)")
+    parser.add_argument("--backend", default=MODEL_BACKEND, choices=["keras", "numpy"])
+    parser.add_argument("--model", default=MODEL_PATH)
+    parser.add_argument("--numpy-dir", default=NUMPY_MODEL_DIR)
+    args = parser.parse_args()
+
+    try:
+        from backend.model import FakeNewsModel
+    except ImportError:
+        from model import FakeNewsModel
+    model = FakeNewsModel(args.model, backend=args.backend, numpy_dir=args.numpy_dir)
+
+    scorer = BulkScorer(model, args.batch_size, args.verify, args.verify_concurrency, args.text_field, args.id_field)
+
+    async def run():
+        try:
+            return await scorer.run(args.input, args.output, args.format, args.checkpoint)
+        finally:
+            if args.verify:
+                await _close_http_client()
+
+    stats = asyncio.run(run())
+    print(f"Scored {stats['items']} items in {stats['seconds']}s ({stats['items_per_sec']} items/sec)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,277 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Callable, Optional
+
+try:
+    from backend.config import (
+        CACHE_BACKEND, CACHE_PATH, CACHE_MODEL_TTL, CACHE_VERIFICATION_TTL, CACHE_ARTICLE_TTL, CACHE_MAX_BYTES,
+        MODEL_PATH, MODEL_BACKEND, NUMPY_MODEL_DIR, CHUNK_WORDS, CHUNK_OVERLAP, CHUNK_MAX, CHUNK_AGGREGATION,
+    )
+    from backend.metrics import cache_lookup
+    from backend.jobs import normalize_url
+except ImportError:
+    from config import (
+        CACHE_BACKEND, CACHE_PATH, CACHE_MODEL_TTL, CACHE_VERIFICATION_TTL, CACHE_ARTICLE_TTL, CACHE_MAX_BYTES,
+        MODEL_PATH, MODEL_BACKEND, NUMPY_MODEL_DIR, CHUNK_WORDS, CHUNK_OVERLAP, CHUNK_MAX, CHUNK_AGGREGATION,
+    )
+    from metrics import cache_lookup
+    from jobs import normalize_url
+
+def normalize_text(text: str) -> str:
+    """Lowercases and collapses whitespace so trivial reformatting hits the same entry."""
+    return " ".join(text.lower().split())
+
+def text_key(text: str) -> str:
+    return hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+
+class MemoryCacheBackend:
+    """In-process LRU store capped by the serialized size of its values."""
+
+    def __init__(self, max_bytes: int, clock: Callable[[], float] = time.time):
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._entries = OrderedDict()  # key -> (expires_at, payload)
+        self._bytes = 0
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[dict]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires_at, payload = entry
+            if expires_at <= self.clock():
+                self._remove(key)
+                return None
+            self._entries.move_to_end(key)
+            return json.loads(payload)
+
+    def set(self, key: str, value: dict, ttl: float):
+        payload = json.dumps(value)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            if len(payload) > self.max_bytes:
+                return
+            self._entries[key] = (self.clock() + ttl, payload)
+            self._bytes += len(payload)
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def _remove(self, key):
+        _, payload = self._entries.pop(key)
+        self._bytes -= len(payload)
+
+    def stats(self) -> dict:
+        return {"backend": "memory", "entries": len(self._entries), "bytes": self._bytes}
+
+class SQLiteCacheBackend:
+    """
+    On-disk LRU store. Several worker processes can point at the same file
+    and share entries; WAL mode keeps readers from blocking the writer.
+    """
+
+    def __init__(self, path: str, max_bytes: int, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.clock = clock
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS cache ("
+            " key TEXT PRIMARY KEY, value TEXT NOT NULL, expires_at REAL NOT NULL,"
+            " accessed_at REAL NOT NULL, size INTEGER NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS cache_accessed ON cache (accessed_at)")
+
+    def get(self, key: str) -> Optional[dict]:
+        now = self.clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, expires_at FROM cache WHERE key = ?", (key,)
+            ).fetchone()
+            if row is None:
+                return None
+            if row[1] <= now:
+                self._conn.execute("DELETE FROM cache WHERE key = ?", (key,))
+                return None
+            self._conn.execute("UPDATE cache SET accessed_at = ? WHERE key = ?", (now, key))
+        return json.loads(row[0])
+
+    def set(self, key: str, value: dict, ttl: float):
+        payload = json.dumps(value)
+        if len(payload) > self.max_bytes:
+            return
+        now = self.clock()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (key, value, expires_at, accessed_at, size) VALUES (?, ?, ?, ?, ?)",
+                (key, payload, now + ttl, now, len(payload)),
+            )
+            self._evict(now)
+
+    def _evict(self, now):
+        self._conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        # Drop least recently used rows until we are back under the cap
+        excess = total - self.max_bytes
+        freed = 0
+        stale = []
+        for key, size in self._conn.execute("SELECT key, size FROM cache ORDER BY accessed_at"):
+            stale.append((key,))
+            freed += size
+            if freed >= excess:
+                break
+        self._conn.executemany("DELETE FROM cache WHERE key = ?", stale)
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM cache")
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache").fetchone()
+        return {"backend": "sqlite", "path": self.path, "entries": entries, "bytes": size}
+
+class ResultCache:
+    """
+    Caches the two expensive halves of a prediction separately: the model
+    score (stable until the model changes) and the verification result
+    (search results go stale much faster). Each has its own TTL. Article
+    text extracted from a URL is kept too, so a repeated URL can be
+    answered without fetching it again.
+    """
+
+    def __init__(self, backend, model_ttl: float, verification_ttl: float, model_version: str = "",
+                 article_ttl: float = 3600.0):
+        self.backend = backend
+        self.model_ttl = model_ttl
+        self.verification_ttl = verification_ttl
+        self.model_version = model_version
+        self.article_ttl = article_ttl
+        self.hits = {"model": 0, "verification": 0, "article": 0}
+        self.misses = {"model": 0, "verification": 0, "article": 0}
+
+    def _lookup(self, part: str, key: str) -> Optional[dict]:
+        value = self.backend.get(key)
+        if value is None:
+            self.misses[part] += 1
+        else:
+            self.hits[part] += 1
+        cache_lookup(part, value is not None)
+        return value
+
+    def get_model_score(self, text: str) -> Optional[float]:
+        value = self._lookup("model", f"model:{self.model_version}:{text_key(text)}")
+        return None if value is None else value["lstm_score"]
+
+    def set_model_score(self, text: str, score: float):
+        self.backend.set(f"model:{self.model_version}:{text_key(text)}", {"lstm_score": score}, self.model_ttl)
+
+    def get_verification(self, text: str) -> Optional[tuple]:
+        value = self._lookup("verification", f"verify:{text_key(text)}")
+        return None if value is None else (value["verification_score"], value["matches"])
+
+    def set_verification(self, text: str, score: float, matches: list):
+        self.backend.set(
+            f"verify:{text_key(text)}",
+            {"verification_score": score, "matches": matches},
+            self.verification_ttl,
+        )
+
+    @staticmethod
+    def _article_key(url: str) -> str:
+        # Not text_key: URL paths and queries are case-sensitive
+        return "article:" + hashlib.sha256(normalize_url(url).encode("utf-8")).hexdigest()
+
+    def get_article(self, url: str) -> Optional[str]:
+        value = self._lookup("article", self._article_key(url))
+        return None if value is None else value["text"]
+
+    def set_article(self, url: str, text: str):
+        self.backend.set(self._article_key(url), {"text": text}, self.article_ttl)
+
+    def stats(self) -> dict:
+        parts = {}
+        for part in ("model", "verification", "article"):
+            total = self.hits[part] + self.misses[part]
+            parts[part] = {
+                "hits": self.hits[part],
+                "misses": self.misses[part],
+                "hit_ratio": round(self.hits[part] / total, 4) if total else 0.0,
+            }
+        return {**parts, "store": self.backend.stats()}
+
+class NullResultCache:
+    """Drop-in replacement used when caching is disabled."""
+
+    def get_model_score(self, text):
+        return None
+
+    def set_model_score(self, text, score):
+        pass
+
+    def get_verification(self, text):
+        return None
+
+    def set_verification(self, text, score, matches):
+        pass
+
+    def get_article(self, url):
+        return None
+
+    def set_article(self, url, text):
+        pass
+
+    def stats(self) -> dict:
+        return {"store": {"backend": "off"}}
+
+def model_version(backend: str, model_path: str, numpy_dir: str) -> str:
+    """
+    Identifies what produced a cached model score: the backend, its weight
+    files (name, size and mtime of the .keras file or of every file in the
+    NumPy export) and the chunking setup.
+    """
+    if backend == "numpy":
+        paths = [os.path.join(numpy_dir, n) for n in sorted(os.listdir(numpy_dir))] if os.path.isdir(numpy_dir) else []
+    else:
+        paths = [model_path]
+    digest = hashlib.sha256()
+    for path in paths:
+        if os.path.isfile(path):
+            st = os.stat(path)
+            digest.update(f"{os.path.basename(path)}:{st.st_size}:{st.st_mtime_ns}\n".encode("utf-8"))
+    return f"{backend}-{digest.hexdigest()[:16]}/{CHUNK_WORDS}-{CHUNK_OVERLAP}-{CHUNK_MAX}-{CHUNK_AGGREGATION}"
+
+# Singleton instance
+result_cache = None
+
+def get_result_cache():
+    global result_cache
+    if result_cache is None:
+        if CACHE_BACKEND == "off":
+            result_cache = NullResultCache()
+            return result_cache
+        if CACHE_BACKEND == "sqlite":
+            backend = SQLiteCacheBackend(CACHE_PATH, CACHE_MAX_BYTES)
+        else:
+            backend = MemoryCacheBackend(CACHE_MAX_BYTES)
+        # Scores from another backend, an older model file or export, or another
+        # chunking setup must not be served after a redeploy
+        version = model_version(MODEL_BACKEND, MODEL_PATH, NUMPY_MODEL_DIR)
+        result_cache = ResultCache(backend, CACHE_MODEL_TTL, CACHE_VERIFICATION_TTL, version, CACHE_ARTICLE_TTL)
+    return result_cache
@@ -0,0 +1,77 @@
+from typing import List, Tuple
+
+import numpy as np
+
+try:
+    from backend.config import CHUNK_WORDS, CHUNK_OVERLAP, CHUNK_MAX, CHUNK_AGGREGATION
+except ImportError:
+    from config import CHUNK_WORDS, CHUNK_OVERLAP, CHUNK_MAX, CHUNK_AGGREGATION
+
+AGGREGATIONS = ("mean", "max_fake", "length_weighted")
+
+def chunk_text(
+    text: str,
+    window_words: int = CHUNK_WORDS,
+    overlap_words: int = CHUNK_OVERLAP,
+    max_chunks: int = CHUNK_MAX,
+) -> List[Tuple[str, int]]:
+    """
+    Splits a document into overlapping windows of whitespace-separated words.
+    Returns (chunk_text, word_count) pairs. Short texts come back unchanged as
+    a single chunk. When a document needs more than `max_chunks` windows, an
+    evenly spaced subset is kept so cost stays bounded while the whole
+    document is still sampled. The subset spans the first to the last window
+    when `max_chunks` >= 2; with a cap of 1 (or less) only the first window
+    is kept.
+    """
+    words = text.split()
+    window_words = max(1, window_words)
+    if len(words) <= window_words:
+        return [(text, len(words))]
+
+    stride = max(1, window_words - max(0, overlap_words))
+    last_start = len(words) - window_words
+    starts = list(range(0, last_start, stride)) + [last_start]
+    if len(starts) > max_chunks:
+        picks = np.linspace(0, len(starts) - 1, num=max(1, max_chunks))
+        starts = [starts[int(round(p))] for p in picks]
+        starts = sorted(set(starts))
+
+    return [(" ".join(words[s:s + window_words]), min(window_words, len(words) - s)) for s in starts]
+
+def aggregate_scores(scores, lengths, method: str = CHUNK_AGGREGATION) -> float:
+    """
+    Combines per-window scores (closer to 1 = likely real) into one score.
+      mean            - plain average
+      max_fake        - the most fake-looking window decides (minimum score)
+      length_weighted - average weighted by each window's word count
+    """
+    scores = np.asarray(scores, dtype=np.float64)
+    if scores.size == 1:
+        return float(scores[0])
+    if method == "max_fake":
+        return float(scores.min())
+    if method == "length_weighted":
+        weights = np.asarray(lengths, dtype=np.float64)
+        if weights.sum() > 0:
+            return float(np.average(scores, weights=weights))
+    return float(scores.mean())
+
+def split_documents(texts: List[str], **chunk_options):
+    """
+    Chunks many documents at once for a single batched model call.
+    Returns (flat_chunks, spans) where spans[i] = (start, end, lengths)
+    locates document i's windows inside flat_chunks.
+    """
+    flat = []
+    spans = []
+    for text in texts:
+        chunks = chunk_text(text, **chunk_options)
+        start = len(flat)
+        flat.extend(chunk for chunk, _ in chunks)
+        spans.append((start, len(flat), [n for _, n in chunks]))
+    return flat, spans
+
+def combine_scores(scores, spans, method: str = CHUNK_AGGREGATION) -> List[float]:
+    """Inverse of split_documents: one aggregated score per document."""
+    return [aggregate_scores(scores[start:end], lengths, method) for start, end, lengths in spans]
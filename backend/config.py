@@ -0,0 +1,158 @@
+import logging
+import os
+
+# Runtime settings. Every value can be overridden with an FND_* environment
+# variable so deployments can tune behaviour without code changes.
+
+logger = logging.getLogger(__name__)
+
+def _env_int(name: str, default: int) -> int:
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return int(value)
+    except ValueError:
+        logger.warning("Invalid integer for %s: %r, using %s", name, value, default)
+        return default
+
+def _env_float(name: str, default: float) -> float:
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    try:
+        return float(value)
+    except ValueError:
+        logger.warning("Invalid number for %s: %r, using %s", name, value, default)
+        return default
+
+def _env_str(name: str, default: str) -> str:
+    value = os.environ.get(name)
+    if value is None or value.strip() == "":
+        return default
+    return value.strip()
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+# Model
+MODEL_PATH = _env_str("FND_MODEL_PATH", os.path.join(BASE_DIR, "fake_lstm_saved.keras"))
+MODEL_BACKEND = _env_str("FND_MODEL_BACKEND", "keras").lower()   # keras | numpy
+NUMPY_MODEL_DIR = _env_str("FND_NUMPY_MODEL_DIR", os.path.join(BASE_DIR, "fake_lstm_numpy"))  # see export_model.py
+
+# Inference worker processes. 0 scores in the API process; N > 0 starts N
+# worker processes fed from a bounded queue (full queue -> 429 Retry-After).
+MODEL_WORKERS = _env_int("FND_MODEL_WORKERS", 0)
+MODEL_WORKER_QUEUE = _env_int("FND_MODEL_WORKER_QUEUE", 64)            # batches waiting for a worker
+MODEL_WORKER_MAX_REQUESTS = _env_int("FND_MODEL_WORKER_MAX_REQUESTS", 0)  # recycle a worker after N batches (0 = never)
+
+# Micro-batching scheduler
+BATCH_MAX_SIZE = _env_int("FND_BATCH_MAX_SIZE", 32)        # items per forward pass
+BATCH_MAX_WAIT_MS = _env_float("FND_BATCH_MAX_WAIT_MS", 5.0)  # how long the first item waits for company
+BATCH_EXECUTOR_THREADS = _env_int("FND_BATCH_EXECUTOR_THREADS", 1)
+
+# Bulk endpoint
+BATCH_MAX_ITEMS = _env_int("FND_BATCH_MAX_ITEMS", 1000)          # items accepted per /predict-batch call
+BATCH_IO_CONCURRENCY = _env_int("FND_BATCH_IO_CONCURRENCY", 8)    # parallel URL fetches / searches per call
+
+# Prediction result cache
+CACHE_BACKEND = _env_str("FND_CACHE_BACKEND", "memory").lower()  # memory | sqlite | off
+CACHE_PATH = _env_str("FND_CACHE_PATH", os.path.join(BASE_DIR, "result_cache.sqlite3"))
+CACHE_MODEL_TTL = _env_float("FND_CACHE_MODEL_TTL", 7 * 24 * 3600.0)
+CACHE_VERIFICATION_TTL = _env_float("FND_CACHE_VERIFICATION_TTL", 6 * 3600.0)
+CACHE_ARTICLE_TTL = _env_float("FND_CACHE_ARTICLE_TTL", 3600.0)  # extracted article text per URL
+CACHE_MAX_BYTES = _env_int("FND_CACHE_MAX_BYTES", 64 * 1024 * 1024)
+
+# Near-duplicate reuse: a text within NEAR_DUP_MAX_DISTANCE SimHash bits of a
+# recently verified one reuses that verification instead of a new search
+NEAR_DUP_ENABLED = _env_int("FND_NEAR_DUP", 1) != 0
+NEAR_DUP_MAX_DISTANCE = _env_int("FND_NEAR_DUP_MAX_DISTANCE", 6)     # of 64 bits; 0 = identical fingerprints only
+NEAR_DUP_MAX_ENTRIES = _env_int("FND_NEAR_DUP_MAX_ENTRIES", 50000)
+NEAR_DUP_TTL = _env_float("FND_NEAR_DUP_TTL", CACHE_VERIFICATION_TTL)
+NEAR_DUP_MIN_WORDS = _env_int("FND_NEAR_DUP_MIN_WORDS", 50)          # shorter texts are never matched
+NEAR_DUP_MAX_WORDS = _env_int("FND_NEAR_DUP_MAX_WORDS", 2000)        # words fingerprinted per text
+NEAR_DUP_SHINGLE = _env_int("FND_NEAR_DUP_SHINGLE", 3)               # words per shingle
+
+# Outbound HTTP (article fetches and search calls)
+HTTP_MAX_CONNECTIONS = _env_int("FND_HTTP_MAX_CONNECTIONS", 100)
+HTTP_MAX_KEEPALIVE = _env_int("FND_HTTP_MAX_KEEPALIVE", 20)
+HTTP_PER_HOST_LIMIT = _env_int("FND_HTTP_PER_HOST_LIMIT", 8)     # concurrent requests per host
+HTTP_CONNECT_TIMEOUT = _env_float("FND_HTTP_CONNECT_TIMEOUT", 3.0)
+HTTP_READ_TIMEOUT = _env_float("FND_HTTP_READ_TIMEOUT", 10.0)
+HTTP_RETRIES = _env_int("FND_HTTP_RETRIES", 2)                   # extra attempts after the first
+HTTP_BACKOFF = _env_float("FND_HTTP_BACKOFF", 0.2)               # seconds, doubled per retry
+SEARCH_URL = _env_str("FND_SEARCH_URL", "https://www.googleapis.com/customsearch/v1")
+SEARCH_TIMEOUT = _env_float("FND_SEARCH_TIMEOUT", 5.0)
+
+# Verification: several candidate queries per text, searched concurrently
+SEARCH_PROVIDER = _env_str("FND_SEARCH_PROVIDER", "google").lower()
+VERIFY_MAX_QUERIES = _env_int("FND_VERIFY_MAX_QUERIES", 3)         # paid searches per text at most
+VERIFY_SEARCH_BUDGET = _env_float("FND_VERIFY_SEARCH_BUDGET", 3.0)  # seconds; score what has arrived by then
+VERIFY_ENOUGH_SOURCES = _env_int("FND_VERIFY_ENOUGH_SOURCES", 3)    # distinct trusted outlets that end the fan-out
+VERIFY_ENOUGH_FACT_CHECKS = _env_int("FND_VERIFY_ENOUGH_FACT_CHECKS", 1)
+
+# Offline evidence index (FND_SEARCH_PROVIDER=offline, or auto without Google credentials)
+EVIDENCE_INDEX_DIR = _env_str("FND_EVIDENCE_INDEX_DIR", os.path.join(BASE_DIR, "evidence_index"))
+EVIDENCE_RESULTS = _env_int("FND_EVIDENCE_RESULTS", 10)                   # items per query, like a results page
+EVIDENCE_MIN_MATCH = _env_float("FND_EVIDENCE_MIN_MATCH", 0.5)            # share of query terms a document must contain
+EVIDENCE_RELOAD_INTERVAL = _env_float("FND_EVIDENCE_RELOAD_INTERVAL", 5.0)  # seconds between manifest checks
+
+# Search quota protection: results are cached per normalized keyword query,
+# and paid queries pass a token bucket plus a hard daily budget (0 = no cap).
+SEARCH_CACHE_PATH = _env_str("FND_SEARCH_CACHE_PATH", os.path.join(BASE_DIR, "search_cache.sqlite3"))
+SEARCH_CACHE_TTL = _env_float("FND_SEARCH_CACHE_TTL", 24 * 3600.0)
+SEARCH_RATE_PER_MINUTE = _env_float("FND_SEARCH_RATE_PER_MINUTE", 60.0)
+SEARCH_BURST = _env_int("FND_SEARCH_BURST", 10)
+SEARCH_DAILY_BUDGET = _env_int("FND_SEARCH_DAILY_BUDGET", 100)  # Custom Search free tier
+
+# Trusted outlets and fact-checkers (edited in place, picked up without a restart)
+SOURCES_PATH = _env_str("FND_SOURCES_PATH", os.path.join(BASE_DIR, "sources.json"))
+SOURCES_RELOAD_INTERVAL = _env_float("FND_SOURCES_RELOAD_INTERVAL", 5.0)  # seconds between mtime checks
+
+# Asynchronous jobs (POST /jobs): a bounded worker pool and a SQLite job store
+JOBS_PATH = _env_str("FND_JOBS_PATH", os.path.join(BASE_DIR, "jobs.sqlite3"))
+JOB_WORKERS = _env_int("FND_JOB_WORKERS", 4)            # jobs processed concurrently
+JOB_QUEUE_MAX = _env_int("FND_JOB_QUEUE_MAX", 256)      # queued jobs before POST /jobs answers 429
+JOB_TTL = _env_float("FND_JOB_TTL", 3600.0)             # seconds a finished job stays retrievable
+JOB_CLEANUP_INTERVAL = _env_float("FND_JOB_CLEANUP_INTERVAL", 60.0)
+JOB_LEASE = _env_float("FND_JOB_LEASE", 60.0)         # seconds an unfinished job stays with a silent owner
+
+# Admission control for /predict-text and /predict-url: each class has its
+# own concurrency limit (adapted to latency between the initial value and
+# the max) and wait queue; requests beyond the queue or its timeout get 503.
+ADMISSION_ENABLED = _env_int("FND_ADMISSION", 1) != 0
+ADMIT_TEXT_LIMIT = _env_int("FND_ADMIT_TEXT_LIMIT", 64)
+ADMIT_TEXT_MAX_LIMIT = _env_int("FND_ADMIT_TEXT_MAX_LIMIT", 256)
+ADMIT_TEXT_QUEUE = _env_int("FND_ADMIT_TEXT_QUEUE", 128)
+ADMIT_TEXT_QUEUE_TIMEOUT = _env_float("FND_ADMIT_TEXT_QUEUE_TIMEOUT", 1.0)
+ADMIT_TEXT_TARGET = _env_float("FND_ADMIT_TEXT_TARGET", 5.0)     # seconds; above the verification deadline
+ADMIT_URL_LIMIT = _env_int("FND_ADMIT_URL_LIMIT", 16)
+ADMIT_URL_MAX_LIMIT = _env_int("FND_ADMIT_URL_MAX_LIMIT", 64)
+ADMIT_URL_QUEUE = _env_int("FND_ADMIT_URL_QUEUE", 32)
+ADMIT_URL_QUEUE_TIMEOUT = _env_float("FND_ADMIT_URL_QUEUE_TIMEOUT", 2.0)
+ADMIT_URL_TARGET = _env_float("FND_ADMIT_URL_TARGET", 10.0)
+
+# Verdict fusion policy: JSON file written by evaluate_verdicts.py (empty = built-in banded weights)
+VERDICT_POLICY_PATH = _env_str("FND_VERDICT_POLICY", "")
+
+# Per-stage deadlines (seconds) for a single prediction
+MODEL_DEADLINE = _env_float("FND_MODEL_DEADLINE", 15.0)
+VERIFY_DEADLINE = _env_float("FND_VERIFY_DEADLINE", 4.0)   # past this, answer with a model-only verdict
+
+# Model startup: eager (load + warm-up before serving), background (serve
+# immediately, /readyz turns green once loaded) or lazy (load on first request)
+MODEL_STARTUP = _env_str("FND_MODEL_STARTUP", "eager").lower()
+
+# Long documents are scored as overlapping word windows in one batched call
+CHUNK_WORDS = _env_int("FND_CHUNK_WORDS", 250)        # matches the model's 250-token input
+CHUNK_OVERLAP = _env_int("FND_CHUNK_OVERLAP", 50)
+CHUNK_MAX = _env_int("FND_CHUNK_MAX", 8)              # cost bound per document
+CHUNK_AGGREGATION = _env_str("FND_CHUNK_AGGREGATION", "mean").lower()  # mean | max_fake | length_weighted
+EXTRACT_MAX_CHARS = _env_int("FND_EXTRACT_MAX_CHARS", 100000)  # safety cap on extracted article text
+EXTRACT_MAX_BYTES = _env_int("FND_EXTRACT_MAX_BYTES", 2 * 1024 * 1024)  # download cap per article
+EXTRACT_TARGET_CHARS = _env_int("FND_EXTRACT_TARGET_CHARS", 20000)   # stop reading once this much prose is found
+
+# Observability: Prometheus metrics on /metrics and one structured trace
+# log line (logger "fnd.trace") per request
+METRICS_ENABLED = _env_int("FND_METRICS", 1) != 0
+TRACE_LOG = _env_int("FND_TRACE_LOG", 1) != 0
+LOG_LEVEL = _env_str("FND_LOG_LEVEL", "INFO").upper()
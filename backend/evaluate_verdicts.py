@@ -0,0 +1,160 @@
+import argparse
+import json
+import os
+import time
+from typing import List, Tuple
+
+import numpy as np
+
+try:
+    from backend.verdict import (
+        VERDICT_REAL, VERDICT_MIXED, VERDICT_FAKE, BandedPolicy, IsotonicPolicy, LogisticPolicy, FusionPolicy,
+        calculate_verdicts, fit_isotonic, fit_logistic, load_policy,
+    )
+except ImportError:
+    from verdict import (
+        VERDICT_REAL, VERDICT_MIXED, VERDICT_FAKE, BandedPolicy, IsotonicPolicy, LogisticPolicy, FusionPolicy,
+        calculate_verdicts, fit_isotonic, fit_logistic, load_policy,
+    )
+
+# Offline comparison of verdict fusion policies on labelled data: JSONL
+# rows with lstm_score, verification_score (null when verification was
+# unavailable) and label (1 / true / "real" for real news). Every policy
+# is applied to the whole set in one vectorized call.
+
+def _label(value) -> float:
+    if isinstance(value, str):
+        value = value.strip().lower()
+        if value in ("real", "true", "1"):
+            return 1.0
+        if value in ("fake", "false", "0"):
+            return 0.0
+        raise ValueError(f"Unknown label: {value!r}")
+    return 1.0 if value else 0.0
+
+def read_labelled(path: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """(lstm_scores, verification_scores with NaN for missing, labels) from a JSONL file."""
+    lstm, verification, labels = [], [], []
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            row = json.loads(line)
+            lstm.append(float(row["lstm_score"]))
+            score = row.get("verification_score")
+            verification.append(np.nan if score is None else float(score))
+            labels.append(_label(row["label"]))
+    return np.asarray(lstm), np.asarray(verification), np.asarray(labels)
+
+def expected_calibration_error(probabilities: np.ndarray, labels: np.ndarray, bins: int = 10) -> float:
+    """Mean |observed real rate - mean score| over equal-width score bins, weighted by bin size."""
+    index = np.minimum((probabilities * bins).astype(int), bins - 1)
+    counts = np.bincount(index, minlength=bins)
+    score_sums = np.bincount(index, weights=probabilities, minlength=bins)
+    label_sums = np.bincount(index, weights=labels, minlength=bins)
+    filled = counts > 0
+    gaps = np.abs(label_sums[filled] - score_sums[filled])  # = count * |rate - mean score|
+    return float(gaps.sum() / len(probabilities))
+
+def evaluate(policy: FusionPolicy, lstm, verification, labels, bins: int = 10, repeats: int = 5) -> dict:
+    timings = []
+    for _ in range(max(1, repeats)):
+        start = time.perf_counter()
+        final_scores, verdicts, is_real = calculate_verdicts(lstm, verification, policy)
+        timings.append(time.perf_counter() - start)
+    probabilities = np.clip(final_scores, 0.0, 1.0)
+    labels_real = labels >= 0.5
+    decided = verdicts != VERDICT_MIXED
+    return {
+        "accuracy": round(float(np.mean(is_real == labels_real)), 4),
+        # Accuracy over items given a confident verdict (real or fake)
+        "decided_accuracy": round(float(np.mean((is_real == labels_real)[decided])), 4) if decided.any() else None,
+        "ece": round(expected_calibration_error(probabilities, labels, bins), 4),
+        "brier": round(float(np.mean((probabilities - labels) ** 2)), 4),
+        "verdicts": {v: int(np.sum(verdicts == v)) for v in (VERDICT_REAL, VERDICT_MIXED, VERDICT_FAKE)},
+        "rows_per_sec": round(len(labels) / min(timings)),
+    }
+
+def _fittable(features: np.ndarray, labels: np.ndarray) -> bool:
+    """Whether a logistic fit is well posed: both classes present and no constant feature."""
+    return len(np.unique(labels)) == 2 and bool(np.all(np.ptp(features, axis=0) > 0))
+
+def fit_policies(lstm, verification, labels) -> List[Tuple[str, FusionPolicy]]:
+    """
+    Logistic and isotonic policies fitted on the given rows. Raises
+    ValueError when the rows with verification cannot support a fit.
+    """
+    present = ~np.isnan(verification)
+    features = np.column_stack([lstm[present], verification[present]])
+    if not present.any():
+        raise ValueError("no rows with a verification_score to fit on")
+    if not _fittable(features, labels[present]):
+        raise ValueError(
+            "rows with a verification_score need both real and fake labels and varying lstm and verification scores"
+        )
+    try:
+        coef, intercept = fit_logistic(features, labels[present])
+    except np.linalg.LinAlgError as exc:
+        raise ValueError(f"logistic fit did not converge: {exc}") from exc
+    model_only = None
+    if (~present).sum() >= 10 and _fittable(lstm[~present, None], labels[~present]):
+        only_coef, only_intercept = fit_logistic(lstm[~present, None], labels[~present])
+        model_only = [only_coef[0], only_intercept]
+    logistic = LogisticPolicy(coef, intercept, model_only)
+
+    base = BandedPolicy()
+    x, y = fit_isotonic(base.fuse(lstm, verification), labels)
+    isotonic = IsotonicPolicy(x, y, base)
+    return [("logistic (fitted)", logistic), ("isotonic (fitted)", isotonic)]
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare verdict fusion policies on labelled scores.")
+    parser.add_argument("data", help="JSONL with lstm_score, verification_score, label")
+    parser.add_argument("--policy", action="append", default=[], help="Policy JSON file to include (repeatable)")
+    parser.add_argument("--fit", action="store_true", help="Also fit logistic and isotonic policies")
+    parser.add_argument("--test-fraction", type=float, default=0.3,
+                        help="With --fit, share of rows held out for evaluation")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--bins", type=int, default=10, help="Score bins for the calibration error")
+    parser.add_argument("--save", help="With --fit, directory to write the fitted policies to")
+    args = parser.parse_args()
+    if args.save and not args.fit:
+        parser.error("--save needs --fit (only fitted policies are saved)")
+
+    if args.fit and not 0 < args.test_fraction < 1:
+        parser.error("--test-fraction must be between 0 and 1")
+
+    lstm, verification, labels = read_labelled(args.data)
+    if not len(labels):
+        parser.error(f"{args.data} has no labelled rows")
+    policies = [("banded (default)", BandedPolicy())]
+    policies += [(path, load_policy(path)) for path in args.policy]
+
+    test = np.arange(len(labels))
+    if args.fit:
+        order = np.random.default_rng(args.seed).permutation(len(labels))
+        held_out = int(len(labels) * args.test_fraction)
+        test, train = order[:held_out], order[held_out:]
+        if not len(test) or not len(train):
+            parser.error(f"--test-fraction {args.test_fraction} leaves an empty split of {len(labels)} rows")
+        try:
+            fitted = fit_policies(lstm[train], verification[train], labels[train])
+        except ValueError as exc:
+            parser.error(f"cannot fit policies on the training split: {exc}")
+        policies += fitted
+        if args.save:
+            os.makedirs(args.save, exist_ok=True)
+            for name, policy in fitted:
+                with open(os.path.join(args.save, f"{policy.kind}.json"), "w") as f:
+                    json.dump(policy.to_dict(), f, indent=2)
+
+    report = {
+        "rows": int(len(test)),
+        "missing_verification": int(np.isnan(verification[test]).sum()),
+        "policies": {name: evaluate(policy, lstm[test], verification[test], labels[test], args.bins)
+                     for name, policy in policies},
+    }
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
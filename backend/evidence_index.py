@@ -0,0 +1,385 @@
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import mmap
+import os
+import shutil
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, Iterable, List
+
+import numpy as np
+
+try:
+    from backend.config import (
+        EVIDENCE_INDEX_DIR, EVIDENCE_RESULTS, EVIDENCE_MIN_MATCH, EVIDENCE_RELOAD_INTERVAL,
+    )
+    from backend.search_providers import SearchProvider
+    from backend.text_analysis import STOP_WORDS, tokenize, split_sentences
+except ImportError:
+    from config import EVIDENCE_INDEX_DIR, EVIDENCE_RESULTS, EVIDENCE_MIN_MATCH, EVIDENCE_RELOAD_INTERVAL
+    from search_providers import SearchProvider
+    from text_analysis import STOP_WORDS, tokenize, split_sentences
+
+logger = logging.getLogger(__name__)
+
+# A local BM25 index over trusted-source and fact-check articles, for
+# verification without network access.
+#
+# Layout: <dir>/manifest.json lists immutable segments. Each segment holds
+#   terms.json        term -> [start, count] into the postings arrays
+#   doc_ids.npy       uint32 postings (document numbers), grouped by term
+#   tfs.npy           uint16 term frequencies, parallel to doc_ids
+#   doc_lengths.npy   uint32 tokens per document
+#   url_hashes.npy    uint64 hash of each document's URL
+#   docs.jsonl        link / title / text per document, one line each
+#   doc_offsets.npy   uint64 byte offset of each docs.jsonl line (+ end)
+# The arrays and docs.jsonl are memory-mapped, so several processes share
+# one copy through the page cache. Adding documents writes a new segment;
+# a URL indexed again supersedes its older copies. compact() merges all
+# segments into one.
+
+INDEX_VERSION = 1
+BM25_K1 = 1.2
+BM25_B = 0.75
+SNIPPET_SOURCE_CHARS = 4000   # text kept per document to cut snippets from
+SNIPPET_SENTENCES = 2
+
+def index_terms(text: str) -> List[str]:
+    return [t for t in tokenize(text) if t not in STOP_WORDS]
+
+def url_hash(url: str) -> int:
+    return int.from_bytes(hashlib.blake2b(url.strip().encode("utf-8"), digest_size=8).digest(), "little")
+
+def _write_json(path: str, value):
+    tmp = path + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(value, f)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)  # atomic: readers see the old or the new file
+
+def write_segment(path: str, docs: List[dict]):
+    """Writes one immutable segment for `docs` (dicts with link, title, text)."""
+    tmp = path + ".tmp"
+    shutil.rmtree(tmp, ignore_errors=True)
+    os.makedirs(tmp)
+
+    postings: Dict[str, list] = {}
+    lengths = np.zeros(len(docs), dtype=np.uint32)
+    offsets = np.zeros(len(docs) + 1, dtype=np.uint64)
+    with open(os.path.join(tmp, "docs.jsonl"), "wb") as out:
+        for number, doc in enumerate(docs):
+            terms = index_terms(f"{doc['title']} {doc['text']}")
+            lengths[number] = len(terms)
+            for term, tf in Counter(terms).items():
+                postings.setdefault(term, []).append((number, tf))
+            line = json.dumps({"link": doc["link"], "title": doc["title"], "text": doc["text"][:SNIPPET_SOURCE_CHARS]})
+            out.write(line.encode("utf-8") + b"\n")
+            offsets[number + 1] = out.tell()
+
+    terms, doc_ids, tfs = {}, [], []
+    start = 0
+    for term in sorted(postings):
+        entries = postings[term]
+        terms[term] = [start, len(entries)]
+        doc_ids.extend(number for number, _ in entries)
+        tfs.extend(min(tf, 65535) for _, tf in entries)
+        start += len(entries)
+
+    np.save(os.path.join(tmp, "doc_ids.npy"), np.asarray(doc_ids, dtype=np.uint32))
+    np.save(os.path.join(tmp, "tfs.npy"), np.asarray(tfs, dtype=np.uint16))
+    np.save(os.path.join(tmp, "doc_lengths.npy"), lengths)
+    np.save(os.path.join(tmp, "doc_offsets.npy"), offsets)
+    np.save(os.path.join(tmp, "url_hashes.npy"), np.asarray([url_hash(d["link"]) for d in docs], dtype=np.uint64))
+    with open(os.path.join(tmp, "terms.json"), "w") as f:
+        json.dump(terms, f)
+    os.replace(tmp, path)
+
+class Segment:
+    def __init__(self, path: str):
+        self.path = path
+        with open(os.path.join(path, "terms.json"), "r") as f:
+            self.terms: Dict[str, list] = json.load(f)
+        load = lambda name: np.load(os.path.join(path, name), mmap_mode="r")
+        self.doc_ids = load("doc_ids.npy")
+        self.tfs = load("tfs.npy")
+        self.doc_lengths = load("doc_lengths.npy")
+        self.doc_offsets = load("doc_offsets.npy")
+        self.url_hashes = load("url_hashes.npy")
+        self.num_docs = len(self.doc_lengths)
+        self.live = np.ones(self.num_docs, dtype=bool)  # False where a newer segment has the URL
+        with open(os.path.join(path, "docs.jsonl"), "rb") as f:
+            self._docs = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.num_docs else None
+
+    def postings(self, term: str):
+        entry = self.terms.get(term)
+        if entry is None:
+            return None, None
+        start, count = entry
+        return self.doc_ids[start:start + count], self.tfs[start:start + count]
+
+    def doc(self, number: int) -> dict:
+        start, end = int(self.doc_offsets[number]), int(self.doc_offsets[number + 1])
+        return json.loads(self._docs[start:end])
+
+    def close(self):
+        if self._docs is not None:
+            self._docs.close()
+
+def best_snippet(text: str, terms: Iterable[str]) -> str:
+    """The run of sentences that mentions the most query terms."""
+    terms = set(terms)
+    sentences = split_sentences(text)
+    if not sentences:
+        return ""
+    hits = [len(terms.intersection(tokenize(s))) for s in sentences]
+    windows = [sum(hits[i:i + SNIPPET_SENTENCES]) for i in range(len(sentences))]
+    start = int(np.argmax(windows))
+    return " ".join(sentences[start:start + SNIPPET_SENTENCES])
+
+class EvidenceIndex:
+    """
+    Segmented BM25 index with memory-mapped postings. Readers pick up
+    segments added by another process when the manifest changes (checked
+    at most every `reload_interval` seconds).
+    """
+
+    def __init__(self, path: str, reload_interval: float = 5.0, clock: Callable[[], float] = time.monotonic):
+        self.path = path
+        self.reload_interval = reload_interval
+        self.clock = clock
+        self.segments: List[Segment] = []
+        self.num_docs = 0
+        self.avg_length = 0.0
+        self._manifest_stamp = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+        self.reload()
+
+    @property
+    def manifest_path(self) -> str:
+        return os.path.join(self.path, "manifest.json")
+
+    def _manifest(self) -> dict:
+        if not os.path.exists(self.manifest_path):
+            return {"version": INDEX_VERSION, "segments": [], "next_segment": 1}
+        with open(self.manifest_path, "r") as f:
+            manifest = json.load(f)
+        if manifest.get("version") != INDEX_VERSION:
+            raise ValueError(f"Unsupported evidence index format in {self.path}")
+        return manifest
+
+    def _stamp(self):
+        # The manifest is replaced, never edited, so a new inode marks a change even within one mtime tick
+        try:
+            st = os.stat(self.manifest_path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def reload(self, force: bool = False) -> bool:
+        """Re-opens the segments if the manifest changed. A broken index keeps the previous segments."""
+        with self._lock:
+            self._checked_at = self.clock()
+            try:
+                stamp = self._stamp()
+                if stamp == self._manifest_stamp and not force:
+                    return False
+                segments = [Segment(os.path.join(self.path, name)) for name in self._manifest()["segments"]]
+            except (OSError, ValueError, KeyError) as e:
+                logger.error("Could not load evidence index from %s: %s", self.path, e)
+                return False
+
+            # Newest copy of a URL wins; older segments are masked
+            seen = np.zeros(0, dtype=np.uint64)
+            total_length, live_docs = 0, 0
+            for segment in reversed(segments):
+                segment.live = ~np.isin(segment.url_hashes, seen)
+                seen = np.union1d(seen, segment.url_hashes)
+                total_length += int(segment.doc_lengths[segment.live].sum())
+                live_docs += int(segment.live.sum())
+
+            old, self.segments = self.segments, segments
+            self.num_docs = live_docs
+            self.avg_length = total_length / live_docs if live_docs else 0.0
+            self._manifest_stamp = stamp
+        for segment in old:
+            segment.close()
+        return True
+
+    def _maybe_reload(self):
+        if self._checked_at is None or self.clock() - self._checked_at >= self.reload_interval:
+            self.reload()
+
+    def add_documents(self, docs: List[dict]) -> int:
+        """Indexes `docs` as a new segment. Returns the number of documents written."""
+        docs = [d for d in docs if d.get("link") and (d.get("title") or d.get("text"))]
+        if not docs:
+            return 0
+        os.makedirs(self.path, exist_ok=True)
+        manifest = self._manifest()
+        name = f"seg-{manifest['next_segment']:06d}"
+        write_segment(os.path.join(self.path, name), docs)
+        manifest["segments"].append(name)
+        manifest["next_segment"] += 1
+        _write_json(self.manifest_path, manifest)
+        self.reload(force=True)
+        return len(docs)
+
+    def compact(self) -> int:
+        """Merges all segments into one, dropping superseded documents. Returns the document count."""
+        self.reload()
+        docs = []
+        for segment in self.segments:
+            docs.extend(segment.doc(int(n)) for n in np.flatnonzero(segment.live))
+        old_names = self._manifest()["segments"]
+        if len(old_names) <= 1:
+            return len(docs)
+        manifest = self._manifest()
+        name = f"seg-{manifest['next_segment']:06d}"
+        write_segment(os.path.join(self.path, name), docs)
+        manifest.update(segments=[name], next_segment=manifest["next_segment"] + 1)
+        _write_json(self.manifest_path, manifest)
+        self.reload(force=True)
+        for old_name in old_names:
+            # Other processes may still map the old files; on POSIX they stay valid until unmapped
+            shutil.rmtree(os.path.join(self.path, old_name), ignore_errors=True)
+        return len(docs)
+
+    def search(self, query: str, limit: int = 10, min_match: float = 0.5) -> List[dict]:
+        """
+        Top `limit` documents by BM25 as search items (link, title,
+        snippet). A document must contain at least `min_match` of the
+        distinct query terms.
+        """
+        self._maybe_reload()
+        terms = list(dict.fromkeys(index_terms(query)))
+        segments, num_docs, avg_length = self.segments, self.num_docs, self.avg_length
+        if not terms or not num_docs:
+            return []
+
+        looked_up = [[segment.postings(term) for term in terms] for segment in segments]
+        df = np.zeros(len(terms))
+        for per_term, segment in zip(looked_up, segments):
+            for t, (ids, _) in enumerate(per_term):
+                if ids is not None:
+                    df[t] += int(segment.live[ids].sum())
+        idf = np.log(1.0 + (num_docs - df + 0.5) / (df + 0.5))
+        required = max(1, int(np.ceil(min_match * len(terms))))
+
+        candidates = []
+        for s, (per_term, segment) in enumerate(zip(looked_up, segments)):
+            scores = np.zeros(segment.num_docs, dtype=np.float64)
+            matched = np.zeros(segment.num_docs, dtype=np.int32)
+            for t, (ids, tfs) in enumerate(per_term):
+                if ids is None:
+                    continue
+                tf = tfs.astype(np.float64)
+                norm = BM25_K1 * (1.0 - BM25_B + BM25_B * segment.doc_lengths[ids] / avg_length)
+                scores[ids] += idf[t] * tf * (BM25_K1 + 1.0) / (tf + norm)
+                matched[ids] += 1
+            eligible = np.flatnonzero(segment.live & (matched >= required))
+            if not len(eligible):
+                continue
+            top = eligible[np.argsort(-scores[eligible], kind="stable")[:limit]]
+            candidates.extend((scores[n], s, int(n)) for n in top)
+
+        candidates.sort(key=lambda c: -c[0])
+        items = []
+        for score, s, number in candidates[:limit]:
+            doc = segments[s].doc(number)
+            items.append({
+                "link": doc["link"],
+                "title": doc["title"],
+                "snippet": best_snippet(doc["text"], terms),
+                "score": round(float(score), 4),
+            })
+        return items
+
+    def stats(self) -> dict:
+        return {"path": self.path, "segments": len(self.segments), "documents": self.num_docs}
+
+class OfflineSearchProvider(SearchProvider):
+    """Search items from the local evidence index; no network, no quota."""
+    name = "offline"
+
+    def __init__(self, index: EvidenceIndex, limit: int = 10, min_match: float = 0.5):
+        self.index = index
+        self.limit = limit
+        self.min_match = min_match
+
+    def available(self) -> bool:
+        self.index._maybe_reload()
+        return self.index.num_docs > 0
+
+    async def search(self, query: str) -> list:
+        # NumPy releases the GIL for the heavy parts; keep the loop free on big indexes
+        return await asyncio.to_thread(self.index.search, query, self.limit, self.min_match)
+
+# Singleton instance
+evidence_index = None
+
+def get_evidence_index() -> EvidenceIndex:
+    global evidence_index
+    if evidence_index is None:
+        evidence_index = EvidenceIndex(EVIDENCE_INDEX_DIR, EVIDENCE_RELOAD_INTERVAL)
+    return evidence_index
+
+def get_offline_provider() -> OfflineSearchProvider:
+    return OfflineSearchProvider(get_evidence_index(), EVIDENCE_RESULTS, EVIDENCE_MIN_MATCH)
+
+def read_corpus(path: str) -> Iterable[dict]:
+    """JSONL records with url (or link), title and text (or snippet)."""
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            yield {
+                "link": str(record.get("url") or record.get("link") or "").strip(),
+                "title": str(record.get("title") or ""),
+                "text": str(record.get("text") or record.get("snippet") or ""),
+            }
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the offline evidence index.")
+    parser.add_argument("--index", default=EVIDENCE_INDEX_DIR, help="Index directory")
+    commands = parser.add_subparsers(dest="command", required=True)
+    add = commands.add_parser("add", help="Index a JSONL corpus (url, title, text) as a new segment")
+    add.add_argument("corpus")
+    add.add_argument("--segment-size", type=int, default=50000, help="Documents per segment")
+    commands.add_parser("compact", help="Merge all segments into one")
+    search = commands.add_parser("search", help="Run a query")
+    search.add_argument("query")
+    search.add_argument("--limit", type=int, default=EVIDENCE_RESULTS)
+    commands.add_parser("stats")
+    args = parser.parse_args()
+
+    index = EvidenceIndex(args.index, reload_interval=0)
+    if args.command == "add":
+        start = time.perf_counter()
+        batch, total = [], 0
+        for doc in read_corpus(args.corpus):
+            batch.append(doc)
+            if len(batch) >= args.segment_size:
+                total += index.add_documents(batch)
+                batch = []
+        total += index.add_documents(batch)
+        print(f"Indexed {total} documents in {time.perf_counter() - start:.1f}s")
+    elif args.command == "compact":
+        print(f"Compacted into one segment of {index.compact()} documents")
+    elif args.command == "search":
+        start = time.perf_counter()
+        items = index.search(args.query, args.limit, EVIDENCE_MIN_MATCH)
+        elapsed = (time.perf_counter() - start) * 1000.0
+        for item in items:
+            print(f"{item['score']:8.3f}  {item['link']}\n          {item['title']}")
+        print(f"{len(items)} results in {elapsed:.2f} ms")
+    print(json.dumps(index.stats()))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+
+try:
+    from backend.config import MODEL_PATH, NUMPY_MODEL_DIR
+    from backend.inference import export_numpy, KerasBackend, NumpyBackend
+except ImportError:
+    from config import MODEL_PATH, NUMPY_MODEL_DIR
+    from inference import export_numpy, KerasBackend, NumpyBackend
+
+PARITY_SAMPLES = [
+    "The government announced a new tax policy today that affects small businesses.",
+    "SHOCKING!!! Doctors HATE this one weird trick... click now!",
+    "",
+    "word " * 400,
+]
+
+def replace_dir(src: str, dst: str):
+    """Renames src to dst, replacing an existing dst (renamed aside first, then removed)."""
+    old = None
+    if os.path.exists(dst):
+        old = tempfile.mkdtemp(prefix=f".{os.path.basename(dst)}-old-", dir=os.path.dirname(dst))
+        os.rename(dst, os.path.join(old, "export"))
+    os.rename(src, dst)
+    if old is not None:
+        shutil.rmtree(old, ignore_errors=True)
+
+def main():
+    parser = argparse.ArgumentParser(description="Export the Keras model for the NumPy inference backend.")
+    parser.add_argument("--model", default=MODEL_PATH, help="Path to the .keras model")
+    parser.add_argument("--out", default=NUMPY_MODEL_DIR, help="Directory to write the export to")
+    parser.add_argument("--tolerance", type=float, default=1e-4, help="Max allowed score difference in the parity check")
+    args = parser.parse_args()
+
+    out = os.path.abspath(args.out)
+    keras_backend = KerasBackend(args.model)
+    # Export next to the target and swap it in only once it passes the
+    # parity check, so a failed export never replaces a working one
+    staging = tempfile.mkdtemp(prefix=f".{os.path.basename(out)}-", dir=os.path.dirname(out))
+    try:
+        export_numpy(keras_backend.model, staging)
+        expected = keras_backend.predict_batch(PARITY_SAMPLES)
+        actual = NumpyBackend(staging).predict_batch(PARITY_SAMPLES)
+        worst = float(abs(expected - actual).max())
+        print(f"Parity check: max |keras - numpy| = {worst:.2e}")
+        if worst > args.tolerance:
+            sys.exit(f"Parity check failed (tolerance {args.tolerance}), {out} left unchanged")
+        os.chmod(staging, 0o755)
+        replace_dir(staging, out)
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+    print(f"Exported {args.model} -> {out}")
+
+if __name__ == "__main__":
+    main()
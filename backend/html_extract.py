@@ -0,0 +1,133 @@
+import re
+from html.parser import HTMLParser
+from typing import Optional
+
+# Subtrees whose text never belongs to the article
+SKIP_TAGS = frozenset(["script", "style", "noscript", "template", "svg", "nav", "footer", "header", "aside", "form"])
+# Elements that end a line of text
+BLOCK_TAGS = frozenset([
+    "p", "div", "section", "article", "main", "li", "ul", "ol", "br", "tr", "table", "blockquote",
+    "h1", "h2", "h3", "h4", "h5", "h6", "title", "pre", "figcaption",
+])
+# Elements treated as main-article prose
+PROSE_TAGS = frozenset(["p", "h1", "h2", "h3", "blockquote", "li"])
+VOID_TAGS = frozenset(["br", "img", "hr", "meta", "link", "input", "source", "wbr", "area", "base", "col"])
+
+# Below this much prose the page is probably not an article; use all visible text
+MIN_PROSE_CHARS = 200
+
+_CHARSET_RE = re.compile(rb"""<meta[^>]+charset=["']?([A-Za-z0-9_\-:.]+)""", re.IGNORECASE)
+_SPACE_RE = re.compile(r"\s+")
+
+def sniff_charset(head: bytes) -> Optional[str]:
+    """Charset declared in a <meta> tag within the first bytes of a page."""
+    match = _CHARSET_RE.search(head[:4096])
+    return match.group(1).decode("ascii") if match else None
+
+class ArticleTextParser(HTMLParser):
+    """
+    Incremental HTML-to-text extractor; feed() it chunks as they arrive.
+
+    Visible text is collected in three pools: prose inside <article>, prose
+    elsewhere (<p>, headings, list items) and everything visible. text()
+    returns the most specific pool that holds a real article. `done` turns
+    true once `target_chars` of prose is collected, so callers can stop
+    downloading.
+    """
+
+    def __init__(self, target_chars: int = 20000, max_chars: int = 100000):
+        super().__init__(convert_charrefs=True)
+        self.target_chars = target_chars
+        self.max_chars = max_chars
+        self.title = ""
+        self._skip_depth = 0
+        self._article_depth = 0
+        self._prose_depth = 0
+        self._in_title = False
+        self._stack = []
+        # pool name -> ([finished lines], [pieces of the current line], char count)
+        self._pools = {name: ([], [], 0) for name in ("article", "prose", "all")}
+
+    @property
+    def done(self) -> bool:
+        return max(self._pools["article"][2], self._pools["prose"][2]) >= self.target_chars
+
+    def handle_starttag(self, tag, attrs):
+        if tag in VOID_TAGS:
+            if tag == "br":
+                self._end_lines()
+            return
+        self._stack.append(tag)
+        if tag in BLOCK_TAGS:
+            self._end_lines()
+        if tag in SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == "article":
+            self._article_depth += 1
+        elif tag in PROSE_TAGS:
+            self._prose_depth += 1
+        elif tag == "title":
+            self._in_title = True
+
+    def handle_endtag(self, tag):
+        if tag in VOID_TAGS or tag not in self._stack:
+            return
+        # Unwind implicitly closed elements (<p> without </p> and the like)
+        while self._stack:
+            open_tag = self._stack.pop()
+            if open_tag in SKIP_TAGS:
+                self._skip_depth -= 1
+            elif open_tag == "article":
+                self._article_depth -= 1
+            elif open_tag in PROSE_TAGS:
+                self._prose_depth -= 1
+            elif open_tag == "title":
+                self._in_title = False
+            if open_tag == tag:
+                break
+        if tag in BLOCK_TAGS:
+            self._end_lines()
+
+    def handle_data(self, data):
+        if self._in_title:
+            self.title += data
+            return
+        if self._skip_depth:
+            return
+        self._add("all", data)
+        if self._prose_depth:
+            self._add("article" if self._article_depth else "prose", data)
+
+    def _add(self, pool, data):
+        lines, current, count = self._pools[pool]
+        if count < self.max_chars:
+            current.append(data)
+            self._pools[pool] = (lines, current, count + len(data))
+
+    def _end_lines(self):
+        for lines, current, _ in self._pools.values():
+            if current:
+                line = _SPACE_RE.sub(" ", "".join(current)).strip()
+                if line:
+                    lines.append(line)
+                current.clear()
+
+    def text(self) -> str:
+        """Title + main text, one block per line."""
+        self._end_lines()
+        everything = "\n".join(self._pools["all"][0])
+        body = everything
+        for pool in ("article", "prose"):
+            candidate = "\n".join(self._pools[pool][0])
+            if len(candidate) >= min(MIN_PROSE_CHARS, len(everything) / 2):
+                body = candidate
+                break
+        title = _SPACE_RE.sub(" ", self.title).strip()
+        return f"{title}\n\n{body}"[:self.max_chars]
+
+def extract_article_text(html: str, target_chars: int = 20000, max_chars: int = 100000) -> str:
+    """Non-streaming convenience wrapper around ArticleTextParser."""
+    parser = ArticleTextParser(target_chars, max_chars)
+    parser.feed(html)
+    parser.close()
+    return parser.text()
@@ -0,0 +1,145 @@
+import asyncio
+import random
+from contextlib import asynccontextmanager
+from typing import Optional
+from urllib.parse import urlparse
+
+import httpx
+
+try:
+    from backend.config import (
+        HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE, HTTP_PER_HOST_LIMIT,
+        HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_RETRIES, HTTP_BACKOFF,
+    )
+except ImportError:
+    from config import (
+        HTTP_MAX_CONNECTIONS, HTTP_MAX_KEEPALIVE, HTTP_PER_HOST_LIMIT,
+        HTTP_CONNECT_TIMEOUT, HTTP_READ_TIMEOUT, HTTP_RETRIES, HTTP_BACKOFF,
+    )
+
+USER_AGENT = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
+
+# Worth another attempt: rate limiting and transient upstream failures
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+
+class AsyncHttpClient:
+    """
+    Shared async HTTP client: one keep-alive connection pool for the whole
+    process, a concurrency cap per host, strict timeouts and a bounded
+    number of retries with exponential backoff and jitter.
+    """
+
+    def __init__(
+        self,
+        max_connections: int = 100,
+        max_keepalive: int = 20,
+        per_host_limit: int = 8,
+        connect_timeout: float = 3.0,
+        read_timeout: float = 10.0,
+        retries: int = 2,
+        backoff: float = 0.2,
+    ):
+        self.limits = httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive)
+        self.timeout = httpx.Timeout(read_timeout, connect=connect_timeout)
+        self.per_host_limit = max(1, per_host_limit)
+        self.retries = max(0, retries)
+        self.backoff = backoff
+        self._client = None
+        self._loop = None
+        self._host_slots = {}
+
+    def _session(self) -> httpx.AsyncClient:
+        # Pools are bound to the event loop that created them. Normally there
+        # is exactly one loop per process; tests and CLIs may start others.
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop:
+            self._client = httpx.AsyncClient(
+                limits=self.limits,
+                timeout=self.timeout,
+                follow_redirects=True,
+                headers={"User-Agent": USER_AGENT},
+            )
+            self._loop = loop
+            self._host_slots = {}
+        return self._client
+
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc.lower()
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.per_host_limit)
+        return slot
+
+    async def _sleep_before_retry(self, attempt: int):
+        delay = self.backoff * (2 ** attempt)
+        await asyncio.sleep(delay + random.uniform(0, delay / 2))
+
+    async def request(self, method: str, url: str, timeout: Optional[float] = None, **kwargs) -> httpx.Response:
+        """Sends a request and reads the full body, retrying transient failures."""
+        async with self.stream(method, url, timeout=timeout, **kwargs) as response:
+            await response.aread()
+            return response
+
+    @asynccontextmanager
+    async def stream(self, method: str, url: str, timeout: Optional[float] = None, **kwargs):
+        """
+        Like request(), but yields the response before the body is read so
+        callers can inspect headers and consume the body incrementally.
+        Retries only happen before a response is handed out.
+        """
+        client = self._session()
+        request_timeout = httpx.USE_CLIENT_DEFAULT
+        if timeout is not None:
+            request_timeout = httpx.Timeout(timeout, connect=min(timeout, self.timeout.connect))
+
+        attempt = 0
+        while True:
+            async with self._host_slot(url):
+                try:
+                    request = client.build_request(method, url, timeout=request_timeout, **kwargs)
+                    response = await client.send(request, stream=True)
+                except (httpx.TimeoutException, httpx.TransportError):
+                    if attempt >= self.retries:
+                        raise
+                    response = None
+
+                if response is not None and (response.status_code not in RETRY_STATUSES or attempt >= self.retries):
+                    try:
+                        yield response
+                    finally:
+                        await response.aclose()
+                    return
+
+                if response is not None:
+                    await response.aclose()
+
+            await self._sleep_before_retry(attempt)
+            attempt += 1
+
+    async def get_json(self, url: str, params: Optional[dict] = None, timeout: Optional[float] = None):
+        response = await self.request("GET", url, params=params, timeout=timeout)
+        response.raise_for_status()
+        return response.json()
+
+    async def aclose(self):
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+            self._loop = None
+
+# Singleton instance
+http_client = None
+
+def get_http_client() -> AsyncHttpClient:
+    global http_client
+    if http_client is None:
+        http_client = AsyncHttpClient(
+            max_connections=HTTP_MAX_CONNECTIONS,
+            max_keepalive=HTTP_MAX_KEEPALIVE,
+            per_host_limit=HTTP_PER_HOST_LIMIT,
+            connect_timeout=HTTP_CONNECT_TIMEOUT,
+            read_timeout=HTTP_READ_TIMEOUT,
+            retries=HTTP_RETRIES,
+            backoff=HTTP_BACKOFF,
+        )
+    return http_client
@@ -0,0 +1,243 @@
+import json
+import os
+import re
+
+import numpy as np
+
+# Inference backends behind FakeNewsModel.predict_batch. Each backend takes a
+# list of raw strings and returns a float array of "likely real" scores.
+#
+#   keras  - the saved .keras model, run by TensorFlow (reference path)
+#   numpy  - weights exported to plain .npy files plus a pure-NumPy tokenizer
+#            and BiLSTM; needs no TensorFlow at serving time
+
+# Same character class as keras' TextVectorization "lower_and_strip_punctuation"
+STRIP_PUNCTUATION_RE = re.compile(r'[!"#$%&()\*\+,-\./:;<=>?@\[\\\]^_`{|}~\']')
+
+EXPORT_FORMAT_VERSION = 1
+
+class KerasBackend:
+    name = "keras"
+
+    def __init__(self, model_path: str):
+        # TensorFlow is imported here so that other backends never pay for it
+        import tensorflow as tf
+        from tensorflow.keras.models import load_model
+        self.model = load_model(model_path)
+
+        # The model expects raw strings (TextVectorization is part of the graph).
+        # A traced tf.function with a fixed signature compiles once and skips
+        # both the Keras predict() loop and eager op-by-op execution, which
+        # dominate the cost of the small batches we see per request.
+        @tf.function(input_signature=[tf.TensorSpec(shape=[None, 1], dtype=tf.string)])
+        def infer(inputs):
+            return self.model(inputs, training=False)
+
+        self._tf = tf
+        self._infer = infer
+
+    def predict_batch(self, texts: list) -> np.ndarray:
+        input_data = self._tf.constant([[t] for t in texts])
+        preds = self._infer(input_data)
+        return np.asarray(preds, dtype=np.float64).reshape(-1)
+
+class TextVectorizer:
+    """
+    Pure-Python/NumPy equivalent of the model's TextVectorization layer
+    (lower_and_strip_punctuation, whitespace split, int output, post padding).
+    """
+
+    def __init__(self, vocabulary: list, sequence_length: int):
+        # Index 0 is the padding token and 1 the OOV token, as in keras
+        self.index = {token: i for i, token in enumerate(vocabulary) if i > 1}
+        self.oov_index = 1
+        self.sequence_length = sequence_length
+
+    def standardize(self, text: str) -> str:
+        return STRIP_PUNCTUATION_RE.sub("", text.lower())
+
+    def __call__(self, texts: list) -> np.ndarray:
+        ids = np.zeros((len(texts), self.sequence_length), dtype=np.int32)
+        lookup = self.index.get
+        oov = self.oov_index
+        for row, text in enumerate(texts):
+            tokens = self.standardize(text).split()[:self.sequence_length]
+            if tokens:
+                ids[row, :len(tokens)] = [lookup(t, oov) for t in tokens]
+        return ids
+
+def _sigmoid(x):
+    return 1.0 / (1.0 + np.exp(-x))
+
+_ACTIVATIONS = {
+    "sigmoid": _sigmoid,
+    "tanh": np.tanh,
+    "relu": lambda x: np.maximum(x, 0.0),
+    "linear": lambda x: x,
+}
+
+class NumpyBackend:
+    """
+    Runs the exported Embedding -> Bidirectional(LSTM) -> Dense stack in NumPy.
+
+    Weights are .npy files opened with mmap_mode="r", so several processes
+    serving the same export share one copy through the OS page cache.
+    """
+    name = "numpy"
+
+    def __init__(self, export_dir: str, mmap: bool = True):
+        with open(os.path.join(export_dir, "config.json"), "r", encoding="utf-8") as f:
+            config = json.load(f)
+        if config.get("format_version") != EXPORT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported export format in {export_dir}: {config.get('format_version')}")
+        with open(os.path.join(export_dir, "vocabulary.json"), "r", encoding="utf-8") as f:
+            vocabulary = json.load(f)
+
+        mmap_mode = "r" if mmap else None
+        load = lambda name: np.load(os.path.join(export_dir, f"{name}.npy"), mmap_mode=mmap_mode)
+
+        self.vectorizer = TextVectorizer(vocabulary, config["sequence_length"])
+        self.embedding = load("embedding")
+        self.lstm_units = config["lstm"]["units"]
+        self.lstm_activation = _ACTIVATIONS[config["lstm"]["activation"]]
+        self.lstm_recurrent_activation = _ACTIVATIONS[config["lstm"]["recurrent_activation"]]
+        self.forward = (load("forward_kernel"), load("forward_recurrent_kernel"), load("forward_bias"))
+        self.backward = (load("backward_kernel"), load("backward_recurrent_kernel"), load("backward_bias"))
+        self.dense = [
+            (load(f"dense_{i}_kernel"), load(f"dense_{i}_bias"), _ACTIVATIONS[activation])
+            for i, activation in enumerate(config["dense_activations"])
+        ]
+
+    def _lstm(self, inputs, mask, weights, reverse):
+        kernel, recurrent_kernel, bias = weights
+        units = self.lstm_units
+        batch, steps, _ = inputs.shape
+        # One big matmul for the input projections instead of one per step
+        projected = inputs @ kernel + bias
+        h = np.zeros((batch, units), dtype=np.float32)
+        c = np.zeros((batch, units), dtype=np.float32)
+        order = range(steps - 1, -1, -1) if reverse else range(steps)
+        for t in order:
+            z = projected[:, t] + h @ recurrent_kernel
+            i = self.lstm_recurrent_activation(z[:, :units])
+            f = self.lstm_recurrent_activation(z[:, units:2 * units])
+            g = self.lstm_activation(z[:, 2 * units:3 * units])
+            o = self.lstm_recurrent_activation(z[:, 3 * units:])
+            c_next = f * c + i * g
+            h_next = o * self.lstm_activation(c_next)
+            # Masked (padding) steps carry the previous state through
+            keep = mask[:, t:t + 1]
+            c = np.where(keep, c_next, c)
+            h = np.where(keep, h_next, h)
+        return h
+
+    def predict_batch(self, texts: list) -> np.ndarray:
+        ids = self.vectorizer(texts)
+        mask = ids != 0
+        # Padding is always trailing, so steps past the longest input are
+        # masked for every row and can be skipped in both directions.
+        length = int(mask.sum(axis=1).max()) if len(texts) else 0
+        length = max(length, 1)
+        ids, mask = ids[:, :length], mask[:, :length]
+
+        embedded = np.asarray(self.embedding[ids], dtype=np.float32)
+        x = np.concatenate([
+            self._lstm(embedded, mask, self.forward, reverse=False),
+            self._lstm(embedded, mask, self.backward, reverse=True),
+        ], axis=1)
+        for kernel, bias, activation in self.dense:
+            x = activation(x @ kernel + bias)
+        return np.asarray(x, dtype=np.float64).reshape(-1)
+
+def export_numpy(keras_model, export_dir: str):
+    """
+    Writes the vocabulary, layer configuration and weights of a
+    TextVectorization -> Embedding -> Bidirectional(LSTM) -> Dense model
+    to `export_dir` in the layout NumpyBackend reads.
+    """
+    from tensorflow import keras
+
+    layers = {}
+    dense_layers = []
+    for layer in keras_model.layers:
+        if isinstance(layer, keras.layers.TextVectorization):
+            layers["vectorize"] = layer
+        elif isinstance(layer, keras.layers.Embedding):
+            layers["embedding"] = layer
+        elif isinstance(layer, keras.layers.Bidirectional):
+            layers["bidirectional"] = layer
+        elif isinstance(layer, keras.layers.Dense):
+            dense_layers.append(layer)
+        elif not isinstance(layer, (keras.layers.InputLayer, keras.layers.Dropout)):
+            raise ValueError(f"Cannot export layer {layer.name} ({type(layer).__name__})")
+
+    missing = {"vectorize", "embedding", "bidirectional"} - set(layers)
+    if missing or not dense_layers:
+        raise ValueError(f"Model is missing layers required for export: {sorted(missing) or ['dense']}")
+
+    vectorize_config = layers["vectorize"].get_config()
+    if (vectorize_config.get("standardize") != "lower_and_strip_punctuation"
+            or vectorize_config.get("split") != "whitespace"
+            or vectorize_config.get("ngrams") is not None
+            or vectorize_config.get("output_mode") != "int"
+            or not vectorize_config.get("output_sequence_length")):
+        raise ValueError(f"Unsupported TextVectorization settings: {vectorize_config}")
+
+    # NumpyBackend treats token 0 as padding and looks every id up in one float table
+    embedding = layers["embedding"]
+    embedding_config = embedding.get_config()
+    if (not embedding_config.get("mask_zero")
+            or embedding_config.get("lora_rank")
+            or embedding_config.get("quantization_config") is not None
+            or len(embedding.get_weights()) != 1
+            or embedding_config["input_dim"] < len(layers["vectorize"].get_vocabulary())):
+        raise ValueError("Only unquantized Embeddings with mask_zero=True covering the vocabulary are supported; "
+                         f"got {embedding_config}")
+
+    bidirectional = layers["bidirectional"]
+    lstm_config = bidirectional.forward_layer.get_config()
+    if bidirectional.merge_mode != "concat" or not lstm_config.get("use_bias", True):
+        raise ValueError("Only concat-merged Bidirectional LSTMs with bias are supported")
+
+    activations = [lstm_config["activation"], lstm_config["recurrent_activation"]]
+    activations += [d.get_config()["activation"] for d in dense_layers]
+    unsupported = [a for a in activations if a not in _ACTIVATIONS]
+    if unsupported:
+        raise ValueError(f"Unsupported activations: {unsupported}")
+
+    os.makedirs(export_dir, exist_ok=True)
+    save = lambda name, array: np.save(os.path.join(export_dir, f"{name}.npy"), np.asarray(array, dtype=np.float32))
+
+    save("embedding", embedding.get_weights()[0])
+    for prefix, lstm in (("forward", bidirectional.forward_layer), ("backward", bidirectional.backward_layer)):
+        kernel, recurrent_kernel, bias = lstm.get_weights()
+        save(f"{prefix}_kernel", kernel)
+        save(f"{prefix}_recurrent_kernel", recurrent_kernel)
+        save(f"{prefix}_bias", bias)
+    for i, dense in enumerate(dense_layers):
+        kernel, bias = dense.get_weights()
+        save(f"dense_{i}_kernel", kernel)
+        save(f"dense_{i}_bias", bias)
+
+    with open(os.path.join(export_dir, "vocabulary.json"), "w", encoding="utf-8") as f:
+        json.dump(layers["vectorize"].get_vocabulary(), f, ensure_ascii=False)
+
+    config = {
+        "format_version": EXPORT_FORMAT_VERSION,
+        "sequence_length": vectorize_config["output_sequence_length"],
+        "lstm": {
+            "units": lstm_config["units"],
+            "activation": lstm_config["activation"],
+            "recurrent_activation": lstm_config["recurrent_activation"],
+        },
+        "dense_activations": [d.get_config()["activation"] for d in dense_layers],
+    }
+    with open(os.path.join(export_dir, "config.json"), "w", encoding="utf-8") as f:
+        json.dump(config, f, indent=2)
+
+def load_backend(name: str, model_path: str, numpy_dir: str):
+    if name == "keras":
+        return KerasBackend(model_path)
+    if name == "numpy":
+        return NumpyBackend(numpy_dir)
+    raise ValueError(f"Unknown model backend: {name}")
@@ -0,0 +1,386 @@
+import asyncio
+import json
+import logging
+import os
+import socket
+import sqlite3
+import threading
+import time
+from typing import AsyncIterator, Awaitable, Callable, Dict, Optional
+from urllib.parse import urlsplit, urlunsplit
+
+try:
+    from backend.metrics import JOBS, JOB_DURATION, increment, observe
+    from backend.tracing import new_trace
+except ImportError:
+    from metrics import JOBS, JOB_DURATION, increment, observe
+    from tracing import new_trace
+
+logger = logging.getLogger(__name__)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+ACTIVE_STATES = (QUEUED, RUNNING)
+
+# Watchers re-read the store at least this often; a job run by another
+# process sharing the store does not wake this process's watchers.
+WATCH_POLL_SECONDS = 5.0
+
+class JobQueueFull(Exception):
+    """Raised when the job queue is at capacity; callers should answer 429."""
+
+    def __init__(self, retry_after: int = 5):
+        super().__init__(f"Job queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+class JobFailed(Exception):
+    """Raised by a job handler for an expected failure; the message is shown to the client."""
+
+def normalize_url(url: str) -> str:
+    """Dedupe key for a URL: scheme and host lowercased, fragment dropped."""
+    parts = urlsplit(url.strip())
+    return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path or "/", parts.query, ""))
+
+_COLUMNS = "id, url, status, result, error, created_at, updated_at"
+_ACTIVE_BY_KEY = f"SELECT {_COLUMNS} FROM jobs WHERE dedupe_key = ? AND status IN (?, ?) ORDER BY created_at LIMIT 1"
+
+class JobStore:
+    """
+    SQLite-backed job records. Finished jobs expire `ttl` seconds after
+    they finish; queued and running jobs never expire.
+
+    Several processes may share the file. Each unfinished job is owned by
+    the store instance that queued or adopted it and carries a lease its
+    owner renews; a job whose lease ran out (its owner died or hung) can
+    be adopted by another store.
+    """
+
+    def __init__(self, path: str, ttl: float, clock: Callable[[], float] = time.time, lease: float = 60.0,
+                 owner: Optional[str] = None):
+        self.path = path
+        self.ttl = ttl
+        self.clock = clock
+        self.lease = lease
+        self.owner = owner or f"{socket.gethostname()}:{os.getpid()}:{os.urandom(4).hex()}"
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS jobs ("
+            " id TEXT PRIMARY KEY, url TEXT NOT NULL, dedupe_key TEXT NOT NULL, status TEXT NOT NULL,"
+            " result TEXT, error TEXT, created_at REAL NOT NULL, updated_at REAL NOT NULL, expires_at REAL,"
+            " owner TEXT, lease_until REAL)"
+        )
+        # Stores created before jobs had owners
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        for column, kind in (("owner", "TEXT"), ("lease_until", "REAL")):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE jobs ADD COLUMN {column} {kind}")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_dedupe ON jobs (dedupe_key, status)")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_expires ON jobs (expires_at)")
+
+    @staticmethod
+    def _row_to_job(row) -> dict:
+        job_id, url, status, result, error, created_at, updated_at = row
+        return {
+            "id": job_id,
+            "url": url,
+            "status": status,
+            "result": json.loads(result) if result else None,
+            "error": error,
+            "created_at": created_at,
+            "updated_at": updated_at,
+        }
+
+    def get(self, job_id: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {_COLUMNS} FROM jobs WHERE id = ? AND (expires_at IS NULL OR expires_at > ?)",
+                (job_id, self.clock()),
+            ).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def create_or_attach(self, url: str) -> tuple:
+        """
+        Returns (job, created). An unfinished job for the same URL is
+        returned instead of a new one; the check and the insert happen in
+        one transaction, so processes sharing the file agree too.
+        """
+        key = normalize_url(url)
+        now = self.clock()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                row = self._conn.execute(_ACTIVE_BY_KEY, (key, *ACTIVE_STATES)).fetchone()
+                created = row is None
+                if created:
+                    job_id = os.urandom(12).hex()
+                    self._conn.execute(
+                        "INSERT INTO jobs (id, url, dedupe_key, status, created_at, updated_at, owner, lease_until)"
+                        " VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                        (job_id, url, key, QUEUED, now, now, self.owner, now + self.lease),
+                    )
+                    row = (job_id, url, QUEUED, None, None, now, now)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return self._row_to_job(row), created
+
+    def find_active(self, url: str) -> Optional[dict]:
+        """The queued or running job for this URL, if any."""
+        with self._lock:
+            row = self._conn.execute(_ACTIVE_BY_KEY, (normalize_url(url), *ACTIVE_STATES)).fetchone()
+        return self._row_to_job(row) if row else None
+
+    def claim(self, job_id: str) -> bool:
+        """Moves a queued job of this store to running; False if it is not queued (any more) or was adopted."""
+        now = self.clock()
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET status = ?, updated_at = ?, lease_until = ? WHERE id = ? AND status = ? AND owner = ?",
+                (RUNNING, now, now + self.lease, job_id, QUEUED, self.owner),
+            )
+        return cursor.rowcount == 1
+
+    def set_status(self, job_id: str, status: str, result: Optional[dict] = None, error: Optional[str] = None):
+        now = self.clock()
+        expires_at = None if status in ACTIVE_STATES else now + self.ttl
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, updated_at = ?, expires_at = ? WHERE id = ?",
+                (status, json.dumps(result) if result is not None else None, error, now, expires_at, job_id),
+            )
+
+    def unfinished(self) -> list:
+        """Ids of jobs left queued or running, oldest first (for resuming after a restart)."""
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT id FROM jobs WHERE status IN (?, ?) ORDER BY created_at", ACTIVE_STATES
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def adopt(self, limit: Optional[int] = None, own: bool = True) -> list:
+        """
+        Takes over unfinished jobs of other owners whose lease has run out
+        (plus, with `own`, all of this store's own) and marks them queued;
+        returns their ids, oldest first. Jobs of live owners are left alone.
+        """
+        now = self.clock()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                rows = self._conn.execute(
+                    "SELECT id FROM jobs WHERE status IN (?, ?)"
+                    " AND CASE WHEN owner = ? THEN ? ELSE lease_until IS NULL OR lease_until <= ? END"
+                    " ORDER BY created_at LIMIT ?",
+                    (*ACTIVE_STATES, self.owner, own, now, -1 if limit is None else limit),
+                ).fetchall()
+                ids = [row[0] for row in rows]
+                self._conn.executemany(
+                    "UPDATE jobs SET status = ?, updated_at = ?, owner = ?, lease_until = ? WHERE id = ?",
+                    [(QUEUED, now, self.owner, now + self.lease, job_id) for job_id in ids],
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+        return ids
+
+    def renew_leases(self) -> int:
+        """Extends the lease of every unfinished job this store owns (the heartbeat)."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE owner = ? AND status IN (?, ?)",
+                (self.clock() + self.lease, self.owner, *ACTIVE_STATES),
+            )
+        return cursor.rowcount
+
+    def release_leases(self) -> int:
+        """Ends this store's leases at once, so its unfinished jobs can be adopted without waiting."""
+        with self._lock:
+            cursor = self._conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE owner = ? AND status IN (?, ?)",
+                (self.clock(), self.owner, *ACTIVE_STATES),
+            )
+        return cursor.rowcount
+
+    def purge_expired(self) -> int:
+        with self._lock:
+            cursor = self._conn.execute("DELETE FROM jobs WHERE expires_at <= ?", (self.clock(),))
+        return cursor.rowcount
+
+    def stats(self) -> dict:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) FROM jobs GROUP BY status").fetchall()
+        return {"path": self.path, "jobs": dict(rows)}
+
+class JobManager:
+    """
+    Runs URL jobs on a bounded pool of worker tasks fed from a bounded
+    queue. State lives in the JobStore; watchers (SSE streams) are woken
+    on every status change.
+    """
+
+    def __init__(self, store: JobStore, handler: Callable[[str], Awaitable[dict]], workers: int = 4,
+                 max_queue: int = 256, cleanup_interval: float = 60.0):
+        self.store = store
+        self.handler = handler
+        self.num_workers = max(1, workers)
+        self.max_queue = max(1, max_queue)
+        self.cleanup_interval = cleanup_interval
+        self._queue = None
+        self._tasks = []
+        self._changed: Dict[str, asyncio.Event] = {}
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    async def start(self):
+        """
+        Starts the workers and re-queues this store's unfinished jobs plus
+        any whose owner's lease ran out (a process that stopped or died).
+        Jobs other live processes are queuing or running stay theirs.
+        """
+        self._queue = asyncio.Queue(self.max_queue)
+        self._changed.clear()  # events of a previous event loop
+        for job_id in self.store.adopt():
+            if self._queue.full():
+                self.store.set_status(job_id, FAILED, error="Dropped after a restart (queue full)")
+                continue
+            self._queue.put_nowait(job_id)
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.num_workers)]
+        self._tasks.append(asyncio.ensure_future(self._cleanup()))
+        self._tasks.append(asyncio.ensure_future(self._heartbeat()))
+
+    async def stop(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        self._queue = None
+        # Interrupted jobs are back to queued; let the next start (here or elsewhere) take them
+        self.store.release_leases()
+
+    @property
+    def running(self) -> bool:
+        return bool(self._tasks)
+
+    def submit(self, url: str) -> tuple:
+        """Returns (job, created). Raises JobQueueFull when a new job cannot be accepted."""
+        if not self.running:
+            raise RuntimeError("JobManager is not started")
+        job = self.store.find_active(url)
+        if job is not None:
+            return job, False
+        if self._queue.full():
+            raise JobQueueFull()
+        job, created = self.store.create_or_attach(url)
+        if created:
+            self._queue.put_nowait(job["id"])
+        return job, created
+
+    def watch(self, job_id: str) -> asyncio.Event:
+        """
+        Event set on the job's next status change. Take it before reading
+        the job, so a change between the read and the wait is not missed.
+        """
+        event = self._changed.get(job_id)
+        if event is None:
+            event = self._changed[job_id] = asyncio.Event()
+        return event
+
+    async def updates(self, job_id: str) -> AsyncIterator[Optional[dict]]:
+        """
+        Yields the job whenever its status changes, starting with the
+        current state, until it finishes. Yields None after each quiet poll
+        interval (for keep-alives) and stops if the job does not exist.
+        """
+        last_status = None
+        while True:
+            changed = self.watch(job_id)
+            job = self.store.get(job_id)
+            if job is None:
+                return
+            if job["status"] != last_status:
+                last_status = job["status"]
+                yield job
+            if job["status"] not in ACTIVE_STATES:
+                return
+            try:
+                await asyncio.wait_for(changed.wait(), WATCH_POLL_SECONDS)
+            except asyncio.TimeoutError:
+                yield None
+
+    def _update(self, job_id: str, status: str, **fields):
+        self.store.set_status(job_id, status, **fields)
+        self._wake(job_id)
+
+    def _wake(self, job_id: str):
+        event = self._changed.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    async def _worker(self):
+        while True:
+            job_id = await self._queue.get()
+            try:
+                await self._run(job_id)
+            finally:
+                self._queue.task_done()
+
+    async def _run(self, job_id: str):
+        job = self.store.get(job_id)
+        if job is None or not self.store.claim(job_id):
+            return  # expired, or another process sharing the store took it
+        self._wake(job_id)
+        start = time.perf_counter()
+        # Each job gets its own trace, not the worker task's leftover one
+        with new_trace(job_id):
+            try:
+                result = await self.handler(job["url"])
+            except asyncio.CancelledError:
+                self._update(job_id, QUEUED)  # picked up again on the next start
+                raise
+            except JobFailed as e:
+                outcome = FAILED
+                self._update(job_id, FAILED, error=str(e))
+            except Exception as e:
+                outcome = FAILED
+                logger.exception("Job %s failed", job_id)
+                self._update(job_id, FAILED, error=f"Internal error: {e}")
+            else:
+                outcome = DONE
+                self._update(job_id, DONE, result=result)
+        observe(JOB_DURATION, time.perf_counter() - start, outcome=outcome)
+        increment(JOBS, outcome=outcome)
+
+    async def _heartbeat(self):
+        """Renews this store's leases and adopts jobs orphaned by a dead process while there is room."""
+        while True:
+            await asyncio.sleep(self.store.lease / 3)
+            try:
+                self.store.renew_leases()
+                room = self.max_queue - self._queue.qsize()
+                if room > 0:
+                    for job_id in self.store.adopt(room, own=False):
+                        self._queue.put_nowait(job_id)
+            except sqlite3.Error as e:
+                logger.warning("Job lease renewal failed: %s", e)
+
+    async def _cleanup(self):
+        while True:
+            await asyncio.sleep(self.cleanup_interval)
+            try:
+                purged = self.store.purge_expired()
+                if purged:
+                    logger.info("Purged %d expired jobs", purged)
+            except sqlite3.Error as e:
+                logger.warning("Job cleanup failed: %s", e)
+
+    def stats(self) -> dict:
+        return {"workers": self.num_workers, "queue_depth": self.queue_depth, "max_queue": self.max_queue,
+                **self.store.stats()}
@@ -1,20 +1,80 @@
 
-from fastapi import FastAPI, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import JSONResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel
-from typing import List, Optional
+from typing import Dict, List, Optional
+import asyncio
+import logging
+import time
+import numpy as np
 import uvicorn
 
 try:
-    from backend.model import get_model
-    from backend.verify import verify_news
+    from backend.config import (
+        BATCH_MAX_ITEMS, BATCH_IO_CONCURRENCY, MODEL_DEADLINE, VERIFY_DEADLINE, MODEL_STARTUP,
+        JOBS_PATH, JOB_WORKERS, JOB_QUEUE_MAX, JOB_TTL, JOB_CLEANUP_INTERVAL, JOB_LEASE,
+    )
+    from backend.model import (
+        get_model, get_scheduler, load_and_warm_up, start_background_load, model_status, shutdown_model
+    )
+    from backend.worker_pool import PoolSaturatedError
+    from backend.cache import get_result_cache
+    from backend.near_dup import get_near_duplicate_index
+    from backend.search_cache import get_search_cache, get_search_limiter, searches_used_today
+    from backend.tracing import TraceMiddleware, begin_timings, configure_logging, stage
+    from backend.metrics import REGISTRY, VERIFICATION, observe
+    from backend.chunking import chunk_text, aggregate_scores, split_documents, combine_scores
+    from backend.http_client import get_http_client
+    from backend.verify import verify_news, VerificationUnavailable, find_near_duplicate, remember_verification
     from backend.utils import extract_text_from_url
+    from backend.jobs import JobManager, JobStore, JobFailed, JobQueueFull
+    from backend.admission import Overloaded, TEXT, URL, get_admission_controller
+    from backend.verdict import calculate_verdict, calculate_verdicts, get_verdict_policy
 except ImportError:
-    from model import get_model
-    from verify import verify_news
+    from config import (
+        BATCH_MAX_ITEMS, BATCH_IO_CONCURRENCY, MODEL_DEADLINE, VERIFY_DEADLINE, MODEL_STARTUP,
+        JOBS_PATH, JOB_WORKERS, JOB_QUEUE_MAX, JOB_TTL, JOB_CLEANUP_INTERVAL, JOB_LEASE,
+    )
+    from model import (
+        get_model, get_scheduler, load_and_warm_up, start_background_load, model_status, shutdown_model
+    )
+    from worker_pool import PoolSaturatedError
+    from cache import get_result_cache
+    from near_dup import get_near_duplicate_index
+    from search_cache import get_search_cache, get_search_limiter, searches_used_today
+    from tracing import TraceMiddleware, begin_timings, configure_logging, stage
+    from metrics import REGISTRY, VERIFICATION, observe
+    from chunking import chunk_text, aggregate_scores, split_documents, combine_scores
+    from http_client import get_http_client
+    from verify import verify_news, VerificationUnavailable, find_near_duplicate, remember_verification
     from utils import extract_text_from_url
+    from jobs import JobManager, JobStore, JobFailed, JobQueueFull
+    from admission import Overloaded, TEXT, URL, get_admission_controller
+    from verdict import calculate_verdict, calculate_verdicts, get_verdict_policy
 
-app = FastAPI(title="Fake News Detection API")
+configure_logging()
+logger = logging.getLogger(__name__)
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if MODEL_STARTUP == "eager":
+        try:
+            await run_in_threadpool(load_and_warm_up)
+        except Exception as e:
+            # Keep serving; /readyz reports the failure to the load balancer
+            logger.error("Model failed to load at startup: %s", e)
+    elif MODEL_STARTUP == "background":
+        start_background_load()
+    await get_job_manager().start()
+    yield
+    await get_job_manager().stop()
+    await get_http_client().aclose()
+    shutdown_model()
+
+app = FastAPI(title="Fake News Detection API", lifespan=lifespan)
 
 # CORS
 app.add_middleware(
@@ -23,7 +83,24 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Trace-Id"],
 )
+# Outermost, so the trace and request metrics cover CORS handling too
+app.add_middleware(TraceMiddleware)
+
+# Gauges read at scrape time; a scrape must not create stores (and their files)
+REGISTRY.gauge("fnd_batch_queue_depth", "Texts waiting for or inside a model call.",
+               lambda: get_scheduler().queue_depth)
+REGISTRY.gauge("fnd_job_queue_depth", "Background jobs waiting for a worker.",
+               lambda: job_manager.queue_depth if job_manager is not None else 0)
+REGISTRY.gauge("fnd_admission_limit", "Current concurrency limit per request class.",
+               lambda: {(name,): c.effective_limit for name, c in get_admission_controller().classes.items()},
+               ("cls",))
+REGISTRY.gauge("fnd_admission_queue_depth", "Requests waiting for admission per request class.",
+               lambda: {(name,): c.queue_depth for name, c in get_admission_controller().classes.items()},
+               ("cls",))
+REGISTRY.gauge("fnd_search_used_today", "Paid searches spent today (UTC).",
+               searches_used_today)
 
 # Models
 class TextRequest(BaseModel):
@@ -44,57 +121,165 @@ class PredictionResponse(BaseModel):
     verdict: str
     matched_sources: List[Source]
     is_real: bool
+    degraded: bool = False  # True when verification missed its deadline (model-only verdict)
+    timings: Optional[Dict[str, float]] = None  # per-stage wall time in milliseconds
 
-def calculate_verdict(lstm_score, verification_score):
-    """
-    Decides the final verdict based on LSTM and Verification scores.
-    lstm_score: 0-1 (closer to 1 = Likely Real)
-    verification_score: 0-1 (closer to 1 = Likely Real)
-    """
-    
-    # 1. Handle Strong Signals First (Verification)
-    # If verification_score is very low (< 0.35), it means trusted sources or 
-    # fact-checkers either don't report it or explicitly debunk it.
-    if verification_score < 0.35:
-        # If verification is very low, we lean towards FAKE even if LSTM is uncertain
-        final_score = (0.2 * lstm_score) + (0.8 * verification_score)
-    elif verification_score > 0.75:
-        # If verification is very high, we lean towards REAL
-        final_score = (0.3 * lstm_score) + (0.7 * verification_score)
-    else:
-        # Uncertain range, use balanced weights
-        final_score = (0.4 * lstm_score) + (0.6 * verification_score)
-    
-    # Thresholds for more descriptive verdicts
-    if final_score >= 0.7:
-        verdict = "Likely Real News"
-        is_real = True
-    elif final_score >= 0.45:
-        verdict = "Inconclusive / Mixed Evidence"
-        is_real = True # Still technically on the positive side but uncertain
-    else:
-        verdict = "Likely Fake News"
-        is_real = False
-        
-    return float(final_score), verdict, is_real
+class JobRequest(BaseModel):
+    url: str
 
-@app.post("/predict-text", response_model=PredictionResponse)
-async def predict_text(request: TextRequest):
-    if not request.text.strip():
-        raise HTTPException(status_code=400, detail="Text cannot be empty")
+class JobResponse(BaseModel):
+    id: str
+    url: str
+    status: str  # queued | running | done | failed
+    result: Optional[PredictionResponse] = None
+    error: Optional[str] = None
+    created_at: float
+    updated_at: float
+
+class JobSubmitResponse(JobResponse):
+    created: bool  # False: attached to an unfinished job for the same URL
+
+class BatchItem(BaseModel):
+    text: Optional[str] = None
+    url: Optional[str] = None
+
+class BatchRequest(BaseModel):
+    items: List[BatchItem]
+
+class BatchItemResult(BaseModel):
+    index: int
+    result: Optional[PredictionResponse] = None
+    error: Optional[str] = None
+
+class BatchResponse(BaseModel):
+    results: List[BatchItemResult]
+
+async def _warm_model():
+    try:
+        await run_in_threadpool(get_model)
+    except Exception:
+        pass  # Load errors are reported by the scoring step
+
+def _overloaded(e: PoolSaturatedError) -> HTTPException:
+    return HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+def _shed(e: Overloaded) -> HTTPException:
+    return HTTPException(status_code=503, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+
+def _lookup_cached(text: str) -> tuple:
+    """
+    (lstm_score, verification) from the result cache, None where missing.
+    Verification is only looked up once the model score hit, so checking
+    a new text in front of admission costs a single lookup.
+    """
+    cache = get_result_cache()
+    lstm_score = cache.get_model_score(text)
+    if lstm_score is None:
+        return None, None
+    start = time.perf_counter()
+    verification = cache.get_verification(text)
+    if verification is not None:
+        observe(VERIFICATION, time.perf_counter() - start, outcome="cached")
+    return lstm_score, verification
 
-    # 1. LSTM Prediction
+async def _verify_with_deadline(text: str, check_cache: bool = True):
+    """
+    Verification stage: cache (unless the caller already looked), then the
+    near-duplicate index (a lightly edited copy of a recently verified
+    story reuses its result), then search under VERIFY_DEADLINE seconds.
+    Returns (verification_score, matches), or None if the deadline passed
+    or the search quota is exhausted.
+    """
+    start = time.perf_counter()
+    cache = get_result_cache()
+    cached = cache.get_verification(text) if check_cache else None
+    if cached is not None:
+        observe(VERIFICATION, time.perf_counter() - start, outcome="cached")
+        return cached
+    fingerprint, reused = find_near_duplicate(text)
+    if reused is not None:
+        observe(VERIFICATION, time.perf_counter() - start, outcome="near_duplicate")
+        verification_score, matches = reused
+        cache.set_verification(text, verification_score, matches)
+        return verification_score, matches
     try:
-        model = get_model()
-        lstm_score = model.predict(request.text) 
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Model error: {e}")
+        verification_score, matches = await asyncio.wait_for(verify_news(text), VERIFY_DEADLINE)
+    except asyncio.TimeoutError:
+        observe(VERIFICATION, time.perf_counter() - start, outcome="timeout")
+        logger.warning("Verification missed its %.1fs deadline", VERIFY_DEADLINE)
+        return None
+    except VerificationUnavailable as e:
+        observe(VERIFICATION, time.perf_counter() - start, outcome="unavailable")
+        logger.warning("Verification skipped: %s", e)
+        return None
+    observe(VERIFICATION, time.perf_counter() - start, outcome="ok")
+    if remember_verification(fingerprint, verification_score, matches):
+        cache.set_verification(text, verification_score, matches)
+    return verification_score, matches
 
-    # 2. Verification
-    verification_score, matches = verify_news(request.text)
+async def _score_document(text: str) -> float:
+    """
+    Model score for one document. Short texts join the micro-batch queue;
+    long ones are split into overlapping windows that are scored together
+    in one batched call and aggregated (FND_CHUNK_AGGREGATION).
+    """
+    chunks = chunk_text(text)
+    if len(chunks) == 1:
+        return await get_scheduler().submit(text)
+    scores = await get_scheduler().run_batch([chunk for chunk, _ in chunks])
+    return aggregate_scores(scores, [n for _, n in chunks])
+
+async def analyze_text(text: str, cached: Optional[tuple] = None) -> PredictionResponse:
+    """
+    Runs the full pipeline for one text. The model and verification stages
+    run concurrently, each under its own deadline; if verification is late
+    the verdict falls back to the model score alone and is flagged degraded.
+    `cached` is the result of _lookup_cached when the caller already did it;
+    a fully cached text skips straight to the verdict.
+    """
+    cache = get_result_cache()
+    timings = begin_timings()
+    lstm_score, verification = cached if cached is not None else _lookup_cached(text)
+
+    async def timed(name, coro):
+        with stage(name):
+            return await coro
+
+    async def model_stage():
+        score = await asyncio.wait_for(_score_document(text), MODEL_DEADLINE)
+        cache.set_model_score(text, score)
+        return score
+
+    if lstm_score is None or verification is None:
+        # 1. LSTM Prediction and 2. Verification, side by side. A cached
+        # model score means verification was looked up already (and missed).
+        verification_task = asyncio.ensure_future(
+            timed("verification", _verify_with_deadline(text, check_cache=lstm_score is None))
+        )
+        if lstm_score is None:
+            try:
+                lstm_score = await timed("model", model_stage())
+            except PoolSaturatedError as e:
+                verification_task.cancel()
+                raise _overloaded(e)
+            except asyncio.TimeoutError:
+                verification_task.cancel()
+                raise HTTPException(status_code=504, detail="Model timed out")
+            except Exception as e:
+                verification_task.cancel()
+                raise HTTPException(status_code=500, detail=f"Model error: {e}")
+        verification = await verification_task
+
+    degraded = verification is None
+    if degraded:
+        logger.info("Verification unavailable (deadline or search quota), using model-only verdict")
+        verification_score, matches = 0.5, []
+    else:
+        verification_score, matches = verification
 
     # 3. Final Logic
-    final_score, verdict, is_real = calculate_verdict(lstm_score, verification_score)
+    with stage("verdict"):
+        final_score, verdict, is_real = calculate_verdict(lstm_score, None if degraded else verification_score)
 
     sources = [Source(**m) for m in matches]
 
@@ -104,43 +289,316 @@ async def predict_text(request: TextRequest):
         final_score=final_score,
         verdict=verdict,
         matched_sources=sources,
-        is_real=is_real
+        is_real=is_real,
+        degraded=degraded,
+        timings=timings,
     )
 
+@app.post("/predict-text", response_model=PredictionResponse)
+async def predict_text(request: TextRequest):
+    if not request.text.strip():
+        raise HTTPException(status_code=400, detail="Text cannot be empty")
+
+    # Fully cached texts are answered even when the text class is shedding
+    admission = get_admission_controller()
+    cached = _lookup_cached(request.text)
+    if None not in cached:
+        admission.record_cached(TEXT)
+        return await analyze_text(request.text, cached)
+    try:
+        async with admission.admit(TEXT):
+            return await analyze_text(request.text, cached)
+    except Overloaded as e:
+        raise _shed(e)
+
 @app.post("/predict-url", response_model=PredictionResponse)
 async def predict_url(request: UrlRequest):
     if not request.url.strip():
         raise HTTPException(status_code=400, detail="URL cannot be empty")
 
-    # 1. Fetch content
-    text = extract_text_from_url(request.url)
+    admission = get_admission_controller()
+    cache = get_result_cache()
+    text = cache.get_article(request.url)
+    cached = _lookup_cached(text) if text else None
+    if cached is not None and None not in cached:
+        admission.record_cached(URL)
+        return await analyze_text(text, cached)
+
+    begin_timings()
+
+    async def fetch():
+        with stage("fetch"):
+            return await extract_text_from_url(request.url)
+
+    # URL requests have their own slots, so a burst of slow pages cannot starve cheap text requests
+    try:
+        async with admission.admit(URL):
+            if not text:
+                # 1. Fetch content (a cold worker loads the model in parallel)
+                text, _ = await asyncio.gather(fetch(), _warm_model())
+                if not text:
+                    raise HTTPException(status_code=400, detail="Could not extract text from URL")
+                cache.set_article(request.url, text)
+
+            # 2. Same pipeline as raw text
+            return await analyze_text(text, cached)
+    except Overloaded as e:
+        raise _shed(e)
+
+async def _run_url_job(url: str) -> dict:
+    """Job handler: the /predict-url pipeline, run in the background."""
+    text = await extract_text_from_url(url)
     if not text:
-        raise HTTPException(status_code=400, detail="Could not extract text from URL")
+        raise JobFailed("Could not extract text from URL")
+    try:
+        response = await analyze_text(text)
+    except HTTPException as e:
+        raise JobFailed(str(e.detail))
+    return response.model_dump()
+
+# Singleton instance
+job_manager = None
 
-    # Re-use logic (could refactor, but keeping simple)
-    # 2. LSTM
+def get_job_manager() -> JobManager:
+    global job_manager
+    if job_manager is None:
+        job_manager = JobManager(JobStore(JOBS_PATH, JOB_TTL, lease=JOB_LEASE), _run_url_job, JOB_WORKERS,
+                                 JOB_QUEUE_MAX, JOB_CLEANUP_INTERVAL)
+    return job_manager
+
+@app.post("/jobs", response_model=JobSubmitResponse, status_code=202)
+async def submit_job(request: JobRequest, response: Response):
+    """
+    Queues a URL analysis and returns at once. Poll GET /jobs/{id} or
+    stream GET /jobs/{id}/events. Submitting a URL that is already queued
+    or running returns that job (created=false).
+    """
+    if not request.url.strip():
+        raise HTTPException(status_code=400, detail="URL cannot be empty")
+    manager = get_job_manager()
+    if not manager.running:
+        raise HTTPException(status_code=503, detail="Job workers are not running")
     try:
-        model = get_model()
-        lstm_score = model.predict(text)
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Model error: {e}")
+        job, created = manager.submit(request.url.strip())
+    except JobQueueFull as e:
+        raise HTTPException(status_code=429, detail=str(e), headers={"Retry-After": str(e.retry_after)})
+    response.headers["Location"] = f"/jobs/{job['id']}"
+    return JobSubmitResponse(**job, created=created)
 
-    # 3. Verification
-    verification_score, matches = verify_news(text)
+@app.get("/jobs/{job_id}", response_model=JobResponse)
+async def get_job(job_id: str):
+    job = get_job_manager().store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Job not found (or expired)")
+    return JobResponse(**job)
 
-    # 4. Final Logic
-    final_score, verdict, is_real = calculate_verdict(lstm_score, verification_score)
-    
-    sources = [Source(**m) for m in matches]
+@app.get("/jobs/{job_id}/events")
+async def job_events(job_id: str):
+    """
+    Server-Sent Events: one event per status change (event name = status,
+    data = the job as JSON); the stream ends when the job is done or failed.
+    """
+    manager = get_job_manager()
+    if manager.store.get(job_id) is None:
+        raise HTTPException(status_code=404, detail="Job not found (or expired)")
 
-    return PredictionResponse(
-        lstm_score=lstm_score,
-        verification_score=verification_score,
-        final_score=final_score,
-        verdict=verdict,
-        matched_sources=sources,
-        is_real=is_real
-    )
+    async def stream():
+        async for job in manager.updates(job_id):
+            if job is None:
+                yield ": keep-alive\n\n"
+            else:
+                yield f"event: {job['status']}\ndata: {JobResponse(**job).model_dump_json()}\n\n"
+
+    return StreamingResponse(stream(), media_type="text/event-stream", headers={"Cache-Control": "no-cache"})
+
+async def _batch_texts(items: List[BatchItem], semaphore: asyncio.Semaphore):
+    """Resolves every batch item to text. Returns (texts, errors) keyed by position."""
+    texts = [None] * len(items)
+    errors = {}
+
+    async def fetch(index, url):
+        async with semaphore:
+            text = await extract_text_from_url(url)
+        if text:
+            texts[index] = text
+        else:
+            errors[index] = "Could not extract text from URL"
+
+    fetches = []
+    for i, item in enumerate(items):
+        has_text = bool(item.text and item.text.strip())
+        has_url = bool(item.url and item.url.strip())
+        if has_text == has_url:
+            errors[i] = "Provide exactly one of 'text' or 'url'"
+        elif has_text:
+            texts[i] = item.text
+        else:
+            fetches.append(fetch(i, item.url))
+
+    await asyncio.gather(*fetches)
+    return texts, errors
+
+async def _batch_results(items: List[BatchItem], wait_for_all: bool):
+    """
+    Runs the batch pipeline and yields lists of BatchItemResult in input order.
+
+    All model scores come from one batched forward pass. Verification runs
+    concurrently per item; whenever the next item in order is verified, the
+    contiguous run of finished items is pushed through calculate_verdicts in
+    one vectorized call and yielded.
+    """
+    semaphore = asyncio.Semaphore(max(1, BATCH_IO_CONCURRENCY))
+    texts, errors = await _batch_texts(items, semaphore)
+
+    cache = get_result_cache()
+    lstm_scores = {}
+    to_score = []
+    for i, text in enumerate(texts):
+        if text is None:
+            continue
+        cached = cache.get_model_score(text)
+        if cached is None:
+            to_score.append(i)
+        else:
+            lstm_scores[i] = cached
+
+    if to_score:
+        try:
+            # Every window of every document goes into the same forward pass
+            flat_chunks, spans = split_documents([texts[i] for i in to_score])
+            scores = combine_scores(await get_scheduler().run_batch(flat_chunks), spans)
+            for i, score in zip(to_score, scores):
+                lstm_scores[i] = score
+                cache.set_model_score(texts[i], score)
+        except PoolSaturatedError:
+            raise
+        except Exception as e:
+            for i in to_score:
+                errors[i] = f"Model error: {e}"
+
+    async def verify(text):
+        async with semaphore:
+            return await _verify_with_deadline(text)
+
+    verifications = {i: asyncio.ensure_future(verify(texts[i])) for i in lstm_scores}
+    if wait_for_all and verifications:
+        await asyncio.wait(list(verifications.values()))
+
+    position = 0
+    while position < len(items):
+        if position in verifications:
+            await asyncio.wait([verifications[position]])
+        end = position + 1
+        while end < len(items) and (end not in verifications or verifications[end].done()):
+            end += 1
+
+        ready = []
+        for i in range(position, end):
+            if i not in verifications:
+                continue
+            try:
+                verification = verifications[i].result()
+            except Exception as e:
+                errors[i] = f"Verification error: {e}"
+                continue
+            # None: verification missed its deadline, score on the model alone
+            ready.append((i, verification or (np.nan, [])))
+
+        results = {i: BatchItemResult(index=i, error=errors[i]) for i in range(position, end) if i in errors}
+        if ready:
+            indices = [i for i, _ in ready]
+            verification_scores = [v[0] for _, v in ready]
+            final_scores, verdicts, is_real = calculate_verdicts(
+                [lstm_scores[i] for i in indices], verification_scores
+            )
+            for k, (i, (verification_score, matches)) in enumerate(ready):
+                degraded = bool(np.isnan(verification_score))
+                results[i] = BatchItemResult(index=i, result=PredictionResponse(
+                    lstm_score=lstm_scores[i],
+                    verification_score=0.5 if degraded else verification_score,
+                    final_score=float(final_scores[k]),
+                    verdict=str(verdicts[k]),
+                    matched_sources=[Source(**m) for m in matches],
+                    is_real=bool(is_real[k]),
+                    degraded=degraded,
+                ))
+
+        yield [results[i] for i in range(position, end)]
+        position = end
+
+@app.post("/predict-batch", response_model=BatchResponse)
+async def predict_batch(request: BatchRequest, stream: bool = False):
+    """
+    Scores many texts and/or URLs in one call. Results keep input order and
+    carry per-item errors. With ?stream=true the response is NDJSON, one
+    BatchItemResult per line, emitted as soon as each prefix is ready.
+    """
+    if not request.items:
+        raise HTTPException(status_code=400, detail="Batch cannot be empty")
+    if len(request.items) > BATCH_MAX_ITEMS:
+        raise HTTPException(status_code=413, detail=f"Batch exceeds {BATCH_MAX_ITEMS} items")
+
+    if stream:
+        # The first chunk is produced before the 200 goes out, so a full
+        # inference queue can still be reported as 429.
+        chunks = _batch_results(request.items, wait_for_all=False)
+        try:
+            first = await chunks.__anext__()
+        except PoolSaturatedError as e:
+            raise _overloaded(e)
+
+        async def ndjson():
+            for item in first:
+                yield item.model_dump_json() + "\n"
+            async for chunk in chunks:
+                for item in chunk:
+                    yield item.model_dump_json() + "\n"
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    results = []
+    try:
+        async for chunk in _batch_results(request.items, wait_for_all=True):
+            results.extend(chunk)
+    except PoolSaturatedError as e:
+        raise _overloaded(e)
+    return BatchResponse(results=results)
+
+@app.get("/healthz")
+async def healthz():
+    """Liveness: the process is up and serving HTTP."""
+    return {"status": "ok"}
+
+@app.get("/readyz")
+async def readyz():
+    """
+    Readiness: 200 once the model can serve without a cold start. In lazy
+    mode the first request loads the model, so only a failed load is not ready.
+    """
+    status = model_status()
+    ready = status["state"] == "ready" or (MODEL_STARTUP == "lazy" and status["state"] != "failed")
+    body = {"ready": ready, "startup": MODEL_STARTUP, "model": status}
+    return JSONResponse(body, status_code=200 if ready else 503)
+
+@app.get("/stats")
+async def stats():
+    """Runtime counters for tuning (batch sizes, queue depth, cache hit ratios)."""
+    return {
+        "batching": get_scheduler().stats(),
+        "cache": get_result_cache().stats(),
+        "model": model_status(),
+        "search": {"cache": get_search_cache().stats(), "quota": get_search_limiter().stats()},
+        "near_duplicates": get_near_duplicate_index().stats(),
+        "jobs": get_job_manager().stats(),
+        "admission": get_admission_controller().stats(),
+        "verdict_policy": get_verdict_policy().kind,
+    }
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """Prometheus scrape endpoint (text exposition format)."""
+    if not REGISTRY.enabled:
+        raise HTTPException(status_code=404, detail="Metrics are disabled (FND_METRICS=0)")
+    return PlainTextResponse(REGISTRY.render(), media_type="text/plain; version=0.0.4; charset=utf-8")
 
 if __name__ == "__main__":
     uvicorn.run("main:app", host="0.0.0.0", port=8000, reload=True)
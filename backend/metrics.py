@@ -0,0 +1,200 @@
+import threading
+from bisect import bisect_left
+from typing import Callable, Dict, Iterable, Optional, Tuple
+
+try:
+    from backend.config import METRICS_ENABLED
+except ImportError:
+    from config import METRICS_ENABLED
+
+# A small in-process registry rendered in the Prometheus text format, so
+# /metrics works without an extra dependency. Updates are a dict lookup, a
+# bisect and an add under a lock, cheap enough for every request.
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+SIZE_BUCKETS = (1, 2, 4, 8, 16, 32, 64, 128, 256, 512)
+
+def _format_labels(names: Tuple[str, ...], values: Tuple[str, ...], extra: str = "") -> str:
+    pairs = [f'{n}="{_escape(v)}"' for n, v in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+class _Metric:
+    kind = ""
+
+    def __init__(self, name: str, documentation: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> tuple:
+        return tuple(str(labels.get(n, "")) for n in self.labelnames)
+
+    def header(self) -> list:
+        return [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} {self.kind}"]
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name, documentation, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[tuple, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def snapshot(self) -> Dict[tuple, float]:
+        """A copy of the values by label tuple, safe to iterate while other threads increment."""
+        with self._lock:
+            return dict(self._values)
+
+    def render(self) -> list:
+        items = sorted(self.snapshot().items())
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in items
+        ]
+
+class Gauge(_Metric):
+    """A value read at scrape time from `callback` (returns a number or {label tuple: number})."""
+    kind = "gauge"
+
+    def __init__(self, name, documentation, callback: Callable, labelnames=()):
+        super().__init__(name, documentation, labelnames)
+        self.callback = callback
+
+    def render(self) -> list:
+        try:
+            value = self.callback()
+        except Exception:
+            return []  # the component is not initialised yet
+        items = value.items() if isinstance(value, dict) else [((), value)]
+        return self.header() + [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in sorted(items)
+        ]
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[tuple, list] = {}  # key -> [bucket counts..., +Inf count, sum]
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [0] * (len(self.buckets) + 1) + [0.0]
+            series[index] += 1
+            series[-1] += value
+
+    def count(self, **labels) -> int:
+        series = self._series.get(self._key(labels))
+        return sum(series[:-1]) if series else 0
+
+    def render(self) -> list:
+        with self._lock:
+            items = sorted((key, list(series)) for key, series in self._series.items())
+        lines = self.header()
+        for key, series in items:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), series[:-1]):
+                cumulative += count
+                labels = _format_labels(self.labelnames, key, f'le="{_format_value(bound)}"')
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(series[-1])}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+class Registry:
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._metrics: Dict[str, _Metric] = {}
+
+    def _register(self, metric: _Metric) -> _Metric:
+        return self._metrics.setdefault(metric.name, metric)
+
+    def counter(self, name, documentation, labelnames=()) -> Counter:
+        return self._register(Counter(name, documentation, labelnames))
+
+    def histogram(self, name, documentation, labelnames=(), buckets=LATENCY_BUCKETS) -> Histogram:
+        return self._register(Histogram(name, documentation, labelnames, buckets))
+
+    def gauge(self, name, documentation, callback, labelnames=()) -> Gauge:
+        return self._register(Gauge(name, documentation, callback, labelnames))
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        lines = []
+        for metric in self._metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+REGISTRY = Registry(METRICS_ENABLED)
+
+# Instruments shared across modules. Callback gauges are registered by the
+# module that owns the state (see main.py).
+HTTP_REQUESTS = REGISTRY.counter("fnd_http_requests_total", "API requests by route and status.", ("route", "status"))
+HTTP_LATENCY = REGISTRY.histogram("fnd_http_request_seconds", "API request latency.", ("route",))
+STAGE_LATENCY = REGISTRY.histogram("fnd_stage_seconds", "Wall time of pipeline stages within a request.", ("stage",))
+MODEL_INFERENCE = REGISTRY.histogram("fnd_model_inference_seconds", "Time for one batched model call.")
+MODEL_BATCH_SIZE = REGISTRY.histogram("fnd_model_batch_size", "Texts per batched model call.", buckets=SIZE_BUCKETS)
+VERIFICATION = REGISTRY.histogram(
+    "fnd_verification_seconds", "Verification stage time by outcome (ok, cached, near_duplicate, timeout, unavailable).", ("outcome",)
+)
+VERIFICATION_QUERIES = REGISTRY.counter(
+    "fnd_verification_queries_total",
+    "Candidate queries issued by verification, by why the fan-out stopped (enough_evidence, exhausted, budget).",
+    ("stop",),
+)
+SEARCH_REQUESTS = REGISTRY.histogram("fnd_search_request_seconds", "Round trip of one paid search request.", ("result",))
+ARTICLE_FETCH = REGISTRY.histogram("fnd_article_fetch_seconds", "Article download + extraction time.", ("result",))
+ARTICLE_PARSE = REGISTRY.histogram("fnd_article_parse_seconds", "CPU time spent parsing article HTML.")
+CACHE_REQUESTS = REGISTRY.counter("fnd_cache_requests_total", "Cache lookups by cache and result.", ("cache", "result"))
+JOBS = REGISTRY.counter("fnd_jobs_total", "Finished background jobs by outcome.", ("outcome",))
+JOB_DURATION = REGISTRY.histogram("fnd_job_seconds", "Run time of background jobs by outcome.", ("outcome",))
+ADMISSION = REGISTRY.counter(
+    "fnd_admission_total", "Admission decisions by request class and outcome (admitted, queued, cached, shed).",
+    ("cls", "outcome"),
+)
+
+def _cache_hit_ratios():
+    values = CACHE_REQUESTS.snapshot()
+    ratios = {}
+    for cache in sorted({key[0] for key in values}):
+        hits, misses = values.get((cache, "hit"), 0.0), values.get((cache, "miss"), 0.0)
+        ratios[(cache,)] = hits / (hits + misses) if hits + misses else 0.0
+    return ratios
+
+REGISTRY.gauge("fnd_cache_hit_ratio", "Share of cache lookups that were hits since start.", _cache_hit_ratios, ("cache",))
+
+def cache_lookup(cache: str, hit: bool):
+    increment(CACHE_REQUESTS, cache=cache, result="hit" if hit else "miss")
+
+def increment(counter: Counter, amount: float = 1.0, **labels):
+    if REGISTRY.enabled:
+        counter.inc(amount, **labels)
+
+def observe(histogram: Histogram, value: float, **labels):
+    if REGISTRY.enabled:
+        histogram.observe(value, **labels)
@@ -1,53 +1,164 @@
 
-import tensorflow as tf
-from tensorflow.keras.models import load_model
-import numpy as np
+import logging
 import os
+import threading
+import time
+
+try:
+    from backend.config import (
+        MODEL_PATH, MODEL_BACKEND, NUMPY_MODEL_DIR, BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS, BATCH_EXECUTOR_THREADS,
+        MODEL_WORKERS, MODEL_WORKER_QUEUE, MODEL_WORKER_MAX_REQUESTS, MODEL_DEADLINE,
+    )
+    from backend.batching import BatchScheduler
+    from backend.inference import load_backend
+    from backend.worker_pool import ModelWorkerPool
+except ImportError:
+    from config import (
+        MODEL_PATH, MODEL_BACKEND, NUMPY_MODEL_DIR, BATCH_MAX_SIZE, BATCH_MAX_WAIT_MS, BATCH_EXECUTOR_THREADS,
+        MODEL_WORKERS, MODEL_WORKER_QUEUE, MODEL_WORKER_MAX_REQUESTS, MODEL_DEADLINE,
+    )
+    from batching import BatchScheduler
+    from inference import load_backend
+    from worker_pool import ModelWorkerPool
+from functools import partial
+from concurrent.futures import ThreadPoolExecutor
+
+logger = logging.getLogger(__name__)
 
 class FakeNewsModel:
-    def __init__(self, model_path: str):
+    def __init__(self, model_path: str, backend: str = "keras", numpy_dir: str = NUMPY_MODEL_DIR):
         self.model_path = model_path
+        self.backend = backend
+        self.numpy_dir = numpy_dir
         self.model = None
         self.load()
 
     def load(self):
-        if not os.path.exists(self.model_path):
-            raise FileNotFoundError(f"Model file not found at {self.model_path}")
+        path = self.numpy_dir if self.backend == "numpy" else self.model_path
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Model file not found at {path}")
         
-        print(f"Loading model from {self.model_path}...")
+        logger.info("Loading %s model from %s...", self.backend, path)
         try:
-            self.model = load_model(self.model_path)
-            print("Model loaded successfully.")
+            # Heavy runtimes (TensorFlow) are imported by the backend itself,
+            # not at module import, so processes that never score start fast.
+            self.model = load_backend(self.backend, self.model_path, self.numpy_dir)
+            logger.info("Model loaded successfully.")
         except Exception as e:
-            print(f"Failed to load model: {e}")
+            logger.error("Failed to load model: %s", e)
             raise e
 
     def predict(self, text: str) -> float:
+        return self.predict_batch([text])[0]
+
+    def predict_batch(self, texts: list) -> list:
+        """
+        Scores several texts with a single forward pass.
+        Returns one float per input, in input order; backend errors propagate.
+        """
         if not self.model:
             raise ValueError("Model not loaded")
-        
-        # The model likely expects a specific input shape or string if TextVectorization is included.
-        # If it's pure string input (TextVectorization inside model):
+        if not texts:
+            return []
+
         try:
-            # We pass a list/array of strings, but some models need tf.constant
-            import tensorflow as tf
-            input_data = tf.constant([text])
-            pred = self.model.predict(input_data)
-            return float(pred[0][0])
+            return [float(p) for p in self.model.predict_batch(list(texts))]
         except Exception as e:
-
-            print(f"Prediction error: {e}")
-            # Fallback if model expects tokenized input (unlikely if end-to-end but possible)
-            # For now assume end-to-end with string input
-            return 0.5  # Neutral fallback
+            # Raised, not replaced by a neutral score: callers would cache
+            # and serve it as a real prediction
+            logger.exception("Prediction error: %s", e)
+            raise
 
 # Singleton instance
-model_path = os.path.join(os.path.dirname(__file__), "fake_lstm_saved.keras")
+model_path = MODEL_PATH
 # If .keras doesn't work, we might fallback to .h5, but .keras is newer.
 model_instance = None
+_model_lock = threading.Lock()
+
+# Load lifecycle, reported by /readyz: unloaded -> loading -> ready | failed
+model_state = "unloaded"
+model_error = None
+model_load_seconds = None
+
+def _create_model():
+    if MODEL_WORKERS <= 0:
+        return FakeNewsModel(model_path, backend=MODEL_BACKEND)
+    # Each worker process builds its own FakeNewsModel; the pool exposes the
+    # same predict/predict_batch interface to the rest of the app.
+    pool = ModelWorkerPool(
+        partial(FakeNewsModel, model_path, MODEL_BACKEND, NUMPY_MODEL_DIR),
+        workers=MODEL_WORKERS,
+        max_queue=MODEL_WORKER_QUEUE,
+        max_requests_per_worker=MODEL_WORKER_MAX_REQUESTS,
+        request_timeout=MODEL_DEADLINE,
+    )
+    return pool.start()
 
 def get_model():
-    global model_instance
+    global model_instance, model_state, model_error, model_load_seconds
     if model_instance is None:
-        model_instance = FakeNewsModel(model_path)
+        with _model_lock:
+            if model_instance is None:
+                model_state = "loading"
+                start = time.perf_counter()
+                try:
+                    model_instance = _create_model()
+                except Exception as e:
+                    model_state, model_error = "failed", str(e)
+                    raise
+                model_load_seconds = time.perf_counter() - start
+                model_state, model_error = "ready", None
     return model_instance
+
+def load_and_warm_up():
+    """Loads the model and runs one throwaway inference so the first real request is not slow."""
+    model = get_model()
+    start = time.perf_counter()
+    model.predict_batch(["Warm-up inference"])
+    logger.info("Model warm-up took %.2fs", time.perf_counter() - start)
+    return model
+
+def start_background_load() -> threading.Thread:
+    def run():
+        try:
+            load_and_warm_up()
+        except Exception as e:
+            logger.error("Background model load failed: %s", e)
+
+    thread = threading.Thread(target=run, name="fnd-model-load", daemon=True)
+    thread.start()
+    return thread
+
+def model_status() -> dict:
+    status = {
+        "state": model_state,
+        "error": model_error,
+        "load_seconds": None if model_load_seconds is None else round(model_load_seconds, 3),
+    }
+    if isinstance(model_instance, ModelWorkerPool):
+        status["pool"] = model_instance.stats()
+    return status
+
+def shutdown_model():
+    if isinstance(model_instance, ModelWorkerPool):
+        model_instance.shutdown()
+
+scheduler_instance = None
+
+def _predict_batch(texts):
+    # Resolved on the executor thread, so a lazy model load never blocks the event loop
+    return get_model().predict_batch(texts)
+
+def get_scheduler():
+    global scheduler_instance
+    if scheduler_instance is None:
+        scheduler_instance = BatchScheduler(
+            _predict_batch,
+            max_batch_size=BATCH_MAX_SIZE,
+            max_wait_ms=BATCH_MAX_WAIT_MS,
+            # With worker processes, keep one batch in flight per worker
+            executor=ThreadPoolExecutor(
+                max_workers=max(1, BATCH_EXECUTOR_THREADS, MODEL_WORKERS), thread_name_prefix="fnd-batch"
+            ),
+        )
+    return scheduler_instance
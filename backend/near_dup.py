@@ -0,0 +1,193 @@
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, List, Optional
+
+import numpy as np
+
+try:
+    from backend.config import (
+        NEAR_DUP_ENABLED, NEAR_DUP_MAX_DISTANCE, NEAR_DUP_MAX_ENTRIES, NEAR_DUP_TTL, NEAR_DUP_MIN_WORDS,
+        NEAR_DUP_MAX_WORDS, NEAR_DUP_SHINGLE,
+    )
+    from backend.metrics import cache_lookup
+    from backend.text_analysis import tokenize
+except ImportError:
+    from config import (
+        NEAR_DUP_ENABLED, NEAR_DUP_MAX_DISTANCE, NEAR_DUP_MAX_ENTRIES, NEAR_DUP_TTL, NEAR_DUP_MIN_WORDS,
+        NEAR_DUP_MAX_WORDS, NEAR_DUP_SHINGLE,
+    )
+    from metrics import cache_lookup
+    from text_analysis import tokenize
+
+FINGERPRINT_BITS = 64
+
+def _shingle_hash(shingle: str) -> int:
+    # Stable across processes, unlike hash()
+    return int.from_bytes(hashlib.blake2b(shingle.encode("utf-8"), digest_size=8).digest(), "little")
+
+def simhash(tokens: List[str], shingle: int = 3) -> int:
+    """
+    64-bit SimHash over word shingles. Texts that share most of their
+    shingles get fingerprints a few bits apart; unrelated texts differ in
+    about half of the bits.
+    """
+    shingle = max(1, shingle)
+    if len(tokens) <= shingle:
+        shingles = [" ".join(tokens)]
+    else:
+        shingles = [" ".join(tokens[i:i + shingle]) for i in range(len(tokens) - shingle + 1)]
+    hashes = np.fromiter((_shingle_hash(s) for s in shingles), dtype=np.uint64, count=len(shingles))
+    # One row of 64 bits per shingle; a fingerprint bit is set where most shingles have it set
+    bits = np.unpackbits(hashes.view(np.uint8).reshape(-1, 8), axis=1, bitorder="little")
+    majority = bits.sum(axis=0, dtype=np.int64) * 2 > len(shingles)
+    return int.from_bytes(np.packbits(majority, bitorder="little").tobytes(), "little")
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count("1")
+
+def _band_masks(bands: int) -> List[tuple]:
+    """(shift, mask) for `bands` contiguous bit ranges covering the fingerprint."""
+    widths = [FINGERPRINT_BITS // bands + (1 if i < FINGERPRINT_BITS % bands else 0) for i in range(bands)]
+    masks, shift = [], 0
+    for width in widths:
+        masks.append((shift, (1 << width) - 1))
+        shift += width
+    return masks
+
+class NearDuplicateIndex:
+    """
+    Recently scored texts keyed by SimHash, for reusing results across
+    lightly edited copies of the same story.
+
+    Lookups use LSH banding: the fingerprint is cut into max_distance + 1
+    bands, and two fingerprints within max_distance bits must agree
+    exactly on at least one band, so only entries sharing a band are
+    compared. Memory is bounded by max_entries (oldest evicted first) and
+    entries expire after ttl seconds.
+    """
+
+    def __init__(self, max_distance: int = 6, max_entries: int = 50000, ttl: float = 6 * 3600.0,
+                 min_words: int = 50, max_words: int = 2000, shingle: int = 3,
+                 clock: Callable[[], float] = time.time):
+        self.max_distance = max(0, min(max_distance, FINGERPRINT_BITS // 4))
+        self.max_entries = max(1, max_entries)
+        self.ttl = ttl
+        self.min_words = min_words
+        self.max_words = max_words
+        self.shingle = shingle
+        self.clock = clock
+        self._bands = _band_masks(self.max_distance + 1)
+        self._entries = OrderedDict()  # fingerprint -> (value, expires_at), oldest first
+        self._buckets = [dict() for _ in self._bands]  # band value -> set of fingerprints
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def fingerprint(self, text: str) -> Optional[int]:
+        """SimHash of the text, or None when it is too short to compare reliably."""
+        tokens = tokenize(text)
+        if len(tokens) < self.min_words:
+            return None
+        return simhash(tokens[:self.max_words], self.shingle)
+
+    def _band_keys(self, fingerprint: int):
+        return [(fingerprint >> shift) & mask for shift, mask in self._bands]
+
+    def _remove(self, fingerprint: int):
+        self._entries.pop(fingerprint, None)
+        for bucket, key in zip(self._buckets, self._band_keys(fingerprint)):
+            members = bucket.get(key)
+            if members is not None:
+                members.discard(fingerprint)
+                if not members:
+                    del bucket[key]
+
+    def _expire(self, now: float):
+        # Entries are kept in insertion order and share one ttl, so expired ones are at the front
+        while self._entries:
+            fingerprint, (_, expires_at) = next(iter(self._entries.items()))
+            if expires_at > now:
+                break
+            self._remove(fingerprint)
+
+    def get(self, fingerprint: Optional[int]) -> Optional[Any]:
+        """Value stored for the nearest fingerprint within max_distance bits, if any."""
+        if fingerprint is None:
+            return None
+        now = self.clock()
+        best, best_distance = None, self.max_distance + 1
+        with self._lock:
+            self._expire(now)
+            candidates = set()
+            for bucket, key in zip(self._buckets, self._band_keys(fingerprint)):
+                candidates.update(bucket.get(key, ()))
+            for candidate in candidates:
+                distance = hamming(candidate, fingerprint)
+                if distance < best_distance:
+                    best, best_distance = candidate, distance
+            value = self._entries[best][0] if best is not None else None
+            if value is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+        cache_lookup("near_duplicate", value is not None)
+        return value
+
+    def add(self, fingerprint: Optional[int], value: Any):
+        if fingerprint is None:
+            return
+        now = self.clock()
+        with self._lock:
+            self._remove(fingerprint)
+            self._entries[fingerprint] = (value, now + self.ttl)
+            for bucket, key in zip(self._buckets, self._band_keys(fingerprint)):
+                bucket.setdefault(key, set()).add(fingerprint)
+            self._expire(now)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def __len__(self):
+        return len(self._entries)
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "max_distance": self.max_distance,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_ratio": round(self.hits / total, 4) if total else 0.0,
+        }
+
+class _NullIndex:
+    """Stand-in when FND_NEAR_DUP=0."""
+
+    def fingerprint(self, text):
+        return None
+
+    def get(self, fingerprint):
+        return None
+
+    def add(self, fingerprint, value):
+        pass
+
+    def stats(self) -> dict:
+        return {"enabled": False}
+
+# Singleton instance
+near_duplicate_index = None
+
+def get_near_duplicate_index():
+    global near_duplicate_index
+    if near_duplicate_index is None:
+        if NEAR_DUP_ENABLED:
+            near_duplicate_index = NearDuplicateIndex(
+                NEAR_DUP_MAX_DISTANCE, NEAR_DUP_MAX_ENTRIES, NEAR_DUP_TTL, NEAR_DUP_MIN_WORDS,
+                NEAR_DUP_MAX_WORDS, NEAR_DUP_SHINGLE,
+            )
+        else:
+            near_duplicate_index = _NullIndex()
+    return near_duplicate_index
@@ -0,0 +1,195 @@
+import json
+import sqlite3
+import threading
+import time
+from typing import Callable, Optional
+
+try:
+    from backend.config import (
+        SEARCH_CACHE_PATH, SEARCH_CACHE_TTL, SEARCH_RATE_PER_MINUTE, SEARCH_BURST, SEARCH_DAILY_BUDGET
+    )
+    from backend.metrics import cache_lookup
+except ImportError:
+    from config import (
+        SEARCH_CACHE_PATH, SEARCH_CACHE_TTL, SEARCH_RATE_PER_MINUTE, SEARCH_BURST, SEARCH_DAILY_BUDGET
+    )
+    from metrics import cache_lookup
+
+def normalize_query(query: str) -> str:
+    """Lowercased, de-duplicated, sorted terms: 'Dam river dam' and 'river DAM' share an entry."""
+    return " ".join(sorted(set(query.lower().split())))
+
+def utc_day(clock: Callable[[], float] = time.time) -> str:
+    return time.strftime("%Y-%m-%d", time.gmtime(clock()))
+
+class SearchQueryCache:
+    """
+    Persistent store of parsed search results keyed on the normalized query.
+    Also keeps the per-day count of paid queries so the daily budget
+    survives restarts.
+    """
+
+    def __init__(self, path: str, ttl: float, clock: Callable[[], float] = time.time):
+        self.path = path
+        self.ttl = ttl
+        self.clock = clock
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, timeout=5, check_same_thread=False, isolation_level=None)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS search_results ("
+            " query TEXT PRIMARY KEY, items TEXT NOT NULL, expires_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS search_usage (day TEXT PRIMARY KEY, used INTEGER NOT NULL)")
+
+    def get(self, query: str) -> Optional[list]:
+        now = self.clock()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT items, expires_at FROM search_results WHERE query = ?", (normalize_query(query),)
+            ).fetchone()
+            if row is None or row[1] <= now:
+                self.misses += 1
+                cache_lookup("search", False)
+                return None
+            self.hits += 1
+        cache_lookup("search", True)
+        return json.loads(row[0])
+
+    def set(self, query: str, items: list):
+        now = self.clock()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO search_results (query, items, expires_at) VALUES (?, ?, ?)",
+                (normalize_query(query), json.dumps(items), now + self.ttl),
+            )
+            self._conn.execute("DELETE FROM search_results WHERE expires_at <= ?", (now,))
+
+    def usage(self, day: str) -> int:
+        with self._lock:
+            row = self._conn.execute("SELECT used FROM search_usage WHERE day = ?", (day,)).fetchone()
+        return row[0] if row else 0
+
+    def add_usage(self, day: str):
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO search_usage (day, used) VALUES (?, 1)"
+                " ON CONFLICT(day) DO UPDATE SET used = used + 1",
+                (day,),
+            )
+            self._conn.execute("DELETE FROM search_usage WHERE day < ?", (day,))
+
+    def try_spend(self, day: str, budget: int) -> bool:
+        """
+        Counts one paid query against the day's budget unless it is spent.
+        The check and the increment are one UPDATE, so processes sharing
+        the file never overspend together.
+        """
+        with self._lock:
+            self._conn.execute("INSERT OR IGNORE INTO search_usage (day, used) VALUES (?, 0)", (day,))
+            cursor = self._conn.execute(
+                "UPDATE search_usage SET used = used + 1 WHERE day = ? AND used < ?", (day, budget)
+            )
+            self._conn.execute("DELETE FROM search_usage WHERE day < ?", (day,))
+        return cursor.rowcount == 1
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries = self._conn.execute("SELECT COUNT(*) FROM search_results").fetchone()[0]
+        return {"path": self.path, "entries": entries, "hits": self.hits, "misses": self.misses}
+
+class SearchQuotaLimiter:
+    """
+    Token bucket (rate_per_minute, burst) in front of a hard daily budget.
+    try_acquire() never blocks: when it says no, the caller degrades
+    instead of queueing behind an exhausted quota. With a usage store the
+    budget is counted there, shared by every process using the same file;
+    the token bucket is per process.
+    """
+
+    def __init__(
+        self,
+        rate_per_minute: float,
+        burst: int,
+        daily_budget: int,
+        usage_store: Optional[SearchQueryCache] = None,
+        clock: Callable[[], float] = time.monotonic,
+        wall_clock: Callable[[], float] = time.time,
+    ):
+        self.rate = max(0.0, rate_per_minute) / 60.0
+        self.burst = max(1, burst)
+        self.daily_budget = daily_budget
+        self.usage_store = usage_store
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.rejected_total = 0
+        self._tokens = float(self.burst)
+        self._updated = clock()
+        self._day = utc_day(wall_clock)
+        self._used_today = 0  # only counted here without a usage store
+        self._lock = threading.Lock()
+
+    def try_acquire(self) -> bool:
+        with self._lock:
+            now = self.clock()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            day = utc_day(self.wall_clock)
+            if day != self._day:
+                self._day = day
+                self._used_today = 0
+
+            if self._tokens < 1.0 or not self._spend(day):
+                self.rejected_total += 1
+                return False
+            self._tokens -= 1.0
+        return True
+
+    def _spend(self, day: str) -> bool:
+        if self.usage_store is None:
+            if self.daily_budget > 0 and self._used_today >= self.daily_budget:
+                return False
+            self._used_today += 1
+            return True
+        if self.daily_budget > 0:
+            return self.usage_store.try_spend(day, self.daily_budget)
+        self.usage_store.add_usage(day)
+        return True
+
+    def used_today(self) -> int:
+        if self.usage_store is not None:
+            return self.usage_store.usage(utc_day(self.wall_clock))
+        return self._used_today
+
+    def stats(self) -> dict:
+        return {
+            "used_today": self.used_today(),
+            "daily_budget": self.daily_budget,
+            "tokens": round(self._tokens, 3),
+            "rejected_total": self.rejected_total,
+        }
+
+# Singleton instances
+search_cache = None
+search_limiter = None
+
+def get_search_cache() -> SearchQueryCache:
+    global search_cache
+    if search_cache is None:
+        search_cache = SearchQueryCache(SEARCH_CACHE_PATH, SEARCH_CACHE_TTL)
+    return search_cache
+
+def get_search_limiter() -> SearchQuotaLimiter:
+    global search_limiter
+    if search_limiter is None:
+        search_limiter = SearchQuotaLimiter(
+            SEARCH_RATE_PER_MINUTE, SEARCH_BURST, SEARCH_DAILY_BUDGET, usage_store=get_search_cache()
+        )
+    return search_limiter
+
+def searches_used_today() -> int:
+    """Today's paid searches for the metrics gauge; 0 until a search opened the store (scraping never creates it)."""
+    return search_limiter.used_today() if search_limiter is not None else 0
@@ -0,0 +1,35 @@
+from typing import Callable, Dict, List, Union
+
+# Verification talks to web search through this interface, so the Google
+# backend can be swapped for an offline index or a stub.
+#
+# An item is a dict with "link", "title" and "snippet", the shape of a
+# Custom Search result. search() raises VerificationUnavailable (verify.py)
+# when the provider's quota is spent; other exceptions count as failures.
+
+class SearchProvider:
+    name = "base"
+
+    def available(self) -> bool:
+        """False when the provider is not configured (missing credentials, no index)."""
+        return True
+
+    async def search(self, query: str) -> List[dict]:
+        raise NotImplementedError
+
+class StaticSearchProvider(SearchProvider):
+    """
+    Canned results for tests and local development: a dict from query to
+    items (missing queries return no items) or a callable returning items.
+    """
+    name = "static"
+
+    def __init__(self, results: Union[Dict[str, List[dict]], Callable[[str], List[dict]]]):
+        self.results = results
+        self.queries: List[str] = []
+
+    async def search(self, query: str) -> List[dict]:
+        self.queries.append(query)
+        if callable(self.results):
+            return list(self.results(query))
+        return list(self.results.get(query, []))
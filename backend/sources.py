@@ -0,0 +1,106 @@
+import json
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, NamedTuple, Optional
+
+try:
+    from backend.config import SOURCES_PATH, SOURCES_RELOAD_INTERVAL
+except ImportError:
+    from config import SOURCES_PATH, SOURCES_RELOAD_INTERVAL
+
+logger = logging.getLogger(__name__)
+
+KIND_NEWS = "news"
+KIND_FACT_CHECKER = "fact_checker"
+
+class SourceEntry(NamedTuple):
+    domain: str
+    kind: str
+    trust: float    # reported to clients as trustScore
+    weight: float   # multiplier on the snippet sentiment when scoring
+
+def host_of(netloc: str) -> str:
+    """'User@WWW.BBC.com:443.' -> 'www.bbc.com'"""
+    host = netloc.rsplit("@", 1)[-1].split(":", 1)[0]
+    return host.strip(".").lower()
+
+def build_index(config: dict) -> Dict[str, SourceEntry]:
+    defaults = config.get("defaults", {})
+    index = {}
+    for raw in config.get("sources", []):
+        kind = raw.get("kind", KIND_NEWS)
+        base = defaults.get(kind, {})
+        domain = host_of(raw["domain"])
+        index[domain] = SourceEntry(
+            domain=domain,
+            kind=kind,
+            trust=float(raw.get("trust", base.get("trust", 1.0))),
+            weight=float(raw.get("weight", base.get("weight", 1.0))),
+        )
+    return index
+
+class SourceRegistry:
+    """
+    Known news outlets and fact-checkers, keyed by registered domain.
+
+    A host matches an entry when the entry is a whole-label suffix of it:
+    'www.rt.com' matches 'rt.com', 'art.com' does not. Lookup walks the
+    host's suffixes from longest to shortest, one dict probe per label.
+    The file is re-read when its mtime changes (checked at most every
+    `reload_interval` seconds), so edits apply without a restart.
+    """
+
+    def __init__(self, path: str, reload_interval: float = 5.0, clock: Callable[[], float] = time.monotonic):
+        self.path = path
+        self.reload_interval = reload_interval
+        self.clock = clock
+        self._index: Dict[str, SourceEntry] = {}
+        self._mtime = None
+        self._checked_at = None
+        self._lock = threading.Lock()
+        self.reload()
+
+    def reload(self) -> bool:
+        """Re-reads the file if it changed. A broken file keeps the previous index."""
+        with self._lock:
+            self._checked_at = self.clock()
+            try:
+                mtime = os.path.getmtime(self.path)
+                if mtime == self._mtime:
+                    return False
+                with open(self.path, "r") as f:
+                    index = build_index(json.load(f))
+            except (OSError, ValueError, KeyError, TypeError) as e:
+                logger.error("Could not load sources from %s: %s", self.path, e)
+                return False
+            self._index = index
+            self._mtime = mtime
+            return True
+
+    def _maybe_reload(self):
+        if self._checked_at is None or self.clock() - self._checked_at >= self.reload_interval:
+            self.reload()
+
+    def classify(self, netloc: str) -> Optional[SourceEntry]:
+        self._maybe_reload()
+        index = self._index
+        labels = host_of(netloc).split(".")
+        for i in range(len(labels)):
+            entry = index.get(".".join(labels[i:]))
+            if entry is not None:
+                return entry
+        return None
+
+    def __len__(self):
+        return len(self._index)
+
+# Singleton instance
+source_registry = None
+
+def get_source_registry() -> SourceRegistry:
+    global source_registry
+    if source_registry is None:
+        source_registry = SourceRegistry(SOURCES_PATH, SOURCES_RELOAD_INTERVAL)
+    return source_registry
@@ -0,0 +1,126 @@
+import unittest
+import asyncio
+import os
+import sys
+
+# Ensure backend can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from backend.admission import AdmissionClass, AdmissionController, Overloaded
+except ImportError:
+    from admission import AdmissionClass, AdmissionController, Overloaded
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestAdmissionClass(unittest.TestCase):
+
+    def test_queued_request_gets_the_released_slot(self):
+        cls = AdmissionClass("text", 1, max_queue=1, queue_timeout=1.0)
+
+        async def run():
+            await cls.acquire()
+            waiter = asyncio.ensure_future(cls.acquire())
+            await asyncio.sleep(0)
+            self.assertEqual(cls.queue_depth, 1)
+            cls.release(0.01)
+            await waiter
+            return cls.stats()
+
+        stats = asyncio.run(run())
+        self.assertEqual((stats["inflight"], stats["queue_depth"]), (1, 0))
+        self.assertEqual((stats["admitted"], stats["queued"]), (1, 1))
+
+    def test_sheds_when_queue_is_full_or_wait_is_too_long(self):
+        cls = AdmissionClass("url", 1, max_queue=1, queue_timeout=0.05)
+
+        async def run():
+            await cls.acquire()
+            waiter = asyncio.ensure_future(cls.acquire())
+            await asyncio.sleep(0)
+            with self.assertRaises(Overloaded) as full:
+                await cls.acquire()
+            with self.assertRaises(Overloaded) as late:
+                await waiter
+            return full.exception, late.exception
+
+        full, late = asyncio.run(run())
+        self.assertEqual((full.reason, late.reason), ("queue full", "queue timeout"))
+        self.assertEqual(full.retry_after, 1)
+        self.assertEqual(cls.stats()["shed"], 2)
+        self.assertEqual((cls.inflight, cls.queue_depth), (1, 0))
+
+    def test_cancelled_waiter_does_not_leak_a_slot(self):
+        cls = AdmissionClass("text", 1, max_queue=2, queue_timeout=1.0)
+
+        async def run():
+            await cls.acquire()
+            waiter = asyncio.ensure_future(cls.acquire())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            await asyncio.gather(waiter, return_exceptions=True)
+            cls.release(0.01)
+
+        asyncio.run(run())
+        self.assertEqual((cls.inflight, cls.queue_depth), (0, 0))
+
+    def test_limit_decreases_above_target_and_grows_when_saturated(self):
+        clock = FakeClock()
+        cls = AdmissionClass("text", 10, min_limit=2, max_limit=12, target_latency=1.0, smoothing=1.0, clock=clock)
+        cls.inflight = 10
+        cls.release(2.0)
+        self.assertEqual(cls.effective_limit, 9)
+        cls.inflight = 10
+        cls.release(2.0)  # within one target interval of the last cut
+        self.assertEqual(cls.effective_limit, 9)
+
+        clock.now += 1.0
+        for _ in range(30):
+            cls.inflight = cls.effective_limit
+            cls.release(2.0)
+            clock.now += 1.0
+        self.assertEqual(cls.effective_limit, 2)
+
+        for _ in range(200):
+            cls.inflight = cls.effective_limit
+            cls.release(0.1)
+        self.assertEqual(cls.effective_limit, 12)
+
+    def test_limit_does_not_grow_without_demand(self):
+        cls = AdmissionClass("text", 4, max_limit=64, target_latency=1.0)
+        for _ in range(100):
+            cls.inflight = 1
+            cls.release(0.1)
+        self.assertEqual(cls.effective_limit, 4)
+
+    def test_works_across_event_loops(self):
+        cls = AdmissionClass("text", 1, max_queue=1, queue_timeout=1.0)
+
+        async def one_request():
+            async with cls.slot():
+                await asyncio.sleep(0)
+
+        asyncio.run(one_request())
+        asyncio.run(one_request())
+        self.assertEqual(cls.stats()["admitted"], 2)
+
+class TestAdmissionController(unittest.TestCase):
+
+    def test_disabled_controller_admits_everything(self):
+        controller = AdmissionController({"text": AdmissionClass("text", 1, max_queue=0)}, enabled=False)
+
+        async def run():
+            async with controller.admit("text"):
+                async with controller.admit("text"):
+                    return True
+
+        self.assertTrue(asyncio.run(run()))
+        self.assertEqual(controller.stats(), {"enabled": False})
+
+if __name__ == '__main__':
+    unittest.main()
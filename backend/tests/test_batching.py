@@ -0,0 +1,73 @@
+import unittest
+import asyncio
+import sys
+import os
+
+# Ensure backend can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from backend.batching import BatchScheduler
+except ImportError:
+    from batching import BatchScheduler
+
+class RecordingModel:
+    def __init__(self):
+        self.calls = []
+
+    def predict_batch(self, texts):
+        self.calls.append(list(texts))
+        return [len(t) / 100.0 for t in texts]
+
+class TestBatchScheduler(unittest.TestCase):
+
+    def test_concurrent_requests_share_one_batch(self):
+        """Requests arriving inside the wait window are scored together."""
+        model = RecordingModel()
+        scheduler = BatchScheduler(model.predict_batch, max_batch_size=8, max_wait_ms=20)
+
+        async def run():
+            return await asyncio.gather(*(scheduler.submit("x" * n) for n in range(1, 6)))
+
+        scores = asyncio.run(run())
+        self.assertEqual(scores, [0.01, 0.02, 0.03, 0.04, 0.05])
+        self.assertEqual(len(model.calls), 1)
+        self.assertEqual(scheduler.stats()["batch_size_histogram"], {"5": 1})
+        self.assertEqual(scheduler.queue_depth, 0)
+
+    def test_full_batch_flushes_without_waiting(self):
+        """A batch is dispatched as soon as it reaches max_batch_size."""
+        model = RecordingModel()
+        scheduler = BatchScheduler(model.predict_batch, max_batch_size=2, max_wait_ms=10000)
+
+        async def run():
+            return await asyncio.wait_for(
+                asyncio.gather(*(scheduler.submit("abc") for _ in range(4))), timeout=2
+            )
+
+        scores = asyncio.run(run())
+        self.assertEqual(len(scores), 4)
+        self.assertEqual([len(c) for c in model.calls], [2, 2])
+
+    def test_model_errors_reach_every_caller(self):
+        def broken(texts):
+            raise RuntimeError("boom")
+
+        scheduler = BatchScheduler(broken, max_batch_size=4, max_wait_ms=1)
+
+        async def run():
+            return await asyncio.gather(scheduler.submit("a"), scheduler.submit("b"), return_exceptions=True)
+
+        results = asyncio.run(run())
+        self.assertTrue(all(isinstance(r, RuntimeError) for r in results))
+        self.assertEqual(scheduler.queue_depth, 0)
+
+    def test_run_batch_bypasses_wait_window(self):
+        model = RecordingModel()
+        scheduler = BatchScheduler(model.predict_batch, max_batch_size=2, max_wait_ms=10000)
+        scores = asyncio.run(scheduler.run_batch(["a", "bb", "ccc"]))
+        self.assertEqual(scores, [0.01, 0.02, 0.03])
+        self.assertEqual(scheduler.stats()["items_total"], 3)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+import unittest
+from unittest.mock import patch
+import asyncio
+import csv
+import json
+import os
+import sys
+import tempfile
+
+# Ensure backend can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from backend.bulk_score import BulkScorer, read_records
+except ImportError:
+    from bulk_score import BulkScorer, read_records
+
+class LengthModel:
+    """Scores by text length; can be told to crash on its Nth call."""
+
+    def __init__(self, crash_on_call=None):
+        self.calls = 0
+        self.crash_on_call = crash_on_call
+
+    def predict_batch(self, texts):
+        self.calls += 1
+        if self.calls == self.crash_on_call:
+            raise RuntimeError("simulated crash")
+        return [min(1.0, len(t) / 100.0) for t in texts]
+
+def read_output(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f]
+
+class TestBulkScore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.records = [{"id": i, "text": "story " * (i % 7 + 1)} for i in range(23)]
+        self.records[5]["text"] = ""
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def path(self, name):
+        return os.path.join(self.tmp.name, name)
+
+    def write_jsonl(self, name):
+        with open(self.path(name), "w") as f:
+            for record in self.records:
+                f.write(json.dumps(record) + "\n")
+        return self.path(name)
+
+    def test_jsonl_in_order_with_throughput(self):
+        src = self.write_jsonl("in.jsonl")
+        stats = asyncio.run(BulkScorer(LengthModel(), batch_size=4).run(src, self.path("out.jsonl")))
+        out = read_output(self.path("out.jsonl"))
+        self.assertEqual([r["id"] for r in out], list(range(23)))
+        self.assertIn("error", out[5])
+        self.assertAlmostEqual(out[0]["lstm_score"], len("story ") / 100.0)
+        self.assertEqual(out[0]["verdict"], "Likely Fake News")
+        self.assertEqual(stats["items"], 23)
+        self.assertGreater(stats["items_per_sec"], 0)
+        self.assertFalse(os.path.exists(self.path("out.jsonl.checkpoint")))
+
+    def test_resumes_after_crash_without_duplicates(self):
+        src = self.write_jsonl("in.jsonl")
+        with self.assertRaises(RuntimeError):
+            asyncio.run(BulkScorer(LengthModel(crash_on_call=3), batch_size=4).run(src, self.path("out.jsonl")))
+        self.assertEqual(len(read_output(self.path("out.jsonl"))), 8)
+        # Simulate a partially written batch before the crash
+        with open(self.path("out.jsonl"), "a") as f:
+            f.write('{"id": 8, "partial"')
+
+        stats = asyncio.run(BulkScorer(LengthModel(), batch_size=4).run(src, self.path("out.jsonl")))
+        self.assertEqual(stats["items"], 15)
+        self.assertEqual(stats["total_items"], 23)
+
+        expected = self.path("expected.jsonl")
+        asyncio.run(BulkScorer(LengthModel(), batch_size=4).run(src, expected))
+        self.assertEqual(read_output(self.path("out.jsonl")), read_output(expected))
+
+    def test_restarts_when_the_output_is_gone_or_truncated(self):
+        src = self.write_jsonl("in.jsonl")
+        expected = self.path("expected.jsonl")
+        asyncio.run(BulkScorer(LengthModel(), batch_size=4).run(src, expected))
+        for damage in (os.remove, lambda path: os.truncate(path, 10)):
+            with self.assertRaises(RuntimeError):
+                asyncio.run(BulkScorer(LengthModel(crash_on_call=3), batch_size=4).run(src, self.path("out.jsonl")))
+            damage(self.path("out.jsonl"))
+            stats = asyncio.run(BulkScorer(LengthModel(), batch_size=4).run(src, self.path("out.jsonl")))
+            self.assertEqual(stats["total_items"], 23)
+            with open(self.path("out.jsonl"), "rb") as f:
+                self.assertNotIn(b"\0", f.read())
+            self.assertEqual(read_output(self.path("out.jsonl")), read_output(expected))
+            os.remove(self.path("out.jsonl"))
+
+    def test_csv_offsets_with_multiline_fields(self):
+        src = self.path("in.csv")
+        with open(src, "w", newline="") as f:
+            writer = csv.writer(f)
+            writer.writerow(["id", "text"])
+            writer.writerow(["a", "line one\nline two"])
+            writer.writerow(["b", "plain"])
+        with open(src, "rb") as f:
+            rows = list(read_records(f, "csv"))
+        self.assertEqual([r["text"] for r, _ in rows], ["line one\nline two", "plain"])
+        with open(src, "rb") as f:
+            resumed = list(read_records(f, "csv", start=rows[0][1]))
+        self.assertEqual([r["id"] for r, _ in resumed], ["b"])
+
+    def test_unreadable_records_become_errors_and_the_run_goes_on(self):
+        src = self.path("in.jsonl")
+        with open(src, "wb") as f:
+            f.write(b'{"id": 1, "text": "fine story"}\n')
+            f.write(b'{"id": 2, "text": "cut off\n')
+            f.write(b'{"id": 3, "text": "bad \xff byte"}\n')
+            f.write(b'[4]\n')
+            f.write(b'{"id": 5, "text": "also fine"}\n')
+        asyncio.run(BulkScorer(LengthModel(), batch_size=2).run(src, self.path("out.jsonl")))
+        out = read_output(self.path("out.jsonl"))
+        self.assertEqual([r["id"] for r in out], [1, None, None, None, 5])
+        self.assertEqual(["error" in r for r in out], [False, True, True, True, False])
+        self.assertIn("at byte 32", out[1]["error"])
+
+        with open(src, "rb") as f:
+            rows = list(read_records(f, "jsonl"))
+        with open(src, "rb") as f:
+            resumed = list(read_records(f, "jsonl", start=rows[1][1]))
+        self.assertEqual(len(resumed), 3)
+        self.assertEqual(resumed[-1][0]["id"], 5)
+
+    def test_csv_row_with_invalid_utf8_keeps_its_id(self):
+        src = self.path("in.csv")
+        with open(src, "wb") as f:
+            f.write(b"id,text\r\na,caf\xe9\r\nb,plain\r\n")
+        asyncio.run(BulkScorer(LengthModel()).run(src, self.path("out.jsonl")))
+        out = read_output(self.path("out.jsonl"))
+        self.assertEqual([r["id"] for r in out], ["a", "b"])
+        self.assertEqual(out[0]["error"], "Invalid UTF-8 at byte 14")
+        self.assertNotIn("error", out[1])
+
+    def test_verification_runs_with_bounded_concurrency(self):
+        active = {"now": 0, "max": 0}
+
+        async def fake_verify(text):
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+            await asyncio.sleep(0.01)
+            active["now"] -= 1
+            return 0.9, [{"name": "www.bbc.com", "url": "https://www.bbc.com/x", "trustScore": 1.0}]
+
+        src = self.write_jsonl("in.jsonl")
+        with patch("backend.verify.verify_news", side_effect=fake_verify):
+            asyncio.run(BulkScorer(LengthModel(), batch_size=10, verify=True, verify_concurrency=3)
+                        .run(src, self.path("out.jsonl")))
+        out = read_output(self.path("out.jsonl"))
+        self.assertLessEqual(active["max"], 3)
+        self.assertEqual(out[1]["verification_score"], 0.9)
+        self.assertFalse(out[1]["degraded"])
+
+    def test_near_duplicates_reuse_only_cacheable_verifications(self):
+        try:
+            from backend.near_dup import NearDuplicateIndex
+        except ImportError:
+            from near_dup import NearDuplicateIndex
+
+        story = " ".join(f"word{i % 97} token{i % 13}" for i in range(300))
+        self.records = [{"id": i, "text": story} for i in range(3)]
+        src = self.write_jsonl("in.jsonl")
+        found = (0.9, [{"name": "bbc.com", "url": "https://www.bbc.com/x", "trustScore": 1.0}])
+        for verification, searches in (((0.5, []), 3), (found, 1)):
+            calls = []
+
+            async def fake_verify(text):
+                calls.append(text)
+                return verification
+
+            with patch("backend.verify.verify_news", side_effect=fake_verify), \
+                 patch("backend.verify.get_near_duplicate_index", return_value=NearDuplicateIndex()):
+                asyncio.run(BulkScorer(LengthModel(), batch_size=1, verify=True).run(src, self.path("out.jsonl")))
+            # A 0.5 without matches means the search failed; it is never reused
+            self.assertEqual(len(calls), searches)
+
+if __name__ == "__main__":
+    unittest.main()
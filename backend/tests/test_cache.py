@@ -0,0 +1,119 @@
+import unittest
+import os
+import sys
+import tempfile
+
+# Ensure backend can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from backend.cache import MemoryCacheBackend, SQLiteCacheBackend, ResultCache, model_version, text_key
+except ImportError:
+    from cache import MemoryCacheBackend, SQLiteCacheBackend, ResultCache, model_version, text_key
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class TestResultCache(unittest.TestCase):
+
+    def test_key_ignores_case_and_whitespace(self):
+        self.assertEqual(text_key("Breaking  News\n today"), text_key("breaking news today"))
+        self.assertNotEqual(text_key("breaking news"), text_key("breaking views"))
+
+    def test_separate_ttls_per_part(self):
+        clock = FakeClock()
+        cache = ResultCache(MemoryCacheBackend(10_000, clock), model_ttl=100, verification_ttl=10)
+        cache.set_model_score("story", 0.8)
+        cache.set_verification("story", 0.9, [{"name": "bbc.com", "url": "http://bbc.com", "trustScore": 1.0}])
+
+        clock.now += 50
+        self.assertEqual(cache.get_model_score("story"), 0.8)
+        self.assertIsNone(cache.get_verification("story"))
+
+        stats = cache.stats()
+        self.assertEqual(stats["model"]["hits"], 1)
+        self.assertEqual(stats["verification"]["misses"], 1)
+
+    def test_article_text_is_cached_per_url(self):
+        clock = FakeClock()
+        cache = ResultCache(MemoryCacheBackend(10_000, clock), model_ttl=100, verification_ttl=10, article_ttl=30)
+        cache.set_article("https://example.com/story", "Article body")
+        self.assertEqual(cache.get_article("https://example.com/story"), "Article body")
+        self.assertIsNone(cache.get_article("https://example.com/other"))
+
+        # Scheme and host are case-insensitive, path and query are not
+        self.assertEqual(cache.get_article("HTTPS://Example.com/story#top"), "Article body")
+        cache.set_article("https://example.com/Story?id=A", "Other article")
+        self.assertIsNone(cache.get_article("https://example.com/story?id=a"))
+        self.assertEqual(cache.get_article("https://example.com/story"), "Article body")
+
+        clock.now += 31
+        self.assertIsNone(cache.get_article("https://example.com/story"))
+        self.assertEqual(cache.stats()["article"], {"hits": 3, "misses": 3, "hit_ratio": 0.5})
+
+    def test_model_version_tracks_backend_and_weight_files(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            model_path = os.path.join(tmp, "model.keras")
+            export_dir = os.path.join(tmp, "export")
+            os.mkdir(export_dir)
+            for path in (model_path, os.path.join(export_dir, "embedding.npy")):
+                with open(path, "wb") as f:
+                    f.write(b"v1")
+            keras = model_version("keras", model_path, export_dir)
+            numpy = model_version("numpy", model_path, export_dir)
+            self.assertNotEqual(keras, numpy)
+            # A re-export changes the NumPy version only
+            with open(os.path.join(export_dir, "embedding.npy"), "wb") as f:
+                f.write(b"v22")
+            self.assertEqual(model_version("keras", model_path, export_dir), keras)
+            self.assertNotEqual(model_version("numpy", model_path, export_dir), numpy)
+
+    def test_importable_from_inside_backend(self):
+        """`python backend/main.py` runs with backend/ as the import root, which uses the fallback imports."""
+        import subprocess
+        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        out = subprocess.run(
+            [sys.executable, "-c", "import cache; print(type(cache.get_result_cache()).__name__)"],
+            cwd=backend_dir, capture_output=True, text=True, check=True,
+            env={**os.environ, "FND_CACHE_BACKEND": "memory"},
+        )
+        self.assertEqual(out.stdout.strip(), "ResultCache")
+
+    def test_memory_backend_evicts_least_recently_used(self):
+        backend = MemoryCacheBackend(max_bytes=45)
+        backend.set("a", {"v": "x" * 10}, ttl=100)
+        backend.set("b", {"v": "y" * 10}, ttl=100)
+        backend.get("a")  # a is now more recent than b
+        backend.set("c", {"v": "z" * 10}, ttl=100)
+
+        self.assertIsNotNone(backend.get("a"))
+        self.assertIsNone(backend.get("b"))
+        self.assertIsNotNone(backend.get("c"))
+        self.assertLessEqual(backend.stats()["bytes"], 45)
+
+    def test_sqlite_backend_is_shared_and_capped(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.sqlite3")
+            clock = FakeClock()
+            writer = SQLiteCacheBackend(path, max_bytes=45, clock=clock)
+            reader = SQLiteCacheBackend(path, max_bytes=45, clock=clock)
+
+            writer.set("a", {"v": "x" * 10}, ttl=100)
+            self.assertEqual(reader.get("a"), {"v": "x" * 10})
+
+            clock.now += 1
+            writer.set("b", {"v": "y" * 10}, ttl=100)
+            clock.now += 1
+            writer.set("c", {"v": "z" * 10}, ttl=100)
+            self.assertIsNone(reader.get("a"))
+            self.assertIsNotNone(reader.get("c"))
+
+            clock.now += 200
+            self.assertIsNone(reader.get("c"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,58 @@
+import unittest
+import os
+import sys
+
+# Ensure backend can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from backend.chunking import chunk_text, aggregate_scores, split_documents, combine_scores
+except ImportError:
+    from chunking import chunk_text, aggregate_scores, split_documents, combine_scores
+
+def words(n):
+    return " ".join(f"w{i}" for i in range(n))
+
+class TestChunkText(unittest.TestCase):
+
+    def test_short_text_is_one_chunk(self):
+        text = "Short  news\nstory"
+        self.assertEqual(chunk_text(text, window_words=10), [(text, 3)])
+
+    def test_windows_overlap_and_cover_the_end(self):
+        chunks = chunk_text(words(25), window_words=10, overlap_words=5, max_chunks=10)
+        starts = [int(c.split()[0][1:]) for c, _ in chunks]
+        self.assertEqual(starts, [0, 5, 10, 15])
+        self.assertTrue(chunks[-1][0].endswith("w24"))
+        self.assertTrue(all(n == 10 for _, n in chunks))
+
+    def test_caps_chunks_keeping_first_and_last(self):
+        chunks = chunk_text(words(1000), window_words=10, overlap_words=0, max_chunks=4)
+        self.assertEqual(len(chunks), 4)
+        self.assertTrue(chunks[0][0].startswith("w0 "))
+        self.assertTrue(chunks[-1][0].endswith("w999"))
+
+    def test_cap_of_one_keeps_only_the_first_window(self):
+        for cap in (1, 0):
+            chunks = chunk_text(words(1000), window_words=10, overlap_words=0, max_chunks=cap)
+            self.assertEqual([n for _, n in chunks], [10])
+            self.assertTrue(chunks[0][0].startswith("w0 "))
+
+class TestAggregation(unittest.TestCase):
+
+    def test_methods(self):
+        scores, lengths = [0.9, 0.3], [30, 10]
+        self.assertAlmostEqual(aggregate_scores(scores, lengths, "mean"), 0.6)
+        self.assertAlmostEqual(aggregate_scores(scores, lengths, "max_fake"), 0.3)
+        self.assertAlmostEqual(aggregate_scores(scores, lengths, "length_weighted"), 0.75)
+
+    def test_split_and_combine_round_trip(self):
+        flat, spans = split_documents(["one", words(25)], window_words=10, overlap_words=0, max_chunks=10)
+        self.assertEqual(len(flat), 1 + 3)
+        scores = [0.2, 0.4, 0.6, 0.8]
+        combined = combine_scores(scores, spans, "mean")
+        self.assertAlmostEqual(combined[0], 0.2)
+        self.assertAlmostEqual(combined[1], 0.6)
+
+if __name__ == "__main__":
+    unittest.main()
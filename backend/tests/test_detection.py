@@ -8,10 +8,10 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 try:
-    from backend.main import calculate_verdict
+    from backend.main import calculate_verdict, calculate_verdicts
     from backend.verify import analyze_snippet
 except ImportError:
-    from main import calculate_verdict
+    from main import calculate_verdict, calculate_verdicts
     from verify import analyze_snippet
 
 class TestDetectionQuality(unittest.TestCase):
@@ -58,5 +58,37 @@ class TestDetectionQuality(unittest.TestCase):
         
         self.assertEqual(verdict, "Inconclusive / Mixed Evidence")
 
+    def test_vectorized_verdicts_bands(self):
+        """The array path applies the same weight bands and thresholds per item."""
+        lstm_scores = [0.52, 0.48, 0.5, 0.9]
+        verification_scores = [0.2, 0.9, 0.5, 0.36]
+        final_scores, verdicts, is_real = calculate_verdicts(lstm_scores, verification_scores)
+
+        expected = [0.2 * 0.52 + 0.8 * 0.2, 0.3 * 0.48 + 0.7 * 0.9, 0.4 * 0.5 + 0.6 * 0.5, 0.4 * 0.9 + 0.6 * 0.36]
+        for got, want in zip(final_scores, expected):
+            self.assertAlmostEqual(got, want)
+        self.assertEqual(list(verdicts), [
+            "Likely Fake News", "Likely Real News", "Inconclusive / Mixed Evidence", "Inconclusive / Mixed Evidence"
+        ])
+        self.assertEqual(list(is_real), [False, True, True, True])
+        self.assertEqual(calculate_verdict(0.52, 0.2)[1], verdicts[0])
+
+    def test_scoring_logic_does_not_import_tensorflow(self):
+        """Verdict and verification code must stay importable without TensorFlow."""
+        import subprocess
+        backend_dir = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        out = subprocess.run(
+            [sys.executable, "-c", "import sys, main, verify; print('tensorflow' in sys.modules)"],
+            cwd=backend_dir, capture_output=True, text=True, check=True,
+        )
+        self.assertEqual(out.stdout.strip(), "False")
+
+    def test_verdict_model_only(self):
+        """Without a verification score the verdict follows the LSTM alone."""
+        final_score, verdict, is_real = calculate_verdict(0.8, None)
+        self.assertAlmostEqual(final_score, 0.8)
+        self.assertEqual(verdict, "Likely Real News")
+        self.assertTrue(is_real)
+
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,133 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+# Ensure backend can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from backend.evidence_index import EvidenceIndex, OfflineSearchProvider, best_snippet, read_corpus
+    from backend import verify
+except ImportError:
+    from evidence_index import EvidenceIndex, OfflineSearchProvider, best_snippet, read_corpus
+    import verify
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def doc(link, title, text):
+    return {"link": link, "title": title, "text": text}
+
+CORPUS = [
+    doc("https://www.reuters.com/markets/rates", "Central bank raises interest rates",
+        "The central bank raised interest rates by a quarter point on Tuesday. "
+        "Officials said inflation remained too high. Markets had expected the move."),
+    doc("https://www.bbc.com/news/storm", "Storm hits the coast",
+        "A powerful storm made landfall overnight. Thousands of homes lost power."),
+    doc("https://www.snopes.com/fact-check/vaccine-chip", "Fact Check: Vaccines do not contain microchips",
+        "Claims that vaccines contain tracking microchips are false. "
+        "No vaccine contains a microchip, according to regulators."),
+]
+
+class TestEvidenceIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.clock = FakeClock()
+        self.index = EvidenceIndex(self.dir.name, reload_interval=5.0, clock=self.clock)
+
+    def test_empty_index_returns_nothing(self):
+        self.assertEqual(self.index.search("interest rates"), [])
+        self.assertEqual(self.index.stats()["documents"], 0)
+
+    def test_ranks_the_matching_article_first(self):
+        self.index.add_documents(CORPUS)
+        items = self.index.search("central bank interest rates inflation")
+        self.assertEqual(items[0]["link"], "https://www.reuters.com/markets/rates")
+        self.assertEqual(set(items[0]), {"link", "title", "snippet", "score"})
+        self.assertIn("interest rates", items[0]["snippet"])
+
+    def test_min_match_filters_unrelated_articles(self):
+        self.index.add_documents(CORPUS)
+        self.assertEqual(self.index.search("storm interest rates inflation bank", min_match=0.5)[0]["link"],
+                         "https://www.reuters.com/markets/rates")
+        links = [i["link"] for i in self.index.search("storm interest rates inflation bank", min_match=0.8)]
+        self.assertEqual(links, ["https://www.reuters.com/markets/rates"])
+        self.assertEqual(self.index.search("completely unrelated gardening tips"), [])
+
+    def test_newer_segment_supersedes_a_url(self):
+        self.index.add_documents(CORPUS)
+        self.index.add_documents([doc("https://www.bbc.com/news/storm", "Storm update",
+                                      "The storm weakened before reaching the capital.")])
+        self.assertEqual(self.index.stats(), {"path": self.dir.name, "segments": 2, "documents": 3})
+        items = self.index.search("storm")
+        self.assertEqual([i["title"] for i in items], ["Storm update"])
+
+    def test_compact_merges_segments_and_keeps_results(self):
+        for d in CORPUS:
+            self.index.add_documents([d])
+        before = self.index.search("vaccines microchips")
+        self.assertEqual(self.index.compact(), 3)
+        self.assertEqual(self.index.stats()["segments"], 1)
+        self.assertEqual(len(os.listdir(self.dir.name)), 2)  # manifest and one segment
+        after = self.index.search("vaccines microchips")
+        self.assertEqual([(i["link"], i["score"]) for i in after], [(i["link"], i["score"]) for i in before])
+
+    def test_reader_picks_up_segments_from_another_writer(self):
+        self.index.add_documents(CORPUS[:1])
+        writer = EvidenceIndex(self.dir.name)
+        writer.add_documents(CORPUS[1:])
+        self.assertEqual(self.index.search("storm"), [])  # within the reload interval
+        self.clock.now += 5.0
+        self.assertEqual(self.index.search("storm")[0]["link"], "https://www.bbc.com/news/storm")
+
+    def test_best_snippet_picks_the_matching_sentences(self):
+        text = "Nothing here. Still nothing. The storm hit the coast. Power was lost. Unrelated ending."
+        self.assertEqual(best_snippet(text, ["storm", "power"]), "The storm hit the coast. Power was lost.")
+
+    def test_read_corpus_accepts_search_item_fields(self):
+        path = os.path.join(self.dir.name, "corpus.jsonl")
+        with open(path, "w") as f:
+            f.write(json.dumps({"url": "https://a.example/1", "title": "A", "text": "alpha"}) + "\n\n")
+            f.write(json.dumps({"link": "https://b.example/2", "title": "B", "snippet": "beta"}) + "\n")
+        self.assertEqual([d["link"] for d in read_corpus(path)], ["https://a.example/1", "https://b.example/2"])
+        self.assertEqual([d["text"] for d in read_corpus(path)], ["alpha", "beta"])
+
+class TestOfflineProvider(unittest.TestCase):
+
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.dir.cleanup)
+        self.index = EvidenceIndex(self.dir.name)
+
+    def test_unavailable_until_documents_are_indexed(self):
+        provider = OfflineSearchProvider(self.index)
+        self.assertFalse(provider.available())
+        self.index.add_documents(CORPUS)
+        self.assertTrue(provider.available())
+
+    def test_verifies_against_trusted_sources_without_network(self):
+        self.index.add_documents(CORPUS)
+        engine = verify.VerificationEngine(OfflineSearchProvider(self.index))
+        score, matches = asyncio.run(engine.verify(
+            "The central bank raised interest rates again as inflation stayed high, officials said."
+        ))
+        self.assertGreater(score, 0.5)
+        self.assertIn("https://www.reuters.com/markets/rates", [m["url"] for m in matches])
+
+    def test_fact_check_lowers_the_score(self):
+        self.index.add_documents(CORPUS)
+        engine = verify.VerificationEngine(OfflineSearchProvider(self.index))
+        score, _ = asyncio.run(engine.verify("Vaccines contain tracking microchips, claims a viral post."))
+        self.assertLess(score, 0.5)
+
+if __name__ == '__main__':
+    unittest.main()
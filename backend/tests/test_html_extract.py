@@ -0,0 +1,49 @@
+import unittest
+import os
+import sys
+
+# Ensure backend can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from backend.html_extract import ArticleTextParser, extract_article_text, sniff_charset
+except ImportError:
+    from html_extract import ArticleTextParser, extract_article_text, sniff_charset
+
+STORY = "The council approved the new bridge after a two year review of costs and safety. " * 4
+
+PAGE = f"""<html><head><title>Bridge &amp; roads</title><style>p {{ color: red }}</style></head>
+<body><header>Site name</header><nav><a>Home</a> | <a>World</a></nav>
+<div class="promo">Subscribe now for unlimited access</div>
+<article><h1>Bridge approved</h1><p>{STORY}<p>Construction starts in May.</article>
+<aside><p>Related: ten other bridges you should see</p></aside>
+<footer><p>Copyright 2024</p></footer><script>track();</script></body></html>"""
+
+class TestArticleTextParser(unittest.TestCase):
+
+    def test_prefers_article_prose(self):
+        text = extract_article_text(PAGE)
+        title, body = text.split("\n\n", 1)
+        self.assertEqual(title, "Bridge & roads")
+        self.assertEqual(body.splitlines(), ["Bridge approved", STORY.strip(), "Construction starts in May."])
+
+    def test_falls_back_to_visible_text_without_prose(self):
+        text = extract_article_text("<html><body><nav>Menu</nav><div>Short notice</div><div>Second line</div></body></html>")
+        self.assertEqual(text.strip(), "Short notice\nSecond line")
+
+    def test_chunked_feed_and_early_stop(self):
+        parser = ArticleTextParser(target_chars=300)
+        for i in range(0, len(PAGE), 7):
+            parser.feed(PAGE[i:i + 7])
+            if parser.done:
+                break
+        self.assertTrue(parser.done)
+        self.assertIn("Bridge approved", parser.text())
+        self.assertNotIn("Copyright", parser.text())
+
+    def test_sniff_charset(self):
+        self.assertEqual(sniff_charset(b'<html><head><meta charset="windows-1252">'), "windows-1252")
+        self.assertIsNone(sniff_charset(b"<html><head><title>x</title>"))
+
+if __name__ == "__main__":
+    unittest.main()
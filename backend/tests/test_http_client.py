@@ -0,0 +1,153 @@
+import unittest
+from unittest.mock import patch
+import asyncio
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Ensure backend can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from backend import utils, verify
+    from backend.http_client import AsyncHttpClient
+    from backend.search_cache import SearchQueryCache, SearchQuotaLimiter
+except ImportError:
+    import utils
+    import verify
+    from http_client import AsyncHttpClient
+    from search_cache import SearchQueryCache, SearchQuotaLimiter
+
+ARTICLE = b"""<html><head><title>Dam opens</title><script>var x = 1;</script></head>
+<body><nav>Home | World</nav><p>The new dam opened on Monday, officials said.</p></body></html>"""
+
+SEARCH_RESULTS = {"items": [
+    {"link": "https://www.reuters.com/world/dam", "title": "Dam opens", "snippet": "The dam opened on Monday."},
+    {"link": "https://randomblog.example/dam", "title": "Dam", "snippet": "Unrelated"},
+]}
+
+class StubHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            server.hits[self.path.split("?")[0]] = server.hits.get(self.path.split("?")[0], 0) + 1
+            server.active += 1
+            server.max_active = max(server.max_active, server.active)
+            hits = server.hits[self.path.split("?")[0]]
+        try:
+            if self.path.startswith("/flaky") and hits <= 2:
+                self._send(503, b"try again", "text/plain")
+            elif self.path.startswith("/slow"):
+                time.sleep(0.3)
+                self._send(200, b"late", "text/plain")
+            elif self.path.startswith("/data.json"):
+                self._send(200, b'{"not": "html"}', "application/json")
+            elif self.path.startswith("/huge"):
+                filler = b"<p>" + b"More text in a very long page. " * 40 + b"</p>"
+                self._send(200, b"<html><body><article>" + filler * 2000 + b"</article></body></html>", "text/html")
+            elif self.path.startswith("/search"):
+                self._send(200, json.dumps(SEARCH_RESULTS).encode(), "application/json")
+            else:
+                time.sleep(0.05)
+                self._send(200, ARTICLE, "text/html")
+        finally:
+            with server.lock:
+                server.active -= 1
+
+    def _send(self, status, body, content_type):
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+class TestAsyncHttpClient(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = ThreadingHTTPServer(("127.0.0.1", 0), StubHandler)
+        cls.server.lock = threading.Lock()
+        cls.server.hits = {}
+        cls.server.active = 0
+        cls.server.max_active = 0
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+        cls.base = f"http://127.0.0.1:{cls.server.server_address[1]}"
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def setUp(self):
+        with self.server.lock:
+            self.server.hits = {}
+            self.server.max_active = 0
+
+    def test_retries_transient_errors(self):
+        client = AsyncHttpClient(retries=2, backoff=0.01)
+        response = asyncio.run(client.request("GET", f"{self.base}/flaky"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.server.hits["/flaky"], 3)
+
+    def test_gives_up_after_bounded_retries(self):
+        client = AsyncHttpClient(retries=1, backoff=0.01)
+        response = asyncio.run(client.request("GET", f"{self.base}/flaky"))
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(self.server.hits["/flaky"], 2)
+
+    def test_timeout_is_enforced(self):
+        client = AsyncHttpClient(retries=0)
+        with self.assertRaises(Exception):
+            asyncio.run(client.request("GET", f"{self.base}/slow", timeout=0.05))
+
+    def test_per_host_concurrency_limit(self):
+        client = AsyncHttpClient(per_host_limit=2)
+
+        async def run():
+            await asyncio.gather(*(client.request("GET", f"{self.base}/article") for _ in range(6)))
+
+        asyncio.run(run())
+        self.assertLessEqual(self.server.max_active, 2)
+        self.assertEqual(self.server.hits["/article"], 6)
+
+    def test_extract_text_from_url(self):
+        with patch.object(utils, "get_http_client", return_value=AsyncHttpClient()):
+            text = asyncio.run(utils.extract_text_from_url(f"{self.base}/article"))
+        self.assertTrue(text.startswith("Dam opens"))
+        self.assertIn("The new dam opened on Monday", text)
+        self.assertNotIn("var x", text)
+        self.assertNotIn("Home | World", text)
+
+    def test_extract_rejects_non_html(self):
+        with patch.object(utils, "get_http_client", return_value=AsyncHttpClient()):
+            self.assertEqual(asyncio.run(utils.extract_text_from_url(f"{self.base}/data.json")), "")
+
+    def test_extract_stops_early_on_large_pages(self):
+        with patch.object(utils, "get_http_client", return_value=AsyncHttpClient()), \
+             patch.object(utils, "EXTRACT_MAX_BYTES", 100_000), \
+             patch.object(utils, "EXTRACT_TARGET_CHARS", 3000):
+            text = asyncio.run(utils.extract_text_from_url(f"{self.base}/huge"))
+        self.assertIn("More text in a very long page.", text)
+        # Stops within one parse slice of the target instead of reading ~100 KB
+        self.assertLess(len(text), 3000 + utils.FEED_SLICE_CHARS)
+
+    def test_verify_news_against_stub_search(self):
+        with patch.object(verify, "GOOGLE_API_KEY", "key"), \
+             patch.object(verify, "GOOGLE_CSE_ID", "cx"), \
+             patch.object(verify, "SEARCH_URL", f"{self.base}/search"), \
+             patch.object(verify, "get_search_cache", return_value=SearchQueryCache(":memory:", ttl=60)), \
+             patch.object(verify, "get_search_limiter", return_value=SearchQuotaLimiter(60, 10, 0)), \
+             patch.object(verify, "get_http_client", return_value=AsyncHttpClient()):
+            score, matches = asyncio.run(verify.verify_news("The new dam opened on Monday near the river"))
+        self.assertEqual([m["name"] for m in matches], ["www.reuters.com"])
+        self.assertGreater(score, 0.5)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,95 @@
+import unittest
+import importlib.util
+import os
+import sys
+import tempfile
+
+import numpy as np
+
+# Ensure backend can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from backend.inference import TextVectorizer, NumpyBackend, export_numpy
+except ImportError:
+    from inference import TextVectorizer, NumpyBackend, export_numpy
+
+HAS_TENSORFLOW = importlib.util.find_spec("tensorflow") is not None
+
+# Max allowed |keras - numpy| score difference
+PARITY_TOLERANCE = 1e-5
+
+SAMPLES = [
+    "The government announced a new tax policy today.",
+    "BREAKING: aliens land at the White House, insiders say!!!",
+    "Completely unseen vocabulary xyzzy plugh",
+    "",
+    "policy " * 40,
+]
+
+class TestTextVectorizer(unittest.TestCase):
+
+    def test_matches_text_vectorization_rules(self):
+        vectorizer = TextVectorizer(["", "[UNK]", "the", "news", "isnt"], sequence_length=5)
+        ids = vectorizer(["The NEWS, isn't... fake!", ""])
+        # lowercased, punctuation stripped, OOV -> 1, padded with 0
+        self.assertEqual(ids.tolist(), [[2, 3, 4, 1, 0], [0, 0, 0, 0, 0]])
+
+    def test_truncates_to_sequence_length(self):
+        vectorizer = TextVectorizer(["", "[UNK]", "a"], sequence_length=3)
+        self.assertEqual(vectorizer(["a a a a a"]).tolist(), [[2, 2, 2]])
+
+@unittest.skipUnless(HAS_TENSORFLOW, "TensorFlow is required for the parity test")
+class TestNumpyBackendParity(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        import tensorflow as tf
+        from tensorflow import keras
+
+        keras.utils.set_random_seed(7)
+        vectorize = keras.layers.TextVectorization(max_tokens=60, output_sequence_length=12)
+        vectorize.adapt(tf.constant(SAMPLES[:2] + ["tax policy news today government"]))
+        inputs = keras.Input(shape=(1,), dtype="string")
+        x = vectorize(inputs)
+        x = keras.layers.Embedding(60, 8, mask_zero=True)(x)
+        x = keras.layers.Bidirectional(keras.layers.LSTM(6))(x)
+        x = keras.layers.Dropout(0.3)(x)
+        x = keras.layers.Dense(5, activation="relu")(x)
+        outputs = keras.layers.Dense(1, activation="sigmoid")(x)
+        cls.keras_model = keras.Model(inputs, outputs)
+
+        cls.tmp = tempfile.TemporaryDirectory()
+        export_numpy(cls.keras_model, cls.tmp.name)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmp.cleanup()
+
+    def test_scores_match_keras(self):
+        import tensorflow as tf
+        expected = np.asarray(self.keras_model(tf.constant([[t] for t in SAMPLES]), training=False)).reshape(-1)
+        actual = NumpyBackend(self.tmp.name).predict_batch(SAMPLES)
+        np.testing.assert_allclose(actual, expected, atol=PARITY_TOLERANCE)
+
+    def test_batch_and_single_scores_agree(self):
+        backend = NumpyBackend(self.tmp.name)
+        batched = backend.predict_batch(SAMPLES)
+        single = [backend.predict_batch([t])[0] for t in SAMPLES]
+        np.testing.assert_allclose(batched, single, atol=1e-6)
+
+    def test_rejects_embedding_without_mask_zero(self):
+        from tensorflow import keras
+
+        inputs = keras.Input(shape=(1,), dtype="string")
+        x = self.keras_model.layers[1](inputs)  # the adapted TextVectorization
+        x = keras.layers.Embedding(60, 8, mask_zero=False)(x)
+        x = keras.layers.Bidirectional(keras.layers.LSTM(6))(x)
+        outputs = keras.layers.Dense(1, activation="sigmoid")(x)
+        with tempfile.TemporaryDirectory() as tmp:
+            with self.assertRaisesRegex(ValueError, "mask_zero"):
+                export_numpy(keras.Model(inputs, outputs), tmp)
+            self.assertEqual(os.listdir(tmp), [])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,7 +1,8 @@
 
 from fastapi.testclient import TestClient
 from backend.main import app
-from unittest.mock import patch
+from unittest.mock import patch, AsyncMock, MagicMock
+import json
 
 client = TestClient(app)
 
@@ -9,6 +10,31 @@ def test_read_root_docs():
     response = client.get("/docs")
     assert response.status_code == 200
 
+def test_healthz():
+    response = client.get("/healthz")
+    assert response.status_code == 200
+    assert response.json()["status"] == "ok"
+
+def test_readyz_waits_for_model():
+    with patch("backend.main.MODEL_STARTUP", "background"), \
+         patch("backend.main.model_status", return_value={"state": "loading", "error": None, "load_seconds": None}):
+        assert client.get("/readyz").status_code == 503
+    with patch("backend.main.MODEL_STARTUP", "background"), \
+         patch("backend.main.model_status", return_value={"state": "ready", "error": None, "load_seconds": 1.2}):
+        assert client.get("/readyz").status_code == 200
+
+def test_eager_startup_loads_model_before_serving(tmp_path):
+    from backend.jobs import JobManager, JobStore
+    from backend.main import _run_url_job
+
+    # Startup starts the job manager; keep its store out of the source tree
+    manager = JobManager(JobStore(str(tmp_path / "jobs.sqlite3"), ttl=60), _run_url_job, workers=1)
+    with patch("backend.main.MODEL_STARTUP", "eager"), patch("backend.main.job_manager", manager), \
+         patch("backend.main.load_and_warm_up") as mock_load:
+        with TestClient(app) as started:
+            mock_load.assert_called_once()
+            assert started.get("/healthz").status_code == 200
+
 def test_predict_text_empty():
     response = client.post("/predict-text", json={"text": ""})
     assert response.status_code == 400
@@ -46,6 +72,301 @@ def test_predict_url_success(mock_extract):
         assert data["verification_score"] == 0.5
         assert data["matched_sources"] == []
 
+def _fake_scheduler(score=0.9):
+    scheduler = MagicMock()
+    scheduler.run_batch = AsyncMock(side_effect=lambda texts: [score] * len(texts))
+    scheduler.submit = AsyncMock(return_value=score)
+    return scheduler
+
+@patch("backend.main.extract_text_from_url")
+def test_predict_batch_mixed_items(mock_extract):
+    mock_extract.side_effect = lambda url: "" if "broken" in url else "Extracted article"
+    scheduler = _fake_scheduler()
+    with patch("backend.main.get_scheduler", return_value=scheduler), \
+         patch("backend.main.verify_news", return_value=(0.8, [])):
+        response = client.post("/predict-batch", json={"items": [
+            {"text": "First article"},
+            {"url": "http://example.com/broken"},
+            {"url": "http://example.com/ok"},
+            {},
+        ]})
+    assert response.status_code == 200
+    results = response.json()["results"]
+    assert [r["index"] for r in results] == [0, 1, 2, 3]
+    assert results[0]["result"]["verdict"] == "Likely Real News"
+    assert results[1]["error"] == "Could not extract text from URL"
+    assert results[2]["result"]["lstm_score"] == 0.9
+    assert results[3]["error"]
+    # All texts went through the model as one batch
+    scheduler.run_batch.assert_called_once()
+    assert scheduler.run_batch.call_args[0][0] == ["First article", "Extracted article"]
+
+def test_predict_batch_stream_ndjson():
+    with patch("backend.main.get_scheduler", return_value=_fake_scheduler(0.2)), \
+         patch("backend.main.verify_news", return_value=(0.2, [])):
+        response = client.post("/predict-batch?stream=true", json={"items": [{"text": "a"}, {"text": "b"}]})
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    lines = [json.loads(line) for line in response.text.splitlines()]
+    assert [line["index"] for line in lines] == [0, 1]
+    assert all(line["result"]["verdict"] == "Likely Fake News" for line in lines)
+
+def test_predict_text_served_from_cache():
+    from backend.cache import MemoryCacheBackend, ResultCache
+    cache = ResultCache(MemoryCacheBackend(1_000_000), model_ttl=60, verification_ttl=60)
+    scheduler = _fake_scheduler(0.9)
+    with patch("backend.main.get_result_cache", return_value=cache), \
+         patch("backend.main.get_scheduler", return_value=scheduler), \
+         patch("backend.main.verify_news", return_value=(0.8, [])) as mock_verify:
+        first = client.post("/predict-text", json={"text": "Viral story about a dam"})
+        second = client.post("/predict-text", json={"text": "viral  story about a DAM"})
+    strip_timings = lambda data: {k: v for k, v in data.items() if k != "timings"}
+    assert strip_timings(first.json()) == strip_timings(second.json())
+    scheduler.submit.assert_called_once()
+    mock_verify.assert_called_once()
+    assert cache.stats()["verification"]["hits"] == 1
+
+def test_model_errors_are_reported_and_never_cached():
+    from backend.model import FakeNewsModel
+    broken = FakeNewsModel.__new__(FakeNewsModel)
+    broken.model = MagicMock(predict_batch=MagicMock(side_effect=RuntimeError("backend crashed")))
+    scheduler = MagicMock()
+    scheduler.submit = AsyncMock(side_effect=lambda text: broken.predict(text))
+    scheduler.run_batch = AsyncMock(side_effect=broken.predict_batch)
+    cache = MagicMock(get=MagicMock(return_value=None), get_model_score=MagicMock(return_value=None),
+                      get_verification=MagicMock(return_value=None))
+    with patch("backend.main.get_result_cache", return_value=cache), \
+         patch("backend.main.get_scheduler", return_value=scheduler), \
+         patch("backend.main.verify_news", return_value=(0.8, [])):
+        single = client.post("/predict-text", json={"text": "Story scored by a broken model"})
+        batch = client.post("/predict-batch", json={"items": [{"text": "Another story"}]})
+    assert single.status_code == 500
+    assert "backend crashed" in single.json()["detail"]
+    assert batch.status_code == 200
+    assert "backend crashed" in batch.json()["results"][0]["error"]
+    cache.set_model_score.assert_not_called()
+
+def test_predict_text_degrades_when_verification_is_late():
+    import asyncio
+
+    async def slow_verify(text):
+        await asyncio.sleep(1)
+        return 0.9, []
+
+    with patch("backend.main.get_scheduler", return_value=_fake_scheduler(0.3)), \
+         patch("backend.main.get_result_cache", return_value=MagicMock(
+             get_model_score=MagicMock(return_value=None), get_verification=MagicMock(return_value=None))), \
+         patch("backend.main.VERIFY_DEADLINE", 0.05), \
+         patch("backend.main.verify_news", side_effect=slow_verify):
+        response = client.post("/predict-text", json={"text": "A claim nobody has reported yet"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["degraded"] is True
+    assert data["final_score"] == 0.3
+    assert data["verdict"] == "Likely Fake News"
+    assert set(data["timings"]) == {"model_ms", "verification_ms", "verdict_ms"}
+
+def test_predict_text_degrades_when_search_quota_is_exhausted():
+    from backend.verify import VerificationUnavailable
+    with patch("backend.main.get_scheduler", return_value=_fake_scheduler(0.8)), \
+         patch("backend.main.get_result_cache", return_value=MagicMock(
+             get_model_score=MagicMock(return_value=None), get_verification=MagicMock(return_value=None))), \
+         patch("backend.main.verify_news", side_effect=VerificationUnavailable("Search quota exhausted")):
+        response = client.post("/predict-text", json={"text": "Story checked after the quota ran out"})
+    assert response.status_code == 200
+    data = response.json()
+    assert data["degraded"] is True
+    assert data["verification_score"] == 0.5
+    assert data["final_score"] == 0.8
+
+def test_near_duplicate_reuses_verification():
+    from backend.near_dup import NearDuplicateIndex
+
+    story = " ".join(f"word{i % 97} token{i % 13}" for i in range(300))
+    copy = "Republished: " + story.replace("word5 ", "changed ", 1)
+    verify = AsyncMock(return_value=(0.9, [{"name": "reuters.com", "url": "https://reuters.com/a", "trustScore": 1.0}]))
+    with patch("backend.main.get_scheduler", return_value=_fake_scheduler(0.4)), \
+         patch("backend.main.get_result_cache", return_value=MagicMock(
+             get_model_score=MagicMock(return_value=None), get_verification=MagicMock(return_value=None))), \
+         patch("backend.verify.get_near_duplicate_index", return_value=NearDuplicateIndex()), \
+         patch("backend.main.verify_news", verify):
+        first = client.post("/predict-text", json={"text": story}).json()
+        second = client.post("/predict-text", json={"text": copy}).json()
+    verify.assert_awaited_once()
+    assert second["verification_score"] == first["verification_score"] == 0.9
+    assert second["matched_sources"][0]["name"] == "reuters.com"
+
+def test_predict_text_backpressure_returns_429():
+    from backend.worker_pool import PoolSaturatedError
+    scheduler = _fake_scheduler()
+    scheduler.submit = AsyncMock(side_effect=PoolSaturatedError(3))
+    with patch("backend.main.get_scheduler", return_value=scheduler), \
+         patch("backend.main.verify_news", return_value=(0.8, [])):
+        response = client.post("/predict-text", json={"text": "Queue is full right now"})
+    assert response.status_code == 429
+    assert response.headers["retry-after"] == "3"
+
+def test_predict_text_long_article_is_chunked():
+    scheduler = _fake_scheduler()
+    scheduler.run_batch = AsyncMock(side_effect=lambda texts: [0.2] + [0.8] * (len(texts) - 1))
+    long_text = " ".join(f"word{i}" for i in range(600))
+    with patch("backend.main.get_scheduler", return_value=scheduler), \
+         patch("backend.main.get_result_cache", return_value=MagicMock(
+             get_model_score=MagicMock(return_value=None), get_verification=MagicMock(return_value=None))), \
+         patch("backend.main.verify_news", return_value=(0.5, [])):
+        response = client.post("/predict-text", json={"text": long_text})
+    assert response.status_code == 200
+    windows = scheduler.run_batch.call_args[0][0]
+    assert len(windows) > 1
+    scheduler.submit.assert_not_called()
+    # Default aggregation is the mean of the window scores
+    assert abs(response.json()["lstm_score"] - (0.2 + 0.8 * (len(windows) - 1)) / len(windows)) < 1e-6
+
+@patch("backend.main.extract_text_from_url")
+def test_predict_url_reports_stage_timings(mock_extract):
+    mock_extract.return_value = "Extracted content from URL"
+    with patch("backend.main.get_scheduler", return_value=_fake_scheduler()), \
+         patch("backend.main.get_result_cache", return_value=MagicMock(
+             get_model_score=MagicMock(return_value=None), get_verification=MagicMock(return_value=None),
+             get_article=MagicMock(return_value=None))), \
+         patch("backend.verify.GOOGLE_API_KEY", "key"), patch("backend.verify.GOOGLE_CSE_ID", "cx"), \
+         patch("backend.verify.search_items", AsyncMock(return_value=[])):
+        response = client.post("/predict-url", json={"url": "http://example.com/news"})
+    assert response.status_code == 200
+    assert {"fetch_ms", "model_ms", "keywords_ms", "search_ms", "verification_ms", "verdict_ms"} <= set(
+        response.json()["timings"])
+
+def test_metrics_endpoint_exposes_request_and_stage_histograms():
+    with patch("backend.main.get_scheduler", return_value=_fake_scheduler()), \
+         patch("backend.main.get_result_cache", return_value=MagicMock(
+             get_model_score=MagicMock(return_value=None), get_verification=MagicMock(return_value=None))), \
+         patch("backend.main.verify_news", AsyncMock(return_value=(0.9, []))):
+        response = client.post("/predict-text", json={"text": "Metrics test article"})
+    assert response.status_code == 200
+    assert len(response.headers["x-trace-id"]) == 16
+
+    metrics = client.get("/metrics")
+    assert metrics.status_code == 200
+    assert metrics.headers["content-type"].startswith("text/plain; version=0.0.4")
+    body = metrics.text
+    assert 'fnd_http_requests_total{route="/predict-text",status="200"}' in body
+    assert 'fnd_stage_seconds_count{stage="model"}' in body
+    assert 'fnd_verification_seconds_bucket{outcome="ok",le="+Inf"}' in body
+
+def test_metrics_scrape_does_not_open_stores():
+    with patch("backend.search_cache.search_limiter", None), patch("backend.search_cache.search_cache", None), \
+         patch("backend.main.job_manager", None):
+        body = client.get("/metrics").text
+        import backend.main, backend.search_cache
+        assert backend.search_cache.search_cache is None and backend.main.job_manager is None
+    assert "fnd_search_used_today 0" in body
+    assert "fnd_job_queue_depth 0" in body
+
+def test_jobs_run_in_background_and_stream_events(tmp_path):
+    from backend.jobs import JobManager, JobStore
+    from backend.main import _run_url_job
+
+    manager = JobManager(JobStore(str(tmp_path / "jobs.sqlite3"), ttl=60), _run_url_job, workers=2)
+    with patch("backend.main.MODEL_STARTUP", "lazy"), patch("backend.main.job_manager", manager), \
+         patch("backend.main.extract_text_from_url", AsyncMock(return_value="Extracted job article")), \
+         patch("backend.main.get_scheduler", return_value=_fake_scheduler(0.9)), \
+         patch("backend.main.get_result_cache", return_value=MagicMock(
+             get_model_score=MagicMock(return_value=None), get_verification=MagicMock(return_value=None))), \
+         patch("backend.main.verify_news", AsyncMock(return_value=(0.9, []))):
+        with TestClient(app) as started:
+            response = started.post("/jobs", json={"url": "http://example.com/slow"})
+            assert response.status_code == 202
+            job = response.json()
+            assert response.headers["location"] == f"/jobs/{job['id']}"
+
+            with started.stream("GET", f"/jobs/{job['id']}/events") as events:
+                body = "".join(events.iter_text())
+            assert "event: done" in body
+            final = json.loads(body.split("event: done\ndata: ")[1].split("\n")[0])
+            assert final["result"]["verdict"] == "Likely Real News"
+
+            polled = started.get(f"/jobs/{job['id']}").json()
+            assert polled["status"] == "done"
+            assert started.get("/jobs/missing").status_code == 404
+
+def test_jobs_need_running_workers(tmp_path):
+    from backend.jobs import JobManager, JobStore
+    from backend.main import _run_url_job
+
+    manager = JobManager(JobStore(str(tmp_path / "jobs.sqlite3"), ttl=60), _run_url_job)
+    with patch("backend.main.job_manager", manager):
+        response = client.post("/jobs", json={"url": "http://example.com/slow"})
+    assert response.status_code == 503
+
+def _admission(text_limit=4, url_limit=4, queue=0, queue_timeout=0.05):
+    from backend.admission import AdmissionClass, AdmissionController
+    return AdmissionController({
+        "text": AdmissionClass("text", text_limit, max_queue=queue, queue_timeout=queue_timeout),
+        "url": AdmissionClass("url", url_limit, max_queue=queue, queue_timeout=queue_timeout),
+    })
+
+def test_url_overload_is_shed_while_text_is_served():
+    import asyncio
+    from httpx import ASGITransport, AsyncClient
+
+    release = asyncio.Event()
+
+    async def slow_extract(url):
+        await release.wait()
+        return "Slow article"
+
+    async def run():
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as http:
+            slow = asyncio.ensure_future(http.post("/predict-url", json={"url": "http://example.com/slow"}))
+            await asyncio.sleep(0.05)
+            shed = await http.post("/predict-url", json={"url": "http://example.com/other"})
+            text = await http.post("/predict-text", json={"text": "A cheap text request"})
+            release.set()
+            return shed, text, await slow
+
+    with patch("backend.main.get_admission_controller", return_value=_admission(url_limit=1)), \
+         patch("backend.main.extract_text_from_url", side_effect=slow_extract), \
+         patch("backend.main.get_scheduler", return_value=_fake_scheduler(0.9)), \
+         patch("backend.main.get_result_cache", return_value=MagicMock(
+             get_model_score=MagicMock(return_value=None), get_verification=MagicMock(return_value=None),
+             get_article=MagicMock(return_value=None))), \
+         patch("backend.main.verify_news", AsyncMock(return_value=(0.9, []))):
+        shed, text, slow = asyncio.run(run())
+    assert shed.status_code == 503
+    assert shed.headers["retry-after"] == "1"
+    assert text.status_code == 200
+    assert slow.status_code == 200
+
+def test_cached_results_bypass_admission():
+    from backend.cache import MemoryCacheBackend, ResultCache
+    cache = ResultCache(MemoryCacheBackend(1_000_000), model_ttl=60, verification_ttl=60)
+    cache.set_model_score("Already scored story", 0.9)
+    cache.set_verification("Already scored story", 0.8, [])
+    cache.set_article("http://example.com/known", "Already scored story")
+    admission = _admission(text_limit=1, url_limit=1)
+    for cls in admission.classes.values():
+        cls.inflight = cls.effective_limit  # every slot taken
+
+    with patch("backend.main.get_admission_controller", return_value=admission), \
+         patch("backend.main.get_result_cache", return_value=cache), \
+         patch("backend.main.extract_text_from_url", AsyncMock(return_value="Fresh article")) as mock_extract:
+        cached_text = client.post("/predict-text", json={"text": "already scored STORY"})
+        cached_url = client.post("/predict-url", json={"url": "http://example.com/known"})
+        new_text = client.post("/predict-text", json={"text": "A story nobody has scored"})
+        new_url = client.post("/predict-url", json={"url": "http://example.com/new"})
+    assert cached_text.status_code == 200
+    assert cached_text.json()["final_score"] == cached_url.json()["final_score"]
+    assert cached_url.status_code == 200
+    mock_extract.assert_not_called()
+    assert new_text.status_code == 503
+    assert new_url.status_code == 503
+    assert admission.stats()["text"]["cached"] == 1
+    assert admission.stats()["url"]["shed"] == 1
+
+def test_predict_batch_empty():
+    response = client.post("/predict-batch", json={"items": []})
+    assert response.status_code == 400
+
 # Integration test without mocks (Warning: Uses Google API Quota)
 # def test_live_integration():
 #     response = client.post("/predict-text", json={"text": "Apple announces new iPhone features today."})
@@ -0,0 +1,188 @@
+import unittest
+import asyncio
+import os
+import sys
+import tempfile
+
+# Ensure backend can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from backend.jobs import (
+        JobStore, JobManager, JobFailed, JobQueueFull, normalize_url, DONE, FAILED, QUEUED, RUNNING,
+    )
+except ImportError:
+    from jobs import (
+        JobStore, JobManager, JobFailed, JobQueueFull, normalize_url, DONE, FAILED, QUEUED, RUNNING,
+    )
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+class TestJobStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.clock = FakeClock()
+        self.store = JobStore(os.path.join(self.tmp.name, "jobs.sqlite3"), ttl=60, clock=self.clock)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_same_url_attaches_while_unfinished(self):
+        job, created = self.store.create_or_attach("https://Example.com/a#comments")
+        self.assertTrue(created)
+        again, created = self.store.create_or_attach("https://example.com/a")
+        self.assertFalse(created)
+        self.assertEqual(again["id"], job["id"])
+
+        self.store.set_status(job["id"], DONE, result={"verdict": "x"})
+        fresh, created = self.store.create_or_attach("https://example.com/a")
+        self.assertTrue(created)
+        self.assertNotEqual(fresh["id"], job["id"])
+
+    def test_finished_jobs_expire_after_ttl(self):
+        job, _ = self.store.create_or_attach("https://example.com/a")
+        self.store.set_status(job["id"], FAILED, error="boom")
+        self.clock.now += 59
+        self.assertEqual(self.store.get(job["id"])["error"], "boom")
+        self.clock.now += 2
+        self.assertIsNone(self.store.get(job["id"]))
+        self.assertEqual(self.store.purge_expired(), 1)
+
+    def test_claim_only_once(self):
+        job, _ = self.store.create_or_attach("https://example.com/a")
+        self.assertTrue(self.store.claim(job["id"]))
+        self.assertFalse(self.store.claim(job["id"]))
+
+    def test_adopts_only_own_jobs_or_expired_leases(self):
+        path = os.path.join(self.tmp.name, "jobs.sqlite3")
+        mine = JobStore(path, ttl=60, clock=self.clock, lease=30, owner="mine")
+        other = JobStore(path, ttl=60, clock=self.clock, lease=30, owner="other")
+        running, _ = other.create_or_attach("https://example.com/running")
+        self.assertTrue(other.claim(running["id"]))
+        queued, _ = mine.create_or_attach("https://example.com/queued")
+
+        self.assertEqual(mine.adopt(), [queued["id"]])
+        self.assertEqual(mine.adopt(own=False), [])
+        self.clock.now += 20
+        other.renew_leases()
+        self.clock.now += 20
+        self.assertEqual(mine.adopt(own=False), [])
+        self.assertEqual(mine.get(running["id"])["status"], RUNNING)
+
+        self.clock.now += 11  # the other owner went silent
+        self.assertEqual(mine.adopt(own=False), [running["id"]])
+        self.assertEqual(mine.get(running["id"])["status"], QUEUED)
+        self.assertFalse(other.claim(running["id"]))
+        self.assertTrue(mine.claim(running["id"]))
+
+    def test_normalize_url(self):
+        self.assertEqual(normalize_url(" HTTPS://Example.COM/Path?q=1#top "), "https://example.com/Path?q=1")
+
+class TestJobManager(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = JobStore(os.path.join(self.tmp.name, "jobs.sqlite3"), ttl=60)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_runs_jobs_and_streams_updates(self):
+        release = asyncio.Event()
+        calls = []
+
+        async def handler(url):
+            calls.append(url)
+            await release.wait()
+            if url.endswith("bad"):
+                raise JobFailed("Could not extract text from URL")
+            return {"verdict": "Likely Real News"}
+
+        async def run():
+            manager = JobManager(self.store, handler, workers=2)
+            await manager.start()
+            try:
+                job, _ = manager.submit("https://example.com/good")
+                attached, created = manager.submit("https://example.com/good")
+                self.assertFalse(created)
+                bad, _ = manager.submit("https://example.com/bad")
+
+                seen = []
+
+                async def watch():
+                    async for update in manager.updates(job["id"]):
+                        if update is not None:
+                            seen.append(update["status"])
+
+                watcher = asyncio.ensure_future(watch())
+                await asyncio.sleep(0.05)
+                release.set()
+                await asyncio.wait_for(watcher, 5)
+                await asyncio.wait_for(manager._queue.join(), 5)
+                return job, bad, seen
+            finally:
+                await manager.stop()
+
+        job, bad, seen = asyncio.run(run())
+        self.assertEqual(calls.count("https://example.com/good"), 1)
+        self.assertEqual(seen, ["running", "done"])
+        self.assertEqual(self.store.get(job["id"])["result"], {"verdict": "Likely Real News"})
+        self.assertEqual(self.store.get(bad["id"])["error"], "Could not extract text from URL")
+
+    def test_full_queue_rejects_new_urls(self):
+        async def handler(url):
+            await asyncio.sleep(10)
+
+        async def run():
+            manager = JobManager(self.store, handler, workers=1, max_queue=1)
+            await manager.start()
+            try:
+                manager.submit("https://example.com/1")
+                await asyncio.sleep(0.01)  # the worker takes job 1
+                manager.submit("https://example.com/2")
+                with self.assertRaises(JobQueueFull):
+                    manager.submit("https://example.com/3")
+                # Attaching to an unfinished job still works
+                self.assertFalse(manager.submit("https://example.com/2")[1])
+            finally:
+                await manager.stop()
+
+        asyncio.run(run())
+        # Interrupted jobs go back to the queue for the next start
+        self.assertEqual(len(self.store.unfinished()), 2)
+        self.assertEqual({QUEUED}, set(self.store.stats()["jobs"]))
+
+    def test_start_leaves_jobs_of_other_live_workers_alone(self):
+        other = JobStore(self.store.path, ttl=60, owner="other")
+        theirs, _ = other.create_or_attach("https://example.com/theirs")
+        self.assertTrue(other.claim(theirs["id"]))
+        stopped = JobStore(self.store.path, ttl=60, owner="stopped")
+        orphan, _ = stopped.create_or_attach("https://example.com/orphan")
+        stopped.release_leases()
+        calls = []
+
+        async def handler(url):
+            calls.append(url)
+            return {"verdict": "Likely Real News"}
+
+        async def run():
+            manager = JobManager(self.store, handler, workers=1)
+            await manager.start()
+            try:
+                await asyncio.wait_for(manager._queue.join(), 5)
+            finally:
+                await manager.stop()
+
+        asyncio.run(run())
+        self.assertEqual(calls, ["https://example.com/orphan"])
+        self.assertEqual(self.store.get(theirs["id"])["status"], RUNNING)
+        self.assertEqual(self.store.get(orphan["id"])["status"], DONE)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,106 @@
+import unittest
+import asyncio
+import json
+import os
+import sys
+import threading
+
+# Ensure backend can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from backend.metrics import Registry
+    from backend.tracing import TraceMiddleware, begin_timings, current_trace, stage
+except ImportError:
+    from metrics import Registry
+    from tracing import TraceMiddleware, begin_timings, current_trace, stage
+
+class TestRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = Registry()
+
+    def test_histogram_buckets_are_cumulative(self):
+        histogram = self.registry.histogram("latency_seconds", "Latency.", ("route",), buckets=(0.1, 1.0))
+        for value in (0.05, 0.1, 0.5, 3.0):
+            histogram.observe(value, route="/a")
+        lines = self.registry.render().splitlines()
+        self.assertIn("# TYPE latency_seconds histogram", lines)
+        self.assertIn('latency_seconds_bucket{route="/a",le="0.1"} 2', lines)
+        self.assertIn('latency_seconds_bucket{route="/a",le="1"} 3', lines)
+        self.assertIn('latency_seconds_bucket{route="/a",le="+Inf"} 4', lines)
+        self.assertIn('latency_seconds_sum{route="/a"} 3.65', lines)
+        self.assertIn('latency_seconds_count{route="/a"} 4', lines)
+
+    def test_counter_and_gauge_render(self):
+        counter = self.registry.counter("hits_total", "Hits.", ("cache",))
+        counter.inc(cache="model")
+        counter.inc(2, cache="model")
+        self.registry.gauge("depth", "Depth.", lambda: 7)
+        self.registry.gauge("broken", "Not ready.", lambda: 1 / 0)
+        text = self.registry.render()
+        self.assertIn('hits_total{cache="model"} 3', text)
+        self.assertIn("depth 7", text)
+        self.assertNotIn("broken", text)
+
+    def test_snapshot_is_stable_while_other_threads_add_labels(self):
+        counter = self.registry.counter("lookups_total", "Lookups.", ("cache",))
+        done = threading.Event()
+
+        def add_labels():
+            i = 0
+            while not done.is_set():
+                counter.inc(cache=f"c{i}")
+                i += 1
+
+        thread = threading.Thread(target=add_labels)
+        thread.start()
+        try:
+            for _ in range(2000):
+                snapshot = counter.snapshot()
+                self.assertEqual(sum(1 for _ in snapshot), len(snapshot))
+        finally:
+            done.set()
+            thread.join()
+
+    def test_label_values_are_escaped(self):
+        counter = self.registry.counter("odd_total", "Odd labels.", ("name",))
+        counter.inc(name='a"b\\c')
+        self.assertIn('odd_total{name="a\\"b\\\\c"} 1', self.registry.render())
+
+class TestTracing(unittest.TestCase):
+
+    def test_stage_is_a_no_op_outside_a_trace(self):
+        with stage("work"):
+            pass
+        self.assertIsNone(current_trace())
+
+    def test_middleware_traces_request_and_adds_header(self):
+        async def app(scope, receive, send):
+            timings = begin_timings()
+            with stage("work"):
+                pass
+            self.assertIn("work_ms", timings)
+            await send({"type": "http.response.start", "status": 200, "headers": []})
+            await send({"type": "http.response.body", "body": b"ok"})
+
+        sent = []
+
+        async def send(message):
+            sent.append(message)
+
+        async def run():
+            scope = {"type": "http", "method": "GET", "path": "/x"}
+            await TraceMiddleware(app)(scope, None, send)
+
+        with self.assertLogs("fnd.trace", level="INFO") as logs:
+            asyncio.run(run())
+        headers = dict(sent[0]["headers"])
+        trace = json.loads(logs.records[0].getMessage())
+        self.assertEqual(headers[b"x-trace-id"].decode(), trace["trace_id"])
+        self.assertEqual(trace["route"], "unmatched")
+        self.assertEqual(trace["status"], 200)
+        self.assertEqual([span["name"] for span in trace["spans"]], ["work"])
+
+if __name__ == '__main__':
+    unittest.main()
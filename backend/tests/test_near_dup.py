@@ -0,0 +1,76 @@
+import unittest
+import os
+import random
+import sys
+
+# Ensure backend can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from backend.near_dup import NearDuplicateIndex, simhash, hamming
+except ImportError:
+    from near_dup import NearDuplicateIndex, simhash, hamming
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+def make_story(rng, words=400):
+    vocabulary = [f"word{i}" for i in range(3000)]
+    return " ".join(rng.choice(vocabulary) for _ in range(words))
+
+def edit(rng, text, changes):
+    words = text.split()
+    for i in rng.sample(range(len(words)), changes):
+        words[i] = f"edited{i}"
+    return " ".join(words)
+
+class TestSimHash(unittest.TestCase):
+
+    def test_light_edits_stay_close_and_unrelated_texts_do_not(self):
+        rng = random.Random(7)
+        story = make_story(rng)
+        fingerprint = simhash(story.split())
+        self.assertEqual(fingerprint, simhash(story.split()))
+        self.assertLessEqual(hamming(fingerprint, simhash(edit(rng, story, 2).split())), 6)
+        self.assertGreater(hamming(fingerprint, simhash(make_story(rng).split())), 12)
+
+class TestNearDuplicateIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.clock = FakeClock()
+        self.index = NearDuplicateIndex(max_distance=6, max_entries=3, ttl=100, min_words=50, clock=self.clock)
+        self.rng = random.Random(3)
+
+    def test_reuses_value_of_a_lightly_edited_copy(self):
+        story = make_story(self.rng)
+        self.index.add(self.index.fingerprint(story), (0.8, ["reuters.com"]))
+        copy = "Breaking: " + edit(self.rng, story, 2)
+        self.assertEqual(self.index.get(self.index.fingerprint(copy)), (0.8, ["reuters.com"]))
+        self.assertIsNone(self.index.get(self.index.fingerprint(make_story(self.rng))))
+
+    def test_short_texts_are_not_indexed(self):
+        self.assertIsNone(self.index.fingerprint("Too short to fingerprint reliably"))
+        self.index.add(None, (0.8, []))
+        self.assertEqual(len(self.index), 0)
+
+    def test_entries_expire_and_memory_is_bounded(self):
+        stories = [make_story(self.rng) for _ in range(4)]
+        fingerprints = [self.index.fingerprint(s) for s in stories]
+        self.index.add(fingerprints[0], "first")
+        self.clock.now = 50
+        for fingerprint in fingerprints[1:]:
+            self.index.add(fingerprint, "later")
+        self.assertEqual(len(self.index), 3)
+        self.assertIsNone(self.index.get(fingerprints[0]))  # evicted by the size cap
+
+        self.clock.now = 151
+        self.assertIsNone(self.index.get(fingerprints[1]))
+        self.assertEqual(len(self.index), 0)
+        self.assertEqual(self.index._buckets, [dict() for _ in self.index._bands])
+
+if __name__ == '__main__':
+    unittest.main()
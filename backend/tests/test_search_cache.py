@@ -0,0 +1,143 @@
+import unittest
+from unittest.mock import patch, AsyncMock, MagicMock
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+
+# Ensure backend can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from backend import verify
+    from backend.search_cache import SearchQueryCache, SearchQuotaLimiter, normalize_query
+    from backend.text_analysis import build_queries
+except ImportError:
+    import verify
+    from search_cache import SearchQueryCache, SearchQuotaLimiter, normalize_query
+    from text_analysis import build_queries
+
+class FakeClock:
+    def __init__(self, now=1000.0):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+DAY = 86400.0
+
+class TestSearchQueryCache(unittest.TestCase):
+
+    def test_normalized_query_and_ttl(self):
+        clock = FakeClock()
+        cache = SearchQueryCache(":memory:", ttl=60, clock=clock)
+        self.assertEqual(normalize_query("River dam  DAM"), "dam river")
+        cache.set("dam river", [{"link": "https://www.reuters.com/x"}])
+        self.assertEqual(cache.get("River DAM"), [{"link": "https://www.reuters.com/x"}])
+        clock.now += 61
+        self.assertIsNone(cache.get("dam river"))
+
+    def test_survives_restart(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "search.sqlite3")
+            first = SearchQueryCache(path, ttl=60)
+            first.set("dam river", [])
+            first.add_usage("2026-01-01")
+            second = SearchQueryCache(path, ttl=60)
+            self.assertEqual(second.get("dam river"), [])
+            self.assertEqual(second.usage("2026-01-01"), 1)
+
+class TestSearchQuotaLimiter(unittest.TestCase):
+
+    def test_burst_then_refill(self):
+        clock = FakeClock()
+        limiter = SearchQuotaLimiter(rate_per_minute=60, burst=2, daily_budget=0, clock=clock)
+        self.assertTrue(limiter.try_acquire())
+        self.assertTrue(limiter.try_acquire())
+        self.assertFalse(limiter.try_acquire())
+        clock.now += 1.0
+        self.assertTrue(limiter.try_acquire())
+
+    def test_daily_budget_is_persisted_and_resets_next_day(self):
+        wall = FakeClock(10 * DAY)
+        store = SearchQueryCache(":memory:", ttl=60)
+        limiter = SearchQuotaLimiter(6000, 10, daily_budget=2, usage_store=store, wall_clock=wall)
+        self.assertTrue(limiter.try_acquire())
+        # A restarted process picks up today's usage from the store
+        restarted = SearchQuotaLimiter(6000, 10, daily_budget=2, usage_store=store, wall_clock=wall)
+        self.assertTrue(restarted.try_acquire())
+        self.assertFalse(restarted.try_acquire())
+        wall.now += DAY
+        self.assertTrue(restarted.try_acquire())
+
+    def test_budget_is_shared_by_processes_using_the_same_store(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "search.sqlite3")
+            # One store connection and limiter per "process", each with a full token bucket
+            limiters = [SearchQuotaLimiter(6000, 100, daily_budget=25, usage_store=SearchQueryCache(path, ttl=60))
+                        for _ in range(3)]
+            granted = []
+
+            def spend(limiter):
+                granted.extend(limiter.try_acquire() for _ in range(20))
+
+            threads = [threading.Thread(target=spend, args=(limiter,)) for limiter in limiters for _ in range(2)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(granted.count(True), 25)
+            self.assertEqual([limiter.stats()["used_today"] for limiter in limiters], [25, 25, 25])
+
+class TestVerifySearch(unittest.TestCase):
+
+    def setUp(self):
+        self.cache = SearchQueryCache(":memory:", ttl=60)
+        self.limiter = SearchQuotaLimiter(6000, 100, daily_budget=0)
+        self.patches = [
+            patch.object(verify, "GOOGLE_API_KEY", "key"),
+            patch.object(verify, "GOOGLE_CSE_ID", "cx"),
+            patch.object(verify, "get_search_cache", return_value=self.cache),
+            patch.object(verify, "get_search_limiter", return_value=self.limiter),
+        ]
+        for p in self.patches:
+            p.start()
+
+    def tearDown(self):
+        for p in self.patches:
+            p.stop()
+
+    def _client(self):
+        async def get_json(url, params=None, timeout=None):
+            await asyncio.sleep(0.05)
+            return {"items": [{"link": "https://www.reuters.com/a", "title": "t", "snippet": "s"}]}
+        client = MagicMock()
+        client.get_json = AsyncMock(side_effect=get_json)
+        return client
+
+    def test_concurrent_identical_queries_share_one_search(self):
+        client = self._client()
+
+        async def run():
+            return await asyncio.gather(*(verify.verify_news("Dam opens near river today") for _ in range(5)))
+
+        with patch.object(verify, "get_http_client", return_value=client):
+            results = asyncio.run(run())
+            # Served from the persistent cache afterwards
+            asyncio.run(verify.verify_news("Dam opens near river today"))
+        # One search per distinct candidate query, however many callers
+        queries = build_queries("Dam opens near river today")
+        self.assertEqual(client.get_json.await_count, len(queries))
+        self.assertEqual(len({r[0] for r in results}), 1)
+        self.assertEqual(self.cache.hits, len(queries))
+
+    def test_exhausted_quota_raises(self):
+        self.limiter.daily_budget = 1
+        with patch.object(verify, "get_http_client", return_value=self._client()):
+            asyncio.run(verify.verify_news("Dam opens near river today"))
+            with self.assertRaises(verify.VerificationUnavailable):
+                asyncio.run(verify.verify_news("Completely different story about elections"))
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,71 @@
+import unittest
+import json
+import os
+import sys
+import tempfile
+
+# Ensure backend can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from backend.sources import SourceRegistry, KIND_NEWS, KIND_FACT_CHECKER
+    from backend.config import SOURCES_PATH
+except ImportError:
+    from sources import SourceRegistry, KIND_NEWS, KIND_FACT_CHECKER
+    from config import SOURCES_PATH
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+class TestSourceRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.registry = SourceRegistry(SOURCES_PATH)
+
+    def test_matches_whole_label_suffixes_only(self):
+        self.assertEqual(self.registry.classify("www.rt.com").domain, "rt.com")
+        self.assertEqual(self.registry.classify("edition.CNN.com:443").domain, "cnn.com")
+        self.assertEqual(self.registry.classify("timesofindia.indiatimes.com").domain, "timesofindia.indiatimes.com")
+        self.assertEqual(self.registry.classify("www.thesun.co.uk").domain, "thesun.co.uk")
+        # Substring matches the old scan accepted
+        self.assertIsNone(self.registry.classify("art.com"))
+        self.assertIsNone(self.registry.classify("thesun.co.uk.evil.example"))
+        self.assertIsNone(self.registry.classify("indiatimes.com"))
+
+    def test_default_trust_and_weight_per_kind(self):
+        news = self.registry.classify("www.bbc.com")
+        checker = self.registry.classify("www.snopes.com")
+        self.assertEqual((news.kind, news.trust, news.weight), (KIND_NEWS, 1.0, 1.0))
+        self.assertEqual((checker.kind, checker.trust, checker.weight), (KIND_FACT_CHECKER, 1.2, 1.5))
+
+    def test_hot_reload_on_change(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "sources.json")
+            with open(path, "w") as f:
+                json.dump({"sources": [{"domain": "example.org", "trust": 0.7}]}, f)
+            clock = FakeClock()
+            registry = SourceRegistry(path, reload_interval=5, clock=clock)
+            self.assertEqual(registry.classify("news.example.org").trust, 0.7)
+
+            with open(path, "w") as f:
+                json.dump({"sources": [{"domain": "example.net", "kind": "fact_checker", "weight": 2.0}]}, f)
+            os.utime(path, (os.path.getmtime(path) + 10, os.path.getmtime(path) + 10))
+            # Not re-checked until the interval passes
+            self.assertIsNotNone(registry.classify("example.org"))
+            clock.now += 5
+            self.assertIsNone(registry.classify("example.org"))
+            self.assertEqual(registry.classify("example.net").weight, 2.0)
+
+            # A broken edit keeps the last good index
+            with open(path, "w") as f:
+                f.write("{not json")
+            os.utime(path, (os.path.getmtime(path) + 20, os.path.getmtime(path) + 20))
+            clock.now += 5
+            self.assertEqual(registry.classify("example.net").weight, 2.0)
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import unittest
+import os
+import re
+import sys
+from collections import Counter
+
+# Ensure backend can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from backend.text_analysis import (
+        STOP_WORDS, SNIPPET_LEXICON, FACT_CHECK, NEGATIVE, extract_keywords, analyze_snippets, build_queries
+    )
+    from backend.verify import analyze_snippet
+except ImportError:
+    from text_analysis import (
+        STOP_WORDS, SNIPPET_LEXICON, FACT_CHECK, NEGATIVE, extract_keywords, analyze_snippets, build_queries
+    )
+    from verify import analyze_snippet
+
+def reference_keywords(text, num_keywords=5):
+    words = re.sub(r'[^a-zA-Z0-9\s]', '', text.lower()).split()
+    meaningful = [w for w in words if w not in STOP_WORDS and len(w) > 3]
+    return " ".join(word for word, _ in Counter(meaningful).most_common(num_keywords))
+
+class TestKeywords(unittest.TestCase):
+
+    def test_matches_reference_extraction(self):
+        for text in [
+            "Don't panic: the dam's river, river, RIVER and the dam opened.",
+            "Café owners in São Paulo protest new tax; café prices rise",
+            "The and of with which",
+            "",
+        ]:
+            self.assertEqual(extract_keywords(text), reference_keywords(text), text)
+
+class TestQueries(unittest.TestCase):
+
+    ARTICLE = (
+        "NASA confirms water found on the Moon\n\n"
+        "WASHINGTON - The National Aeronautics and Space Administration said on Monday that its SOFIA "
+        "observatory detected water molecules in sunlit areas of the Moon. Scientists at NASA said the "
+        "finding changes assumptions about lunar resources. The European Space Agency welcomed the news."
+    )
+
+    def test_builds_each_kind_in_priority_order(self):
+        queries = dict(build_queries(self.ARTICLE, 4))
+        self.assertEqual(list(queries), ["keywords", "headline", "claim", "entities"])
+        self.assertEqual(queries["headline"], "nasa confirms water found moon")
+        self.assertIn("sofia observatory detected", queries["claim"])
+        self.assertIn("national aeronautics space administration", queries["entities"])
+
+    def test_drops_repeated_queries_and_respects_the_cap(self):
+        self.assertEqual(build_queries("Dam opens near river today"), [
+            ("keywords", "opens near river today"), ("headline", "dam opens near river today")])
+        self.assertEqual(len(build_queries(self.ARTICLE, 2)), 2)
+        self.assertEqual(build_queries(""), [])
+
+class TestLexicon(unittest.TestCase):
+
+    def test_whole_words_with_inflections(self):
+        self.assertEqual(SNIPPET_LEXICON.scan("The claim was debunked"), FACT_CHECK | NEGATIVE)
+        self.assertEqual(SNIPPET_LEXICON.scan("A FACT-CHECK of the speech"), FACT_CHECK)
+        self.assertEqual(SNIPPET_LEXICON.scan("Fake news sites"), FACT_CHECK | NEGATIVE)
+        # Substrings of longer words no longer count
+        self.assertEqual(SNIPPET_LEXICON.scan("A falsehood about shoaxes in fakery"), 0)
+
+    def test_debunks_with_agent_and_adverb_forms_stay_debunks(self):
+        self.assertEqual(analyze_snippet("Fact-checkers: No, the photo is fake", ""), 0.1)
+        self.assertEqual(analyze_snippet("FACT CHECKING: Viral post falsely claims a cure", ""), 0.1)
+        self.assertEqual(analyze_snippet("Claim is falsely attributed; fact check", ""), 0.1)
+        self.assertEqual(analyze_snippet("Fact check: the debunker was right", ""), 0.1)
+        self.assertEqual(SNIPPET_LEXICON.scan("Deep fakes spread"), NEGATIVE)
+
+    def test_batch_matches_single_calls(self):
+        pairs = [
+            ("Fact Check: moon landing", "We rate this claim FALSE."),
+            ("Webb telescope images", "NASA released new images."),
+            ("Hoax", ""),
+            ("", "fact check pending"),
+        ]
+        self.assertEqual(analyze_snippets(pairs), [analyze_snippet(t, s) for t, s in pairs])
+        self.assertEqual(analyze_snippets(pairs), [0.1, 1.2, 0.1, 0.5])
+        # A match never bridges two texts
+        self.assertEqual(SNIPPET_LEXICON.scan_many(["fact", "check"]), [0, 0])
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,150 @@
+import unittest
+import io
+import json
+import os
+import sys
+import tempfile
+from unittest.mock import patch
+
+import numpy as np
+
+# Ensure backend can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from backend.verdict import (
+        BandedPolicy, IsotonicPolicy, LogisticPolicy, calculate_verdicts, fit_isotonic, fit_logistic,
+        policy_from_dict, load_policy,
+    )
+    from backend.evaluate_verdicts import evaluate, expected_calibration_error, fit_policies, read_labelled
+    from backend.evaluate_verdicts import main as evaluate_main
+except ImportError:
+    from verdict import (
+        BandedPolicy, IsotonicPolicy, LogisticPolicy, calculate_verdicts, fit_isotonic, fit_logistic,
+        policy_from_dict, load_policy,
+    )
+    from evaluate_verdicts import evaluate, expected_calibration_error, fit_policies, read_labelled
+    from evaluate_verdicts import main as evaluate_main
+
+def labelled(n=20000, seed=0):
+    """Scores whose real rate is known: P(real) = sigmoid(6 * lstm + 4 * verification - 5)."""
+    rng = np.random.default_rng(seed)
+    lstm, verification = rng.random(n), rng.random(n)
+    labels = (rng.random(n) < 1.0 / (1.0 + np.exp(-(6 * lstm + 4 * verification - 5)))).astype(float)
+    return lstm, verification, labels
+
+class TestPolicies(unittest.TestCase):
+
+    def test_banded_default_matches_the_built_in_weights(self):
+        final_scores, verdicts, _ = calculate_verdicts([0.52, 0.48, 0.8], [0.2, 0.9, np.nan], BandedPolicy())
+        np.testing.assert_allclose(final_scores, [0.2 * 0.52 + 0.8 * 0.2, 0.3 * 0.48 + 0.7 * 0.9, 0.8])
+        self.assertEqual(list(verdicts), ["Likely Fake News", "Likely Real News", "Likely Real News"])
+
+    def test_thresholds_come_from_the_policy(self):
+        policy = policy_from_dict({"type": "banded", "thresholds": {"real": 0.9, "mixed": 0.5}})
+        _, verdicts, is_real = calculate_verdicts([0.8, 0.48], [np.nan, np.nan], policy)
+        self.assertEqual(list(verdicts), ["Inconclusive / Mixed Evidence", "Likely Fake News"])
+        self.assertEqual(list(is_real), [True, False])
+
+    def test_logistic_uses_model_only_coefficients_without_verification(self):
+        policy = LogisticPolicy([2.0, 3.0], -2.0, model_only=[4.0, -2.0])
+        scores = policy.fuse(np.array([0.5, 0.5]), np.array([1.0, np.nan]))
+        np.testing.assert_allclose(scores, [1 / (1 + np.exp(-2.0)), 0.5])
+        self.assertAlmostEqual(LogisticPolicy([2.0, 3.0], -2.0).fuse(np.array([0.3]), np.array([np.nan]))[0], 0.3)
+
+    def test_dict_round_trip(self):
+        for policy in (BandedPolicy(low=0.3), LogisticPolicy([1.0, 2.0], -1.5, [3.0, -1.0]),
+                       IsotonicPolicy([0.0, 0.5, 1.0], [0.1, 0.4, 0.9], BandedPolicy(high=0.8))):
+            with tempfile.TemporaryDirectory() as tmp:
+                path = os.path.join(tmp, "policy.json")
+                with open(path, "w") as f:
+                    json.dump(policy.to_dict(), f)
+                loaded = load_policy(path)
+            self.assertEqual(loaded.to_dict(), policy.to_dict())
+
+    def test_rejects_unknown_or_malformed_policies(self):
+        with self.assertRaises(ValueError):
+            policy_from_dict({"type": "neural"})
+        with self.assertRaises(ValueError):
+            policy_from_dict({"type": "isotonic", "x": [0.5, 0.1], "y": [0.2, 0.3]})
+        with self.assertRaises(ValueError):
+            policy_from_dict({"type": "logistic", "coef": [1.0, 2.0], "intercept": 0.0, "model_only": [4.0]})
+        with self.assertRaises(TypeError):
+            policy_from_dict({"type": "banded", "weights": [1, 2]})
+
+class TestFitting(unittest.TestCase):
+
+    def test_logistic_fit_recovers_coefficients(self):
+        lstm, verification, labels = labelled(50000)
+        coef, intercept = fit_logistic(np.column_stack([lstm, verification]), labels)
+        np.testing.assert_allclose(coef + [intercept], [6, 4, -5], atol=0.4)
+
+    def test_isotonic_fit_is_monotone_and_pools_violators(self):
+        x, y = fit_isotonic(np.array([0.1, 0.2, 0.3, 0.4]), np.array([0.0, 1.0, 0.0, 1.0]))
+        self.assertEqual(y, [0.0, 0.5, 1.0])
+        self.assertEqual(x, [0.1, 0.25, 0.4])
+
+        lstm, verification, labels = labelled()
+        x, y = fit_isotonic(BandedPolicy().fuse(lstm, verification), labels, max_knots=20)
+        self.assertLessEqual(len(x), 20)
+        self.assertTrue(np.all(np.diff(y) >= 0) and np.all(np.diff(x) >= 0))
+
+    def test_fitted_policies_are_better_calibrated_than_banded(self):
+        lstm, verification, labels = labelled()
+        verification[::5] = np.nan
+        banded = evaluate(BandedPolicy(), lstm, verification, labels)
+        for name, policy in fit_policies(lstm, verification, labels):
+            self.assertLess(evaluate(policy, lstm, verification, labels)["ece"], banded["ece"], name)
+
+    def test_fit_rejects_rows_that_cannot_support_a_logistic(self):
+        lstm, verification, labels = labelled(200)
+        cases = {
+            "no verification": (lstm, np.full_like(verification, np.nan), labels),
+            "one class": (lstm, verification, np.ones_like(labels)),
+            "constant feature": (lstm, np.full_like(verification, 0.5), labels),
+        }
+        for name, rows in cases.items():
+            with self.assertRaises(ValueError, msg=name):
+                fit_policies(*rows)
+
+class TestEvaluation(unittest.TestCase):
+
+    def test_expected_calibration_error(self):
+        self.assertAlmostEqual(expected_calibration_error(np.array([0.25, 0.25, 0.25, 0.25]),
+                                                          np.array([1.0, 0.0, 0.0, 0.0])), 0.0)
+        self.assertAlmostEqual(expected_calibration_error(np.array([0.9, 0.9]), np.array([0.0, 0.0])), 0.9)
+
+    def test_reads_labels_and_missing_verification(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "labelled.jsonl")
+            with open(path, "w") as f:
+                f.write(json.dumps({"lstm_score": 0.9, "verification_score": 0.8, "label": "real"}) + "\n\n")
+                f.write(json.dumps({"lstm_score": 0.2, "verification_score": None, "label": 0}) + "\n")
+            lstm, verification, labels = read_labelled(path)
+        np.testing.assert_array_equal(lstm, [0.9, 0.2])
+        self.assertTrue(np.isnan(verification[1]))
+        np.testing.assert_array_equal(labels, [1.0, 0.0])
+
+    def test_report_fields(self):
+        lstm, verification, labels = labelled(1000)
+        report = evaluate(BandedPolicy(), lstm, verification, labels, repeats=1)
+        self.assertEqual(set(report), {"accuracy", "decided_accuracy", "ece", "brier", "verdicts", "rows_per_sec"})
+        self.assertEqual(sum(report["verdicts"].values()), 1000)
+
+    def test_cli_exits_cleanly_on_empty_data_or_splits(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            empty = os.path.join(tmp, "empty.jsonl")
+            open(empty, "w").close()
+            single = os.path.join(tmp, "single.jsonl")
+            with open(single, "w") as f:
+                f.write(json.dumps({"lstm_score": 0.9, "verification_score": 0.8, "label": "real"}) + "\n")
+            for argv in ([empty], [single, "--fit"], [single, "--fit", "--test-fraction", "1.5"]):
+                with patch.object(sys, "argv", ["evaluate_verdicts.py", *argv]), \
+                        patch("sys.stderr", new_callable=io.StringIO) as stderr:
+                    with self.assertRaises(SystemExit) as raised:
+                        evaluate_main()
+                self.assertEqual(raised.exception.code, 2, argv)
+                self.assertIn("error:", stderr.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
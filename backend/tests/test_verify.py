@@ -0,0 +1,107 @@
+import unittest
+from unittest.mock import patch
+import asyncio
+import os
+import sys
+
+# Ensure backend can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from backend import verify
+    from backend.search_providers import SearchProvider, StaticSearchProvider
+except ImportError:
+    import verify
+    from search_providers import SearchProvider, StaticSearchProvider
+
+def item(link, title="Report", snippet="Officials confirmed the plan."):
+    return {"link": link, "title": title, "snippet": snippet}
+
+class SlowProvider(SearchProvider):
+    """Answers each query after its own delay; raises what the result says to."""
+    name = "slow"
+
+    def __init__(self, answers):
+        self.answers = answers  # query -> (delay, items or exception)
+        self.cancelled = []
+
+    async def search(self, query):
+        delay, result = self.answers[query]
+        try:
+            await asyncio.sleep(delay)
+        except asyncio.CancelledError:
+            self.cancelled.append(query)
+            raise
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+class TestVerificationEngine(unittest.TestCase):
+
+    def test_merges_and_dedupes_results_by_url(self):
+        provider = StaticSearchProvider({
+            "a": [item("https://www.reuters.com/story/"), item("https://randomblog.example/x")],
+            "b": [item("https://www.reuters.com/story#comments"), item("https://www.bbc.com/news/1")],
+        })
+        engine = verify.VerificationEngine(provider, max_queries=2, enough_sources=5)
+        items = asyncio.run(engine.gather_evidence(["a", "b"]))
+        links = sorted(i["link"] for i in items)
+        self.assertEqual(len(links), 3)
+        self.assertEqual(links[:2], ["https://randomblog.example/x", "https://www.bbc.com/news/1"])
+        self.assertTrue(links[2].startswith("https://www.reuters.com/story"))
+
+    def test_stops_early_once_a_fact_checker_answers(self):
+        provider = SlowProvider({
+            "fast": (0.0, [item("https://www.snopes.com/fact-check/x", "Fact Check", "The claim is false.")]),
+            "slow": (5.0, [item("https://www.bbc.com/news/1")]),
+        })
+        engine = verify.VerificationEngine(provider, budget=10.0)
+        items = asyncio.run(engine.gather_evidence(["fast", "slow"]))
+        self.assertEqual([i["link"] for i in items], ["https://www.snopes.com/fact-check/x"])
+        self.assertEqual(provider.cancelled, ["slow"])
+
+    def test_time_budget_scores_what_has_arrived(self):
+        provider = SlowProvider({
+            "fast": (0.0, [item("https://www.bbc.com/news/1")]),
+            "slow": (5.0, [item("https://www.reuters.com/a")]),
+        })
+        engine = verify.VerificationEngine(provider, budget=0.1)
+        items = asyncio.run(engine.gather_evidence(["fast", "slow"]))
+        self.assertEqual([i["link"] for i in items], ["https://www.bbc.com/news/1"])
+
+    def test_budget_with_no_answer_is_unavailable_not_a_low_score(self):
+        class Silent(SearchProvider):
+            async def search(self, query):
+                await asyncio.sleep(5.0)
+                return [item("https://www.bbc.com/news/1")]
+
+        engine = verify.VerificationEngine(Silent(), budget=0.2)
+        with self.assertRaises(verify.VerificationUnavailable):
+            asyncio.run(engine.verify("Officials announced a new dam on the river today"))
+
+        # verify_news passes it on, so callers degrade instead of caching a "no sources" score
+        with patch.object(verify, "VERIFY_SEARCH_BUDGET", 10.0), patch.object(verify, "VERIFY_DEADLINE", 0.2):
+            with self.assertRaises(verify.VerificationUnavailable):
+                asyncio.run(verify.verify_news("Officials announced a new dam on the river today", Silent()))
+
+    def test_quota_errors_only_surface_when_nothing_answered(self):
+        unavailable = verify.VerificationUnavailable("Search quota exhausted")
+        partial = SlowProvider({"a": (0.0, unavailable), "b": (0.01, [item("https://www.bbc.com/news/1")])})
+        items = asyncio.run(verify.VerificationEngine(partial).gather_evidence(["a", "b"]))
+        self.assertEqual(len(items), 1)
+
+        none = SlowProvider({"a": (0.0, unavailable), "b": (0.0, RuntimeError("boom"))})
+        with self.assertRaises(verify.VerificationUnavailable):
+            asyncio.run(verify.VerificationEngine(none).gather_evidence(["a", "b"]))
+
+    def test_verify_news_with_stub_provider(self):
+        provider = StaticSearchProvider(lambda query: [item("https://www.reuters.com/world/dam")])
+        with patch.object(verify, "VERIFY_MAX_QUERIES", 3):
+            score, matches = asyncio.run(verify.verify_news(
+                "Dam opens near river today\n\nThe new dam opened on Monday near the river.", provider))
+        self.assertEqual([m["name"] for m in matches], ["www.reuters.com"])
+        self.assertGreater(score, 0.5)
+        self.assertEqual(len(provider.queries), 3)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+import os
+import sys
+import time
+
+# Ensure backend can be imported
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+try:
+    from backend.worker_pool import ModelWorkerPool, PoolSaturatedError
+except ImportError:
+    from worker_pool import ModelWorkerPool, PoolSaturatedError
+
+class PidBackend:
+    """Scores each text with its length and records which process served it."""
+
+    def predict_batch(self, texts):
+        if "slow" in texts:
+            time.sleep(0.5)
+        return [os.getpid() + len(t) / 1000.0 for t in texts]
+
+class TestModelWorkerPool(unittest.TestCase):
+
+    def test_scores_come_from_worker_processes(self):
+        pool = ModelWorkerPool(PidBackend, workers=2).start()
+        try:
+            scores = pool.predict_batch(["a", "bbb"])
+            self.assertEqual(len(scores), 2)
+            self.assertNotEqual(int(scores[0]), os.getpid())
+            self.assertAlmostEqual(scores[1] - scores[0], 0.002, places=6)
+        finally:
+            pool.shutdown()
+
+    def test_workers_are_recycled(self):
+        pool = ModelWorkerPool(PidBackend, workers=1, max_requests_per_worker=2).start()
+        try:
+            pids = {int(pool.predict("x")) for _ in range(4)}
+            # 4 batches at 2 per process means at least two different workers
+            self.assertGreaterEqual(len(pids), 2)
+            self.assertGreaterEqual(pool.stats()["recycled_total"], 1)
+        finally:
+            pool.shutdown()
+
+    def test_full_queue_is_rejected_with_retry_after(self):
+        from concurrent.futures import ThreadPoolExecutor
+
+        pool = ModelWorkerPool(PidBackend, workers=1, max_queue=1).start()
+        try:
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                busy = executor.submit(pool.predict_batch, ["slow"])   # occupies the worker
+                time.sleep(0.2)
+                queued = executor.submit(pool.predict_batch, ["queued"])  # fills the queue
+                time.sleep(0.1)
+                with self.assertRaises(PoolSaturatedError) as ctx:
+                    pool.predict_batch(["rejected"])
+                self.assertGreaterEqual(ctx.exception.retry_after, 1)
+                busy.result(timeout=5)
+                queued.result(timeout=5)
+            self.assertEqual(pool.stats()["rejected_total"], 1)
+        finally:
+            pool.shutdown()
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,186 @@
+import re
+from bisect import bisect_right
+from collections import Counter
+from typing import Dict, Iterable, List, Tuple
+
+# Built once at import; the keyword and snippet helpers in verify.py run
+# for every search result, so nothing here is rebuilt per call.
+
+STOP_WORDS = frozenset([
+    "the", "a", "an", "in", "on", "at", "for", "to", "of", "and", "or", "is", "are", "was", "were",
+    "it", "this", "that", "with", "by", "from", "be", "not", "have", "has", "had", "say", "said", "will",
+    "would", "could", "should", "he", "she", "they", "we", "i", "you", "my", "his", "her", "their",
+    "about", "as", "into", "like", "through", "after", "over", "between", "out", "against", "during",
+    "without", "before", "under", "around", "among", "just", "very", "also", "been", "which"
+])
+
+FACT_CHECK_KEYWORDS = [
+    "fact check", "fact-check", "debunk", "hoax", "false",
+    "fake news", "misleading", "correcting", "untrue", "unverified"
+]
+
+NEGATIVE_INDICATORS = ["false", "hoax", "debunk", "incorrect", "misleading", "fake"]
+
+FACT_CHECK = 1
+NEGATIVE = 2
+
+# Keeps [a-z0-9] and whitespace. The translate table is the fast path for
+# ASCII text; the regex handles everything else identically.
+_NON_ALNUM_RE = re.compile(r"[^a-z0-9\s]")
+_ASCII_PUNCTUATION = str.maketrans("", "", "".join(
+    chr(c) for c in range(128) if not (chr(c).isalnum() or chr(c).isspace())
+))
+
+def _word_char(text: str, i: int) -> bool:
+    return i >= 0 and (text[i].isalnum() or text[i] == "_")
+
+# What may follow a phrase for it to count as a whole word: plain
+# inflections plus agent and adverb forms ('fact-checkers', 'falsely')
+_WORD_END_RE = re.compile(r"(?:s|es|ed|d|ing|ers?|rs?|ly)?(?!\w)")
+
+class LexiconMatcher:
+    """
+    Finds whole-word occurrences of a fixed set of phrases.
+
+    Each phrase is located with str.find (C speed) and a hit is accepted
+    only at word boundaries, optionally followed by an inflection:
+    'debunk' matches 'debunked' and 'debunker', 'false' matches 'falsely'
+    but not 'falsehood'.
+    scan_many joins all texts and searches each phrase once for the whole
+    batch, so phrases absent from every text cost a single scan.
+    """
+
+    def __init__(self, lexicons: Dict[int, Iterable[str]]):
+        flags = {}
+        for flag, phrases in lexicons.items():
+            for phrase in phrases:
+                flags[phrase.lower()] = flags.get(phrase.lower(), 0) | flag
+        self.flags = flags
+
+    def scan(self, text: str) -> int:
+        """OR of the flags of every phrase found in `text`."""
+        return self.scan_many([text])[0]
+
+    def scan_many(self, texts: List[str]) -> List[int]:
+        """scan() for many texts, searching each phrase once across all of them."""
+        if not texts:
+            return []
+        starts = []
+        offset = 0
+        for text in texts:
+            starts.append(offset)
+            offset += len(text) + 1
+        # NUL is not a word character, so a match never spans two texts
+        joined = "\0".join(texts).lower()
+
+        found = [0] * len(texts)
+        for phrase, flag in self.flags.items():
+            i = joined.find(phrase)
+            while i != -1:
+                end = i + len(phrase)
+                doc = bisect_right(starts, i) - 1
+                if found[doc] & flag != flag and not _word_char(joined, i - 1) and _WORD_END_RE.match(joined, end):
+                    found[doc] |= flag
+                i = joined.find(phrase, end)
+        return found
+
+SNIPPET_LEXICON = LexiconMatcher({FACT_CHECK: FACT_CHECK_KEYWORDS, NEGATIVE: NEGATIVE_INDICATORS})
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased alphanumeric words; punctuation is dropped, not split on ("don't" -> "dont")."""
+    text = text.lower()
+    if text.isascii():
+        return text.translate(_ASCII_PUNCTUATION).split()
+    return _NON_ALNUM_RE.sub("", text).split()
+
+def extract_keywords(text: str, num_keywords: int = 5) -> str:
+    """Most frequent meaningful words (not stop words, longer than 3 characters)."""
+    # Count everything in C, then filter the (much shorter) list of distinct words
+    counts = Counter(tokenize(text))
+    for word in list(counts):
+        if len(word) <= 3 or word in STOP_WORDS:
+            del counts[word]
+    return " ".join(word for word, _ in counts.most_common(num_keywords))
+
+def extract_keywords_batch(texts: List[str], num_keywords: int = 5) -> List[str]:
+    return [extract_keywords(text, num_keywords) for text in texts]
+
+def snippet_multiplier(flags: int) -> float:
+    if flags & FACT_CHECK:
+        # Fact-check language plus a negative word: likely debunking the claim
+        return 0.1 if flags & NEGATIVE else 0.5
+    return 1.2  # Likely a legitimate report or neutral mention
+
+def analyze_snippets(pairs: List[tuple]) -> List[float]:
+    """Sentiment multipliers for many (title, snippet) pairs in one lexicon pass."""
+    contents = [f"{title} {snippet}" for title, snippet in pairs]
+    return [snippet_multiplier(flags) for flags in SNIPPET_LEXICON.scan_many(contents)]
+
+# Candidate search queries for verification. Each kind catches claims the
+# plain keyword query misses: short claims lose their meaning once reduced
+# to frequent words, and multi-topic articles spread their counts thin.
+QUERY_MAX_WORDS = 10
+HEADLINE_MAX_WORDS = 15  # a longer first line is body text, not a headline
+
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+|\n+")
+# Runs of capitalized words ("European Central Bank", "Joe Biden")
+_ENTITY_RE = re.compile(r"\b[A-Z][\w'-]*(?:\s+(?:of\s+|the\s+)?[A-Z][\w'-]*)*")
+
+def _content_words(text: str, limit: int = QUERY_MAX_WORDS) -> str:
+    words = [w for w in tokenize(text) if w not in STOP_WORDS]
+    return " ".join(words[:limit])
+
+def split_sentences(text: str) -> List[str]:
+    return [s.strip() for s in _SENTENCE_RE.split(text) if s.strip()]
+
+def entity_query(text: str, max_entities: int = 3) -> str:
+    """The most frequent capitalized names, ignoring lone sentence-initial words."""
+    counts = Counter()
+    for sentence in split_sentences(text):
+        for match in _ENTITY_RE.finditer(sentence):
+            entity = match.group(0)
+            if match.start() == 0 and " " not in entity:
+                continue  # just a capitalized first word
+            if entity.lower() in STOP_WORDS:
+                continue
+            counts[entity] += 1
+    return _content_words(" ".join(entity for entity, _ in counts.most_common(max_entities)))
+
+def headline_query(text: str) -> str:
+    """The first line when it looks like a title (extracted pages start with one)."""
+    for line in text.splitlines():
+        if line.strip():
+            return _content_words(line) if len(line.split()) <= HEADLINE_MAX_WORDS else ""
+    return ""
+
+def claim_query(text: str) -> str:
+    """The sentence that carries most of the text's frequent keywords."""
+    keywords = extract_keywords(text, 10).split()
+    weights = {word: len(keywords) - rank for rank, word in enumerate(keywords)}
+    sentences = split_sentences(text)
+    if len(sentences) > 1 and headline_query(text):
+        sentences = sentences[1:]  # the headline has its own query
+    best, best_score = "", 0
+    for sentence in sentences[:50]:
+        score = sum(weights.get(word, 0) for word in set(tokenize(sentence)))
+        if score > best_score:
+            best, best_score = sentence, score
+    return _content_words(best)
+
+def build_queries(text: str, max_queries: int = 3) -> List[Tuple[str, str]]:
+    """
+    (kind, query) pairs in priority order: keywords, headline, claim
+    sentence, named entities. Queries with the same words are dropped.
+    """
+    seen = set()
+    queries = []
+    for kind, build in (("keywords", extract_keywords), ("headline", headline_query),
+                        ("claim", claim_query), ("entities", entity_query)):
+        query = build(text)
+        key = frozenset(query.split())
+        if query and key not in seen:
+            seen.add(key)
+            queries.append((kind, query))
+        if len(queries) >= max_queries:
+            break
+    return queries
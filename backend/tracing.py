@@ -0,0 +1,149 @@
+import contextvars
+import json
+import logging
+import os
+import time
+from contextlib import contextmanager
+from typing import Optional
+
+try:
+    from backend.config import TRACE_LOG, LOG_LEVEL
+    from backend.metrics import HTTP_LATENCY, HTTP_REQUESTS, STAGE_LATENCY, increment, observe
+except ImportError:
+    from config import TRACE_LOG, LOG_LEVEL
+    from metrics import HTTP_LATENCY, HTTP_REQUESTS, STAGE_LATENCY, increment, observe
+
+# Per-request traces. TraceMiddleware opens one per HTTP request; code
+# further down (model, verification, fetching) times its stages with
+# stage(), which always feeds the stage histogram and also records a span
+# when a trace is open (outside requests, e.g. bulk paths, CLIs and tests,
+# there is none).
+_trace = contextvars.ContextVar("fnd_trace", default=None)
+
+trace_logger = logging.getLogger("fnd.trace")
+
+MAX_SPANS = 256  # bounds the trace of a large /predict-batch call
+
+class Trace:
+    """Stage spans and millisecond timings of one request."""
+
+    __slots__ = ("trace_id", "start", "spans", "timings")
+
+    def __init__(self, trace_id: Optional[str] = None):
+        self.trace_id = trace_id or os.urandom(8).hex()
+        self.start = time.perf_counter()
+        self.spans = []      # (name, start offset ms, duration ms)
+        self.timings = {}    # "<stage>_ms" -> duration of the latest span of that stage
+
+    def record(self, name: str, start: float, end: float):
+        duration = round((end - start) * 1000.0, 3)
+        self.timings[f"{name}_ms"] = duration
+        if len(self.spans) < MAX_SPANS:
+            self.spans.append((name, round((start - self.start) * 1000.0, 3), duration))
+
+    def as_dict(self) -> dict:
+        return {
+            "trace_id": self.trace_id,
+            "spans": [{"name": n, "start_ms": s, "duration_ms": d} for n, s, d in self.spans],
+        }
+
+def begin_trace(trace_id: Optional[str] = None) -> Trace:
+    """Returns the current trace, opening one if none is active."""
+    trace = _trace.get()
+    if trace is None:
+        trace = Trace(trace_id)
+        _trace.set(trace)
+    return trace
+
+@contextmanager
+def new_trace(trace_id: Optional[str] = None):
+    """Runs the enclosed block under a fresh trace (background jobs)."""
+    trace = Trace(trace_id)
+    token = _trace.set(trace)
+    try:
+        yield trace
+    finally:
+        _trace.reset(token)
+
+def current_trace() -> Optional[Trace]:
+    return _trace.get()
+
+def current_trace_id() -> Optional[str]:
+    trace = _trace.get()
+    return trace.trace_id if trace is not None else None
+
+def begin_timings() -> dict:
+    """Returns the current request's timings dict, creating it if needed."""
+    return begin_trace().timings
+
+def current_timings() -> Optional[dict]:
+    trace = _trace.get()
+    return trace.timings if trace is not None else None
+
+@contextmanager
+def stage(name: str):
+    """Records the wall time of the enclosed block as span `name` / `<name>_ms`."""
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        end = time.perf_counter()
+        observe(STAGE_LATENCY, end - start, stage=name)
+        trace = _trace.get()
+        if trace is not None:
+            trace.record(name, start, end)
+
+class TraceMiddleware:
+    """
+    Pure ASGI middleware: opens a trace per HTTP request, returns its id in
+    X-Trace-Id, records request metrics by route template and logs the
+    finished trace as one JSON line on the "fnd.trace" logger.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        trace = Trace()
+        token = _trace.set(trace)
+        status = 500
+        header = (b"x-trace-id", trace.trace_id.encode("ascii"))
+
+        async def send_with_trace(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                message["headers"] = list(message.get("headers", [])) + [header]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_trace)
+        finally:
+            _trace.reset(token)
+            elapsed = time.perf_counter() - trace.start
+            route = getattr(scope.get("route"), "path", "unmatched")
+            observe(HTTP_LATENCY, elapsed, route=route)
+            increment(HTTP_REQUESTS, route=route, status=status)
+            if TRACE_LOG and trace_logger.isEnabledFor(logging.INFO):
+                trace_logger.info(json.dumps({
+                    "method": scope.get("method"), "route": route, "status": status,
+                    "duration_ms": round(elapsed * 1000.0, 3), **trace.as_dict(),
+                }))
+
+class TraceIdFilter(logging.Filter):
+    """Adds the active trace id (or "-") to log records as %(trace_id)s."""
+
+    def filter(self, record):
+        record.trace_id = current_trace_id() or "-"
+        return True
+
+def configure_logging():
+    """Root logging for the API process: level from FND_LOG_LEVEL, trace id on every line."""
+    logging.basicConfig(level=LOG_LEVEL, format="%(asctime)s %(levelname)s %(name)s [%(trace_id)s] %(message)s")
+    for handler in logging.getLogger().handlers:
+        if not any(isinstance(f, TraceIdFilter) for f in handler.filters):
+            handler.addFilter(TraceIdFilter())
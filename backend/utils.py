@@ -1,39 +1,114 @@
-import requests
+import asyncio
+import codecs
+import logging
+import time
 from bs4 import BeautifulSoup
-import re
 
-def extract_text_from_url(url: str) -> str:
+try:
+    from backend.config import HTTP_READ_TIMEOUT, EXTRACT_MAX_CHARS, EXTRACT_MAX_BYTES, EXTRACT_TARGET_CHARS
+    from backend.http_client import get_http_client
+    from backend.html_extract import ArticleTextParser, sniff_charset
+    from backend.metrics import ARTICLE_FETCH, ARTICLE_PARSE, observe
+except ImportError:
+    from config import HTTP_READ_TIMEOUT, EXTRACT_MAX_CHARS, EXTRACT_MAX_BYTES, EXTRACT_TARGET_CHARS
+    from http_client import get_http_client
+    from html_extract import ArticleTextParser, sniff_charset
+    from metrics import ARTICLE_FETCH, ARTICLE_PARSE, observe
+
+HTML_CONTENT_TYPES = ("text/html", "application/xhtml+xml")
+FEED_SLICE_CHARS = 16 * 1024  # how much markup is parsed between "enough text yet?" checks
+
+logger = logging.getLogger(__name__)
+
+def html_to_text(content: bytes) -> str:
     """
-    Fetches the content of a URL and extracts the main text.
-    Returns the title + text content.
+    Extracts the text of a whole HTML document with BeautifulSoup.
+    Returns the title + text content. URL fetches use the streaming
+    extractor below; this full-tree version is kept for saved pages.
     """
+    soup = BeautifulSoup(content, 'html.parser')
+
+    # Kill all script and style elements
+    for script in soup(["script", "style", "nav", "footer", "header"]):
+        script.decompose()
+
+    # Get text
+    text = soup.get_text()
+
+    # Break into lines and remove leading/trailing space on each
+    lines = (line.strip() for line in text.splitlines())
+    # Break multi-headlines into a line each
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    # Drop blank lines
+    text = '\n'.join(chunk for chunk in chunks if chunk)
+
+    title = soup.title.string if soup.title else ""
+
+    # Long articles are chunked for the model (see chunking.py); this cap only
+    # bounds memory for pathological pages.
+    return f"{title}\n\n{text}"[:EXTRACT_MAX_CHARS]
+
+def _decoder_for(response, head: bytes):
+    encoding = response.charset_encoding or sniff_charset(head) or "utf-8"
     try:
-        headers = {
-            "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36"
-        }
-        response = requests.get(url, headers=headers, timeout=10)
-        response.raise_for_status()
-        
-        soup = BeautifulSoup(response.content, 'html.parser')
-        
-        # Kill all script and style elements
-        for script in soup(["script", "style", "nav", "footer", "header"]):
-            script.decompose()
-            
-        # Get text
-        text = soup.get_text()
-        
-        # Break into lines and remove leading/trailing space on each
-        lines = (line.strip() for line in text.splitlines())
-        # Break multi-headlines into a line each
-        chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-        # Drop blank lines
-        text = '\n'.join(chunk for chunk in chunks if chunk)
-        
-        title = soup.title.string if soup.title else ""
-        
-        return f"{title}\n\n{text}"[:5000] # Limit to 5000 chars to avoid overloading model
-        
+        return codecs.getincrementaldecoder(encoding)(errors="replace")
+    except LookupError:
+        return codecs.getincrementaldecoder("utf-8")(errors="replace")
+
+async def extract_text_from_url(url: str) -> str:
+    """
+    Fetches a URL and extracts the main article text while downloading.
+    Non-HTML responses are rejected from their headers, at most
+    EXTRACT_MAX_BYTES are read, and the download stops as soon as
+    EXTRACT_TARGET_CHARS of article prose has been collected.
+    Returns the title + text content, or "" on failure.
+    """
+    start = time.perf_counter()
+    parse_seconds = 0.0
+    result = "error"
+
+    def feed(parser, markup):
+        nonlocal parse_seconds
+        t = time.perf_counter()
+        parser.feed(markup)
+        parse_seconds += time.perf_counter() - t
+
+    try:
+        async with get_http_client().stream("GET", url, timeout=HTTP_READ_TIMEOUT) as response:
+            response.raise_for_status()
+            content_type = response.headers.get("content-type", "").split(";")[0].strip().lower()
+            if content_type and content_type not in HTML_CONTENT_TYPES:
+                logger.info("Skipping %s: not HTML (%s)", url, content_type)
+                result = "not_html"
+                return ""
+
+            parser = ArticleTextParser(EXTRACT_TARGET_CHARS, EXTRACT_MAX_CHARS)
+            decoder = None
+            received = 0
+            async for chunk in response.aiter_bytes():
+                chunk = chunk[:EXTRACT_MAX_BYTES - received]
+                received += len(chunk)
+                if decoder is None:
+                    decoder = _decoder_for(response, chunk)
+                markup = decoder.decode(chunk)
+                for offset in range(0, len(markup), FEED_SLICE_CHARS):
+                    # Parsing is CPU-bound; keep it off the event loop
+                    await asyncio.to_thread(feed, parser, markup[offset:offset + FEED_SLICE_CHARS])
+                    if parser.done:
+                        break
+                if parser.done or received >= EXTRACT_MAX_BYTES:
+                    break
+            if decoder is not None and not parser.done:
+                feed(parser, decoder.decode(b"", final=True))
+            parser.close()
+            text = parser.text().strip()
+            result = "ok" if text else "empty"
+            return text
+
     except Exception as e:
-        print(f"Error extracting text from {url}: {e}")
+        logger.warning("Error extracting text from %s: %s", url, e)
         return ""
+    finally:
+        observe(ARTICLE_FETCH, time.perf_counter() - start, result=result)
+        if parse_seconds:
+            observe(ARTICLE_PARSE, parse_seconds)
@@ -0,0 +1,240 @@
+import json
+import logging
+from typing import Optional
+
+import numpy as np
+
+try:
+    from backend.config import VERDICT_POLICY_PATH
+except ImportError:
+    from config import VERDICT_POLICY_PATH
+
+logger = logging.getLogger(__name__)
+
+VERDICT_REAL = "Likely Real News"
+VERDICT_MIXED = "Inconclusive / Mixed Evidence"
+VERDICT_FAKE = "Likely Fake News"
+
+# A fusion policy turns arrays of model and verification scores into one
+# final score per item (closer to 1 = likely real). A NaN verification
+# score means verification was unavailable. Verdict labels come from the
+# policy's two thresholds. Policies are built from JSON dicts, e.g.
+#   {"type": "banded", "low": 0.35, "high": 0.75, ...}
+#   {"type": "logistic", "coef": [2.1, 5.3], "intercept": -3.4, "model_only": [4.0, -2.0]}
+#   {"type": "isotonic", "x": [...], "y": [...], "base": {"type": "banded"}}
+# evaluate_verdicts.py fits the calibrated ones from labelled data.
+
+class FusionPolicy:
+    kind = "base"
+
+    def __init__(self, real_threshold: float = 0.7, mixed_threshold: float = 0.45):
+        self.real_threshold = real_threshold
+        self.mixed_threshold = mixed_threshold
+
+    def fuse(self, lstm: np.ndarray, verification: np.ndarray) -> np.ndarray:
+        raise NotImplementedError
+
+    def params(self) -> dict:
+        return {}
+
+    def to_dict(self) -> dict:
+        return {"type": self.kind, **self.params(),
+                "thresholds": {"real": self.real_threshold, "mixed": self.mixed_threshold}}
+
+class BandedPolicy(FusionPolicy):
+    """
+    Weighted average whose weights depend on the verification band. A
+    very low verification score (trusted sources or fact-checkers either
+    don't report it or explicitly debunk it) leans towards fake even if
+    the model is uncertain; a very high one leans towards real. Items
+    without verification get the model score.
+    """
+    kind = "banded"
+
+    def __init__(self, low: float = 0.35, high: float = 0.75, low_weight: float = 0.8, mid_weight: float = 0.6,
+                 high_weight: float = 0.7, **thresholds):
+        super().__init__(**thresholds)
+        self.low = low
+        self.high = high
+        # Verification weight per band; the model gets the rest
+        self.low_weight = low_weight
+        self.mid_weight = mid_weight
+        self.high_weight = high_weight
+
+    def fuse(self, lstm, verification):
+        weight = np.select([verification < self.low, verification > self.high],
+                           [self.low_weight, self.high_weight], default=self.mid_weight)
+        fused = (1.0 - weight) * lstm + weight * verification
+        return np.where(np.isnan(verification), lstm, fused)
+
+    def params(self) -> dict:
+        return {"low": self.low, "high": self.high, "low_weight": self.low_weight, "mid_weight": self.mid_weight,
+                "high_weight": self.high_weight}
+
+def _sigmoid(z):
+    return 1.0 / (1.0 + np.exp(-z))
+
+class LogisticPolicy(FusionPolicy):
+    """
+    P(real) = sigmoid(coef . (lstm, verification) + intercept). Items
+    without verification use the separate `model_only` (coef, intercept)
+    pair, or the raw model score if none was fitted.
+    """
+    kind = "logistic"
+
+    def __init__(self, coef, intercept: float, model_only=None, **thresholds):
+        super().__init__(**thresholds)
+        self.coef = [float(c) for c in coef]
+        if len(self.coef) != 2:
+            raise ValueError("logistic policy needs two coefficients (lstm, verification)")
+        self.intercept = float(intercept)
+        self.model_only = [float(c) for c in model_only] if model_only is not None else None
+        if self.model_only is not None and len(self.model_only) != 2:
+            raise ValueError("logistic policy model_only needs a coefficient and an intercept")
+
+    def fuse(self, lstm, verification):
+        missing = np.isnan(verification)
+        fused = _sigmoid(self.coef[0] * lstm + self.coef[1] * np.where(missing, 0.0, verification) + self.intercept)
+        if self.model_only is None:
+            fallback = lstm
+        else:
+            fallback = _sigmoid(self.model_only[0] * lstm + self.model_only[1])
+        return np.where(missing, fallback, fused)
+
+    def params(self) -> dict:
+        return {"coef": self.coef, "intercept": self.intercept, "model_only": self.model_only}
+
+class IsotonicPolicy(FusionPolicy):
+    """
+    Monotone calibration of a base policy's score: piecewise-linear
+    interpolation through fitted (x, y) knots, so the ranking of items is
+    the base policy's and only the probabilities change.
+    """
+    kind = "isotonic"
+
+    def __init__(self, x, y, base: Optional[FusionPolicy] = None, **thresholds):
+        super().__init__(**thresholds)
+        self.x = np.asarray(x, dtype=np.float64)
+        self.y = np.asarray(y, dtype=np.float64)
+        if len(self.x) == 0 or self.x.shape != self.y.shape or np.any(np.diff(self.x) < 0):
+            raise ValueError("isotonic policy needs matching, non-empty x/y with x sorted")
+        self.base = base if base is not None else BandedPolicy()
+
+    def fuse(self, lstm, verification):
+        return np.interp(self.base.fuse(lstm, verification), self.x, self.y)
+
+    def params(self) -> dict:
+        return {"x": self.x.tolist(), "y": self.y.tolist(), "base": self.base.to_dict()}
+
+POLICIES = {cls.kind: cls for cls in (BandedPolicy, LogisticPolicy, IsotonicPolicy)}
+
+def policy_from_dict(config: dict) -> FusionPolicy:
+    config = dict(config)
+    kind = config.pop("type", "banded")
+    if kind not in POLICIES:
+        raise ValueError(f"Unknown verdict policy type: {kind}")
+    thresholds = config.pop("thresholds", {})
+    if "base" in config:
+        config["base"] = policy_from_dict(config["base"])
+    return POLICIES[kind](**config, real_threshold=float(thresholds.get("real", 0.7)),
+                          mixed_threshold=float(thresholds.get("mixed", 0.45)))
+
+def load_policy(path: str) -> FusionPolicy:
+    with open(path, "r") as f:
+        return policy_from_dict(json.load(f))
+
+def fit_logistic(x: np.ndarray, labels: np.ndarray, l2: float = 1e-3, iterations: int = 50) -> tuple:
+    """
+    Logistic regression by Newton's method (IRLS) with a small L2 penalty
+    on the coefficients. x is (n, features); returns (coef, intercept).
+    """
+    design = np.column_stack([np.asarray(x, dtype=np.float64), np.ones(len(x))])
+    labels = np.asarray(labels, dtype=np.float64)
+    penalty = l2 * np.eye(design.shape[1])
+    penalty[-1, -1] = 0.0  # the intercept is not shrunk
+    w = np.zeros(design.shape[1])
+    for _ in range(iterations):
+        p = _sigmoid(design @ w)
+        gradient = design.T @ (p - labels) + penalty @ w
+        hessian = (design * (p * (1.0 - p))[:, None]).T @ design + penalty
+        step = np.linalg.solve(hessian, gradient)
+        w -= step
+        if np.max(np.abs(step)) < 1e-8:
+            break
+    return w[:-1].tolist(), float(w[-1])
+
+def fit_isotonic(scores: np.ndarray, labels: np.ndarray, max_knots: int = 100) -> tuple:
+    """
+    Non-decreasing least-squares fit of labels on scores (pool adjacent
+    violators). Returns (x, y) knots at block centres for IsotonicPolicy,
+    thinned to at most max_knots.
+    """
+    order = np.argsort(scores, kind="stable")
+    scores = np.asarray(scores, dtype=np.float64)[order]
+    labels = np.asarray(labels, dtype=np.float64)[order]
+    # Blocks as (sum of labels, count, sum of scores); merge while a block's mean exceeds the next one's
+    sums, counts, score_sums = [], [], []
+    for score, label in zip(scores, labels):
+        sums.append(label)
+        counts.append(1.0)
+        score_sums.append(score)
+        while len(sums) > 1 and sums[-2] * counts[-1] >= sums[-1] * counts[-2]:
+            label_sum, count, score_sum = sums.pop(), counts.pop(), score_sums.pop()
+            sums[-1] += label_sum
+            counts[-1] += count
+            score_sums[-1] += score_sum
+    counts = np.asarray(counts)
+    x = np.asarray(score_sums) / counts
+    y = np.asarray(sums) / counts
+    if len(x) > max_knots:
+        keep = np.unique(np.linspace(0, len(x) - 1, max_knots).round().astype(int))
+        x, y = x[keep], y[keep]
+    return x.tolist(), y.tolist()
+
+def calculate_verdicts(lstm_scores, verification_scores, policy: Optional[FusionPolicy] = None):
+    """
+    Vectorized verdict logic over arrays of scores.
+    A NaN verification score means verification is unavailable.
+    Returns (final_scores, verdicts, is_real) as NumPy arrays.
+    """
+    policy = policy if policy is not None else get_verdict_policy()
+    lstm = np.asarray(lstm_scores, dtype=np.float64)
+    verification = np.asarray(verification_scores, dtype=np.float64)
+    final_scores = policy.fuse(lstm, verification)
+
+    # Mixed evidence is still technically on the positive side but uncertain
+    verdicts = np.select(
+        [final_scores >= policy.real_threshold, final_scores >= policy.mixed_threshold],
+        [VERDICT_REAL, VERDICT_MIXED],
+        default=VERDICT_FAKE,
+    )
+    is_real = final_scores >= policy.mixed_threshold
+
+    return final_scores, verdicts, is_real
+
+def calculate_verdict(lstm_score, verification_score, policy: Optional[FusionPolicy] = None):
+    """
+    Decides the final verdict based on LSTM and Verification scores.
+    lstm_score: 0-1 (closer to 1 = Likely Real)
+    verification_score: 0-1 (closer to 1 = Likely Real), or None for a model-only verdict
+    """
+    if verification_score is None:
+        verification_score = np.nan
+    final_scores, verdicts, is_real = calculate_verdicts([lstm_score], [verification_score], policy)
+    return float(final_scores[0]), str(verdicts[0]), bool(is_real[0])
+
+# Singleton instance
+verdict_policy = None
+
+def get_verdict_policy() -> FusionPolicy:
+    global verdict_policy
+    if verdict_policy is None:
+        verdict_policy = BandedPolicy()
+        if VERDICT_POLICY_PATH:
+            try:
+                verdict_policy = load_policy(VERDICT_POLICY_PATH)
+                logger.info("Loaded %s verdict policy from %s", verdict_policy.kind, VERDICT_POLICY_PATH)
+            except (OSError, ValueError, TypeError) as e:
+                logger.error("Could not load verdict policy from %s, using the banded default: %s",
+                             VERDICT_POLICY_PATH, e)
+    return verdict_policy
@@ -1,11 +1,46 @@
 
+import asyncio
+import logging
 import os
-import requests
-from collections import Counter
-import re
-from urllib.parse import urlparse
+import time
+from typing import List, Optional
+from urllib.parse import urlparse, urlsplit
 
-# Load credentials
+try:
+    from backend.config import (
+        SEARCH_URL, SEARCH_TIMEOUT, SEARCH_PROVIDER, VERIFY_MAX_QUERIES, VERIFY_SEARCH_BUDGET,
+        VERIFY_ENOUGH_SOURCES, VERIFY_ENOUGH_FACT_CHECKS, VERIFY_DEADLINE,
+    )
+    from backend.http_client import get_http_client
+    from backend.search_cache import get_search_cache, get_search_limiter, normalize_query
+    from backend.sources import get_source_registry, KIND_FACT_CHECKER
+    from backend.search_providers import SearchProvider
+    from backend.evidence_index import get_offline_provider
+    from backend.near_dup import get_near_duplicate_index
+    from backend.tracing import stage
+    from backend.metrics import SEARCH_REQUESTS, VERIFICATION_QUERIES, increment, observe
+    from backend.text_analysis import SNIPPET_LEXICON, snippet_multiplier, analyze_snippets, build_queries
+except ImportError:
+    from config import (
+        SEARCH_URL, SEARCH_TIMEOUT, SEARCH_PROVIDER, VERIFY_MAX_QUERIES, VERIFY_SEARCH_BUDGET,
+        VERIFY_ENOUGH_SOURCES, VERIFY_ENOUGH_FACT_CHECKS, VERIFY_DEADLINE,
+    )
+    from http_client import get_http_client
+    from search_cache import get_search_cache, get_search_limiter, normalize_query
+    from sources import get_source_registry, KIND_FACT_CHECKER
+    from search_providers import SearchProvider
+    from evidence_index import get_offline_provider
+    from near_dup import get_near_duplicate_index
+    from tracing import stage
+    from metrics import SEARCH_REQUESTS, VERIFICATION_QUERIES, increment, observe
+    from text_analysis import SNIPPET_LEXICON, snippet_multiplier, analyze_snippets, build_queries
+
+logger = logging.getLogger(__name__)
+
+class VerificationUnavailable(Exception):
+    """Raised when a search cannot be spent (rate limit or daily budget); callers degrade."""
+
+# Load credentials (GOOGLE_API_KEY / GOOGLE_CSE_ID environment variables take precedence)
 GOOGLE_API_KEY = ""
 GOOGLE_CSE_ID = ""
 
@@ -19,48 +54,8 @@ if os.path.exists(CREDENTIALS_PATH):
                     GOOGLE_API_KEY = val
                 elif key == "GOOGLE_CSE_ID":
                     GOOGLE_CSE_ID = val
-
-TRUSTED_SOURCES = [
-    "bbc.com", "reuters.com", "cnn.com", "nytimes.com", "washingtonpost.com",
-    "theguardian.com", "aljazeera.com", "npr.org", "bloomberg.com", "forbes.com",
-    "wsj.com", "usatoday.com", "apnews.com", "cnbc.com", "time.com",
-    "nbcnews.com", "abcnews.go.com", "cbsnews.com", "foxnews.com", "msnbc.com",
-    "huffpost.com", "economist.com", "financialexpress.com", "hindustantimes.com",
-    "timesofindia.indiatimes.com", "indianexpress.com", "thehindu.com", "ndtv.com",
-    "indiatoday.in", "livemint.com", "business-standard.com", "news18.com",
-    "firstpost.com", "zeenews.india.com", "dnaindia.com", "outlookindia.com",
-    "deccanherald.com", "telegraph.co.uk", "independent.co.uk", "standard.co.uk",
-    "dailymail.co.uk", "mirror.co.uk", "sun.co.uk", "express.co.uk",
-    "scmp.com", "straitstimes.com", "channelnewsasia.com", "dw.com", "france24.com",
-    "euronews.com", "rt.com", "sputniknews.com", "chinadaily.com.cn", "xinhuanet.com"
-]
-
-FACT_CHECKER_SOURCES = [
-    "snopes.com", "politifact.com", "factcheck.org", "fullfact.org", 
-    "checkyourfact.com", "leadstories.com", "altnews.in", "boomlive.in"
-]
-
-FACT_CHECK_KEYWORDS = [
-    "fact check", "fact-check", "debunk", "hoax", "false", 
-    "fake news", "misleading", "correcting", "untrue", "unverified"
-]
-
-def extract_keywords(text: str, num_keywords: int = 5) -> str:
-    """Improved keyword extraction using frequency and common word filtering."""
-    text_clean = re.sub(r'[^a-zA-Z0-9\s]', '', text.lower())
-    words = text_clean.split()
-    
-    stop_words = set([
-        "the", "a", "an", "in", "on", "at", "for", "to", "of", "and", "or", "is", "are", "was", "were", 
-        "it", "this", "that", "with", "by", "from", "be", "not", "have", "has", "had", "say", "said", "will",
-        "would", "could", "should", "he", "she", "they", "we", "i", "you", "my", "his", "her", "their",
-        "about", "as", "into", "like", "through", "after", "over", "between", "out", "against", "during",
-        "without", "before", "under", "around", "among", "just", "very", "also", "been", "which"
-    ])
-    
-    meaningful_words = [w for w in words if w not in stop_words and len(w) > 3]
-    most_common = Counter(meaningful_words).most_common(num_keywords)
-    return " ".join([word for word, count in most_common])
+GOOGLE_API_KEY = os.environ.get("GOOGLE_API_KEY", GOOGLE_API_KEY)
+GOOGLE_CSE_ID = os.environ.get("GOOGLE_CSE_ID", GOOGLE_CSE_ID)
 
 def analyze_snippet(title: str, snippet: str) -> float:
     """
@@ -69,99 +64,276 @@ def analyze_snippet(title: str, snippet: str) -> float:
     Low (< 1.0) means it's likely a debunk.
     High (> 1.0) means it's likely a confirmation.
     """
-    content = (title + " " + snippet).lower()
-    
-    # Check for debunk keywords
-    is_fact_check = any(kw in content for kw in FACT_CHECK_KEYWORDS)
-    
-    if is_fact_check:
-        # If it says "false", "hoax", or "debunk", it's likely debunking the claim
-        negative_indicators = ["false", "hoax", "debunk", "incorrect", "misleading", "fake"]
-        if any(neg in content for neg in negative_indicators):
-            return 0.1 # Strong negative signal
-        return 0.5 # Weak negative signal
-        
-    return 1.2 # Likely a legitimate report or neutral mention
-
-def verify_news(text: str):
+    return snippet_multiplier(SNIPPET_LEXICON.scan(f"{title} {snippet}"))
+
+def score_search_items(items: list):
     """
-    Verifies news by searching Google and checking against trusted sources.
+    Scores Google Custom Search result items against trusted sources.
     Returns:
         score (float): 0.0 to 1.0
         matches (list): List of matching trusted domains found
     """
-    if not GOOGLE_API_KEY or not GOOGLE_CSE_ID:
-        print("Google API credentials missing.")
-        return 0.5, []
+    matches = []
+    verdict_scores = []
+    registry = get_source_registry()
 
-    keywords = extract_keywords(text)
-    if not keywords:
-        return 0.5, []
+    matched = []
+    for item in items:
+        link = item.get("link", "")
+        domain = urlparse(link).netloc.lower()
+        source = registry.classify(domain)
+        if source is not None:
+            matched.append((item, link, domain, source))
+
+    # One lexicon pass over every matched title + snippet
+    sentiments = analyze_snippets([(item.get("title", ""), item.get("snippet", "")) for item, *_ in matched])
+    for (item, link, domain, source), sentiment_score in zip(matched, sentiments):
+        # Fact checkers weigh more (see sources.json)
+        verdict_scores.append(sentiment_score * source.weight)
+
+        matches.append({
+            "name": domain,
+            "url": link,
+            "trustScore": source.trust
+        })
+
+    # Scoring Logic
+    if not verdict_scores:
+        # If no trusted sources found at all, score is low
+        return 0.2, []
+
+    # Average of verdict scores
+    avg_verdict = sum(verdict_scores) / len(verdict_scores)
+
+    # Normalize to 0-1
+    # avg_verdict < 1 means mostly debunks, > 1 means support/neutral
+    final_score = min(max(avg_verdict - 0.5, 0.0), 1.0)
 
-    print(f"Searching for: {keywords}")
-    url = "https://www.googleapis.com/customsearch/v1"
+    # If we have a lot of debunks, force score down
+    if any(s < 0.6 for s in verdict_scores):
+         final_score = min(final_score, 0.3)
+
+    # Deduplicate matches
+    unique_matches = []
+    seen_domains = set()
+    for m in matches:
+        if m["name"] not in seen_domains:
+            unique_matches.append(m)
+            seen_domains.add(m["name"])
+
+    return float(final_score), unique_matches
+
+# (event loop, normalized query) -> in-flight search task
+_inflight = {}
+
+async def _fetch_search_items(query: str) -> list:
+    if not get_search_limiter().try_acquire():
+        raise VerificationUnavailable("Search quota exhausted")
+    logger.info("Searching for: %s", query)
     params = {
         "key": GOOGLE_API_KEY,
         "cx": GOOGLE_CSE_ID,
-        "q": keywords,
+        "q": query,
         "num": 10
     }
-
+    start = time.perf_counter()
     try:
-        response = requests.get(url, params=params)
-        data = response.json()
-        
-        matches = []
-        verdict_scores = []
-        
-        if "items" in data:
-            for item in data["items"]:
-                link = item.get("link", "")
-                title = item.get("title", "")
-                snippet = item.get("snippet", "")
-                domain = urlparse(link).netloc.lower()
-                
-                is_trusted = any(t in domain for t in TRUSTED_SOURCES)
-                is_fact_checker = any(f in domain for f in FACT_CHECKER_SOURCES)
-                
-                if is_trusted or is_fact_checker:
-                    sentiment_score = analyze_snippet(title, snippet)
-                    
-                    weight = 1.5 if is_fact_checker else 1.0
-                    verdict_scores.append(sentiment_score * weight)
-                    
-                    matches.append({
-                        "name": domain,
-                        "url": link,
-                        "trustScore": 1.0 if is_trusted else 1.2 # Fact checkers are high trust for debunking
-                    })
-        
-        # Scoring Logic
-        if not verdict_scores:
-            # If no trusted sources found at all, score is low
-            return 0.2, []
-
-        # Average of verdict scores
-        avg_verdict = sum(verdict_scores) / len(verdict_scores)
-        
-        # Normalize to 0-1
-        # avg_verdict < 1 means mostly debunks, > 1 means support/neutral
-        final_score = min(max(avg_verdict - 0.5, 0.0), 1.0) 
-        
-        # If we have a lot of debunks, force score down
-        if any(s < 0.6 for s in verdict_scores):
-             final_score = min(final_score, 0.3)
-
-        # Deduplicate matches
-        unique_matches = []
-        seen_domains = set()
-        for m in matches:
-            if m["name"] not in seen_domains:
-                unique_matches.append(m)
-                seen_domains.add(m["name"])
-
-        return float(final_score), unique_matches
+        data = await get_http_client().get_json(SEARCH_URL, params=params, timeout=SEARCH_TIMEOUT)
+    except Exception:
+        observe(SEARCH_REQUESTS, time.perf_counter() - start, result="error")
+        raise
+    observe(SEARCH_REQUESTS, time.perf_counter() - start, result="ok")
+    items = data.get("items", [])
+    get_search_cache().set(query, items)
+    return items
+
+def _finish_search(key, task):
+    _inflight.pop(key, None)
+    if not task.cancelled():
+        task.exception()  # mark retrieved even if every waiter gave up
+
+async def search_items(query: str) -> list:
+    """
+    Search result items for a keyword query: persistent cache first, then
+    one paid search shared by every concurrent caller with the same query.
+    """
+    items = get_search_cache().get(query)
+    if items is not None:
+        return items
+
+    key = (asyncio.get_running_loop(), normalize_query(query))
+    task = _inflight.get(key)
+    if task is None:
+        task = asyncio.ensure_future(_fetch_search_items(query))
+        _inflight[key] = task
+        task.add_done_callback(lambda t: _finish_search(key, t))
+    # Shielded so one caller hitting its deadline doesn't cancel the others
+    return await asyncio.shield(task)
+
+class GoogleSearchProvider(SearchProvider):
+    """Google Custom Search behind the persistent query cache, quota limiter and single-flight."""
+    name = "google"
+
+    def available(self) -> bool:
+        return bool(GOOGLE_API_KEY and GOOGLE_CSE_ID)
 
+    async def search(self, query: str) -> list:
+        return await search_items(query)
+
+def _url_key(link: str) -> str:
+    """Dedupe key for a result URL: host lowercased, fragment and trailing slash dropped."""
+    parts = urlsplit(link.strip())
+    return f"{parts.netloc.lower()}{parts.path.rstrip('/')}?{parts.query}"
+
+class VerificationEngine:
+    """
+    Multi-query verification. Candidate queries (keywords, headline, claim
+    sentence, named entities; see text_analysis.build_queries) are searched
+    concurrently, at most `max_queries` per text and within `budget`
+    seconds. Results are merged and deduplicated by URL before scoring.
+    The fan-out stops as soon as `enough_fact_checks` fact-checker results
+    or `enough_sources` distinct trusted outlets have been seen; queries
+    still running are abandoned (their results still land in the search
+    cache).
+    """
+
+    def __init__(self, provider: SearchProvider, max_queries: int = 3, budget: float = 3.0,
+                 enough_sources: int = 3, enough_fact_checks: int = 1):
+        self.provider = provider
+        self.max_queries = max(1, max_queries)
+        self.budget = budget
+        self.enough_sources = enough_sources
+        self.enough_fact_checks = enough_fact_checks
+
+    async def gather_evidence(self, queries: List[str]) -> list:
+        """Merged, URL-deduplicated items of every query answered before the stop condition."""
+        registry = get_source_registry()
+        tasks = {asyncio.ensure_future(self.provider.search(q)): q for q in queries}
+        pending = set(tasks)
+        merged = {}
+        trusted_domains, fact_checks = set(), 0
+        answered, unavailable, error = 0, None, None
+        stop = "exhausted"
+        deadline = time.monotonic() + self.budget
+        try:
+            while pending:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    stop = "budget"
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    try:
+                        items = task.result()
+                    except VerificationUnavailable as e:
+                        unavailable = e
+                        continue
+                    except Exception as e:
+                        logger.warning("Search for %r failed: %s", tasks[task], e)
+                        error = e
+                        continue
+                    answered += 1
+                    for item in items:
+                        key = _url_key(item.get("link", ""))
+                        if key in merged:
+                            continue
+                        merged[key] = item
+                        source = registry.classify(urlparse(item.get("link", "")).netloc.lower())
+                        if source is None:
+                            continue
+                        if source.kind == KIND_FACT_CHECKER:
+                            fact_checks += 1
+                        else:
+                            trusted_domains.add(source.domain)
+                if fact_checks >= self.enough_fact_checks or len(trusted_domains) >= self.enough_sources:
+                    stop = "enough_evidence"
+                    break
+        finally:
+            for task in pending:
+                task.cancel()
+        increment(VERIFICATION_QUERIES, len(queries), stop=stop)
+
+        if not answered:
+            if unavailable is not None:
+                raise unavailable
+            if stop == "budget":
+                # No evidence either way; an empty result would score as "no trusted sources"
+                raise VerificationUnavailable(f"No search answered within {self.budget:.1f}s")
+            if error is not None:
+                raise error
+        return list(merged.values())
+
+    async def verify(self, text: str):
+        with stage("keywords"):
+            queries = [query for _, query in build_queries(text, self.max_queries)]
+        if not queries:
+            return 0.5, []
+        with stage("search"):
+            items = await self.gather_evidence(queries)
+        return score_search_items(items)
+
+# Singleton instance
+search_provider = None
+
+def get_search_provider() -> SearchProvider:
+    global search_provider
+    if search_provider is None:
+        if SEARCH_PROVIDER == "google":
+            search_provider = GoogleSearchProvider()
+        elif SEARCH_PROVIDER == "offline":
+            search_provider = get_offline_provider()
+        elif SEARCH_PROVIDER == "auto":
+            google = GoogleSearchProvider()
+            search_provider = google if google.available() else get_offline_provider()
+            logger.info("Verification uses the %s search provider", search_provider.name)
+        else:
+            raise ValueError(f"Unknown search provider: {SEARCH_PROVIDER}")
+    return search_provider
+
+def is_cacheable_verification(verification_score, matches) -> bool:
+    # verify_news answers a neutral 0.5 with no matches when it could not
+    # search at all (missing credentials, network error). Don't pin that.
+    return bool(matches) or verification_score != 0.5
+
+def find_near_duplicate(text: str) -> tuple:
+    """
+    (fingerprint, verification) where verification is the result reused
+    from a recently verified near-identical text, or None. Pass the
+    fingerprint to remember_verification once the text is verified.
+    """
+    near_duplicates = get_near_duplicate_index()
+    fingerprint = near_duplicates.fingerprint(text)
+    return fingerprint, near_duplicates.get(fingerprint)
+
+def remember_verification(fingerprint, verification_score, matches) -> bool:
+    """Offers a fresh result to the near-duplicate index; False (not kept) if it should not be cached."""
+    if not is_cacheable_verification(verification_score, matches):
+        return False
+    get_near_duplicate_index().add(fingerprint, (verification_score, matches))
+    return True
+
+async def verify_news(text: str, provider: Optional[SearchProvider] = None):
+    """
+    Verifies news by searching several candidate queries and checking the
+    results against trusted sources.
+    Returns:
+        score (float): 0.0 to 1.0
+        matches (list): List of matching trusted domains found
+    Raises VerificationUnavailable when the search quota is used up.
+    """
+    provider = provider or get_search_provider()
+    if not provider.available():
+        logger.warning("Search provider %r is not configured (e.g. Google API credentials missing).", provider.name)
+        return 0.5, []
+
+    # The fan-out must end before the caller's deadline, so a silent search degrades instead of timing out
+    budget = min(VERIFY_SEARCH_BUDGET, VERIFY_DEADLINE)
+    engine = VerificationEngine(provider, VERIFY_MAX_QUERIES, budget,
+                                VERIFY_ENOUGH_SOURCES, VERIFY_ENOUGH_FACT_CHECKS)
+    try:
+        return await engine.verify(text)
+    except VerificationUnavailable:
+        raise
     except Exception as e:
-        print(f"Verification error: {e}")
+        logger.warning("Verification error: %s", e)
         return 0.5, []
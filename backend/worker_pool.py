@@ -0,0 +1,230 @@
+import itertools
+import logging
+import math
+import multiprocessing
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import Callable
+
+logger = logging.getLogger(__name__)
+
+class PoolSaturatedError(Exception):
+    """Raised when the inference queue is full; callers should answer 429."""
+
+    def __init__(self, retry_after: int):
+        super().__init__(f"Inference queue is full, retry after {retry_after}s")
+        self.retry_after = retry_after
+
+def _worker_main(worker_id, backend_factory, tasks, results, max_requests):
+    """Entry point of an inference worker process."""
+    try:
+        backend = backend_factory()
+    except Exception as e:
+        results.put(("failed", worker_id, repr(e)))
+        return
+    results.put(("ready", worker_id, None))
+
+    served = 0
+    while True:
+        task = tasks.get()
+        if task is None:
+            break
+        job_id, texts = task
+        try:
+            scores = [float(s) for s in backend.predict_batch(texts)]
+            results.put(("result", job_id, scores))
+        except Exception as e:
+            results.put(("error", job_id, repr(e)))
+        served += 1
+        if max_requests and served >= max_requests:
+            # Recycled: the supervisor starts a fresh process in our place
+            break
+
+class ModelWorkerPool:
+    """
+    A pool of inference processes fed from one bounded task queue.
+
+    Each worker builds its own backend with `backend_factory` (it must be
+    picklable, e.g. a functools.partial of a module-level function). With
+    the NumPy backend the weights are memory-mapped read-only, so workers
+    share a single copy through the page cache; the Keras backend cannot
+    share and costs a full model per worker.
+    """
+
+    def __init__(
+        self,
+        backend_factory: Callable,
+        workers: int = 2,
+        max_queue: int = 64,
+        max_requests_per_worker: int = 0,
+        request_timeout: float = 30.0,
+        start_method: str = "spawn",
+    ):
+        self.backend_factory = backend_factory
+        self.num_workers = max(1, workers)
+        self.max_requests_per_worker = max(0, max_requests_per_worker)
+        self.request_timeout = request_timeout
+
+        self._ctx = multiprocessing.get_context(start_method)
+        self._tasks = self._ctx.Queue(maxsize=max(1, max_queue))
+        self._results = self._ctx.Queue()
+        self._processes = {}
+        self._futures = {}
+        self._ids = itertools.count()
+        self._lock = threading.Lock()
+        self._ready = threading.Event()
+        self._stopping = False
+        self._threads = []
+
+        # Metrics
+        self.max_queue = max(1, max_queue)
+        self.rejected_total = 0
+        self.recycled_total = 0
+        self.completed_total = 0
+        self.last_start_error = None
+        self._consecutive_start_failures = 0  # reset whenever a worker reports ready
+        self._avg_batch_seconds = 0.05
+
+    def start(self, wait: bool = True, timeout: float = 120.0):
+        for worker_id in range(self.num_workers):
+            self._spawn(worker_id)
+        for target, name in ((self._collect, "fnd-pool-collector"), (self._supervise, "fnd-pool-supervisor")):
+            thread = threading.Thread(target=target, name=name, daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        if wait:
+            deadline = time.monotonic() + timeout
+            while not self._ready.wait(0.1):
+                if self._crash_looping():
+                    self.shutdown()
+                    raise RuntimeError(f"Inference workers failed to start: {self.last_start_error}")
+                if time.monotonic() > deadline:
+                    raise TimeoutError("Inference workers did not become ready in time")
+        return self
+
+    def _spawn(self, worker_id):
+        process = self._ctx.Process(
+            target=_worker_main,
+            args=(worker_id, self.backend_factory, self._tasks, self._results, self.max_requests_per_worker),
+            name=f"fnd-infer-{worker_id}",
+            daemon=True,
+        )
+        process.start()
+        self._processes[worker_id] = process
+
+    def _collect(self):
+        while True:
+            try:
+                kind, key, payload = self._results.get()
+            except (EOFError, OSError):
+                return
+            if kind == "ready":
+                self._consecutive_start_failures = 0
+                self._ready.set()
+                continue
+            if kind == "failed":
+                self._record_start_failure(f"worker {key}: {payload}")
+                continue
+            with self._lock:
+                future = self._futures.pop(key, None)
+            if future is None or future.done():
+                continue
+            if kind == "result":
+                future.set_result(payload)
+            else:
+                future.set_exception(RuntimeError(payload))
+
+    def _record_start_failure(self, error):
+        self.last_start_error = error
+        self._consecutive_start_failures += 1
+        logger.error("Inference worker failed: %s", error)
+
+    def _crash_looping(self) -> bool:
+        return self._consecutive_start_failures >= self.num_workers
+
+    def _supervise(self):
+        # Replace workers that exited (recycled after N requests, or crashed)
+        while not self._stopping:
+            time.sleep(0.2)
+            for worker_id, process in list(self._processes.items()):
+                if self._stopping or process.is_alive():
+                    continue
+                process.join(0)
+                if process.exitcode != 0:
+                    self._record_start_failure(f"worker {worker_id} exited with code {process.exitcode}")
+                if self._crash_looping():
+                    continue  # every worker dies on start; don't spin
+                self.recycled_total += 1
+                self._spawn(worker_id)
+
+    def queue_depth(self) -> int:
+        try:
+            return self._tasks.qsize()
+        except NotImplementedError:  # macOS has no sem_getvalue
+            return self.max_queue
+
+    def retry_after(self) -> int:
+        backlog = self.queue_depth()
+        return max(1, math.ceil(backlog * self._avg_batch_seconds / self.num_workers))
+
+    def predict_batch(self, texts: list) -> list:
+        """Blocking: queues one batch for the workers and waits for its scores."""
+        if not texts:
+            return []
+        job_id = next(self._ids)
+        future = Future()
+        with self._lock:
+            self._futures[job_id] = future
+        try:
+            self._tasks.put_nowait((job_id, list(texts)))
+        except queue.Full:
+            with self._lock:
+                self._futures.pop(job_id, None)
+            self.rejected_total += 1
+            raise PoolSaturatedError(self.retry_after())
+
+        start = time.perf_counter()
+        try:
+            scores = future.result(timeout=self.request_timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self._futures.pop(job_id, None)
+            raise TimeoutError(f"Inference did not finish within {self.request_timeout}s")
+        # Smoothed batch latency feeds the Retry-After estimate
+        self._avg_batch_seconds = 0.9 * self._avg_batch_seconds + 0.1 * (time.perf_counter() - start)
+        self.completed_total += 1
+        return scores
+
+    def predict(self, text: str) -> float:
+        return self.predict_batch([text])[0]
+
+    def stats(self) -> dict:
+        return {
+            "workers": self.num_workers,
+            "alive": sum(p.is_alive() for p in self._processes.values()),
+            "queue_depth": self.queue_depth(),
+            "max_queue": self.max_queue,
+            "in_flight": len(self._futures),
+            "completed_total": self.completed_total,
+            "rejected_total": self.rejected_total,
+            "recycled_total": self.recycled_total,
+        }
+
+    def shutdown(self, timeout: float = 5.0):
+        self._stopping = True
+        for _ in self._processes:
+            try:
+                self._tasks.put_nowait(None)
+            except queue.Full:
+                break
+        for process in self._processes.values():
+            process.join(timeout)
+            if process.is_alive():
+                process.terminate()
+        with self._lock:
+            for future in self._futures.values():
+                if not future.done():
+                    future.set_exception(RuntimeError("Worker pool shut down"))
+            self._futures.clear()